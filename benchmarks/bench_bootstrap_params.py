@@ -0,0 +1,56 @@
+"""
+Times utils.bootstrap_params (10,000 replicates of the 12 breed parameters) for every
+method against a loop that resamples the rows and calls the estimate_*_params functions.
+
+Run from the repository root with: python benchmarks/bench_bootstrap_params.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import utils
+
+
+def timed(f):
+    start = time.perf_counter()
+    result = f()
+    return time.perf_counter() - start, result
+
+
+def loop_bootstrap(df, n_boot, rng):
+    for breed in sorted(df["breed"].unique()):
+        X = df[df["breed"] == breed][utils.FEATURES].to_numpy()
+        for _ in range(n_boot):
+            sample = X[rng.integers(0, len(X), len(X))]
+            utils.estimate_gaussian_params(sample[:, 0])
+            utils.estimate_gaussian_params(sample[:, 1])
+            utils.estimate_binomial_params(sample[:, 2])
+            utils.estimate_uniform_params(sample[:, 3])
+
+
+def main():
+    df = utils.generate_breed_data(rng=np.random.default_rng(0))
+    n_boot = 10_000
+
+    n_loop = 500
+    elapsed, _ = timed(lambda: loop_bootstrap(df, n_loop, np.random.default_rng(0)))
+    print(
+        f"{'estimate_*_params loop':<24}{elapsed * n_boot / n_loop:>10.2f} s (extrapolated)"
+    )
+
+    for method in ["percentile", "bca", "m_out_of_n"]:
+        elapsed, intervals = timed(
+            lambda: utils.bootstrap_params(df, n_boot=n_boot, method=method, seed=0)
+        )
+        print(f"{method:<24}{elapsed:>10.2f} s")
+
+    print(intervals[0])
+
+
+if __name__ == "__main__":
+    main()
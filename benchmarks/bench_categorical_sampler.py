@@ -0,0 +1,70 @@
+"""
+Compares rolling a loaded dice with the notebook's list comprehension over
+np.random.choice(dice, p=probs) against utils.CategoricalSampler.
+
+Run from the repository root with: python benchmarks/bench_categorical_sampler.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import utils
+
+
+def load_dice(n_sides, loaded_number):
+    probs = np.array([1 / (n_sides + 1) for _ in range(n_sides)])
+    probs[loaded_number - 1] = 1 - sum(probs[:-1])
+
+    return probs
+
+
+def timed(f):
+    start = time.perf_counter()
+    result = f()
+    return time.perf_counter() - start, result
+
+
+def main():
+    n_sides = 6
+    dice = np.arange(n_sides) + 1
+    probs = load_dice(n_sides, loaded_number=2)
+    rng = np.random.default_rng(0)
+
+    baseline_rolls = 20_000
+    baseline_time, baseline = timed(
+        lambda: np.array(
+            [np.random.choice(dice, p=probs) for _ in range(baseline_rolls)]
+        )
+    )
+
+    sampler = utils.CategoricalSampler(probs, values=dice)
+
+    print(f"{'method':<32}{'rolls':>12}{'seconds':>12}{'rolls/s':>16}")
+    print(
+        f"{'list comprehension':<32}{baseline_rolls:>12}{baseline_time:>12.4f}{baseline_rolls / baseline_time:>16.0f}"
+    )
+
+    for n_rolls in [20_000, 1_000_000, 10_000_000]:
+        elapsed, rolls = timed(lambda: sampler.sample(n_rolls, rng))
+        print(
+            f"{'CategoricalSampler':<32}{n_rolls:>12}{elapsed:>12.4f}{n_rolls / elapsed:>16.0f}"
+        )
+
+    elapsed, sums = timed(lambda: sampler.sample_sum(2, 1_000_000, rng))
+    print(f"{'CategoricalSampler (sum of 2)':<32}{1_000_000:>12}{elapsed:>12.4f}")
+
+    print(
+        f"\nmax |frequency - p|: {np.abs(np.bincount(rolls, minlength=n_sides + 1)[1:] / len(rolls) - probs).max():.5f}"
+    )
+    print(
+        f"mean of sum of 2 loaded dice: {sums.mean():.3f} (exact {2 * dice @ probs:.3f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
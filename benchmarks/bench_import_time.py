@@ -0,0 +1,85 @@
+"""
+Guards the headless import budget of utils.
+
+Runs `python -X importtime -c "import utils"` in a fresh interpreter, reports the
+cumulative import time of utils and checks that none of the plotting and widget modules
+(imported by plotting.py), scipy.stats or scipy.signal were imported. Exits with status 1
+if the budget is exceeded.
+
+Run from the repository root with: python benchmarks/bench_import_time.py [budget_ms]
+"""
+
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+HEAVY_MODULES = [
+    "matplotlib",
+    "seaborn",
+    "ipywidgets",
+    "IPython",
+    "scipy.stats",
+    "scipy.signal",
+]
+
+# numpy, pandas, scipy.special and scipy.sparse are imported directly by the core
+DEFAULT_BUDGET_MS = 800
+
+
+def import_time_ms(n_runs=5):
+    # Best of n_runs to reduce the noise of a cold file system cache
+    best = None
+
+    for _ in range(n_runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import utils"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            fields = [field.strip() for field in line.split("|")]
+            if len(fields) == 3 and fields[2] == "utils":
+                cumulative = int(fields[1]) / 1000
+                best = cumulative if best is None else min(best, cumulative)
+
+    return best
+
+
+def loaded_heavy_modules():
+    code = (
+        "import sys, utils; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+
+    elapsed_ms = import_time_ms()
+    heavy = loaded_heavy_modules()
+
+    print(f"import utils: {elapsed_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    print(f"heavy modules imported: {', '.join(heavy) if heavy else 'none'}")
+
+    if elapsed_ms > budget_ms or heavy:
+        print("FAILED")
+        sys.exit(1)
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Trains utils.SpamNaiveBayes on a synthetic corpus, times utils.EmailTokenizer with a
+vocabulary and with the hashing trick, and compares scoring throughput against the
+notebook's per-email naive_bayes_classifier loop.
+
+Run from the repository root with: python benchmarks/bench_spam_naive_bayes.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import utils
+
+
+def synthetic_emails(n_emails, n_words=20_000, email_length=120, seed=0):
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{i}" for i in range(n_words)])
+    labels = rng.integers(0, 2, n_emails)
+
+    # Both classes draw Zipf-distributed words, ham from a shifted vocabulary
+    ranks = rng.zipf(1.1, (n_emails, email_length)) % n_words
+    ranks = (ranks + np.where(labels[:, None] == 1, 0, 3)) % n_words
+    texts = [" ".join(words[row]) for row in ranks]
+
+    return texts, labels
+
+
+def naive_bayes_classifier(text, word_freq, class_freq):
+    words = set(text.lower().split())
+
+    cumulative_product_spam = 1.0
+    cumulative_product_ham = 1.0
+
+    for word in words:
+        if word in word_freq:
+            total = word_freq[word]["spam"] + word_freq[word]["ham"]
+            cumulative_product_spam *= word_freq[word]["spam"] / total
+            cumulative_product_ham *= word_freq[word]["ham"] / total
+
+    likelihood_word_given_spam = cumulative_product_spam * class_freq["spam"]
+    likelihood_word_given_ham = cumulative_product_ham * class_freq["ham"]
+
+    return likelihood_word_given_spam / (
+        likelihood_word_given_spam + likelihood_word_given_ham
+    )
+
+
+def timed(f):
+    start = time.perf_counter()
+    result = f()
+    return time.perf_counter() - start, result
+
+
+def main():
+    texts, labels = synthetic_emails(200_000)
+    train, test = slice(0, 100_000), slice(100_000, None)
+
+    elapsed, model = timed(
+        lambda: utils.SpamNaiveBayes().fit(texts[train], labels[train])
+    )
+    print(f"fit on {len(texts[train])} emails: {elapsed:.3f} s")
+
+    elapsed, X = timed(
+        lambda: utils.document_term_matrix(texts[test], model.vocabulary)[0]
+    )
+    n_test = X.shape[0]
+    print(f"document-term matrix of {n_test} emails: {elapsed:.3f} s")
+
+    elapsed, probs = timed(lambda: model.predict_proba(X))
+    print(f"scoring {n_test} emails: {elapsed:.4f} s ({n_test / elapsed:.0f} emails/s)")
+    print(f"accuracy: {np.mean((probs > 0.5) == labels[test]):.4f}")
+
+    for n_features in [None, 2**20]:
+        tokenizer = utils.EmailTokenizer(n_features=n_features)
+        elapsed, corpus = timed(lambda: tokenizer.transform(texts[train]))
+        print(
+            f"EmailTokenizer(n_features={n_features}) on {len(corpus)} emails: {elapsed:.3f} s "
+            f"({corpus.token_ids.nbytes / 1e6:.1f} MB of token ids)"
+        )
+
+    counts = model.word_counts
+    word_freq = {
+        word: {"spam": counts[j, 0], "ham": counts[j, 1]}
+        for word, j in model.vocabulary.items()
+    }
+    class_freq = {"spam": model.class_counts[0], "ham": model.class_counts[1]}
+
+    n_loop = 5_000
+    elapsed, _ = timed(
+        lambda: [
+            naive_bayes_classifier(text, word_freq, class_freq)
+            for text in texts[test][:n_loop]
+        ]
+    )
+    print(f"naive_bayes_classifier loop: {n_loop / elapsed:.0f} emails/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1190 @@
+# Plots and notebook widgets. Kept out of utils so that importing the numerical core
+# does not import matplotlib, seaborn, ipywidgets or scipy.stats; utils forwards these
+# names here on first use.
+import numpy as np
+from datetime import timedelta, date
+import time
+import matplotlib.pyplot as plt
+import matplotlib.gridspec as gridspec
+import seaborn as sns
+import ipywidgets as widgets
+from ipywidgets import interact, interact_manual, HBox, VBox
+from IPython.display import display
+from scipy import stats
+from scipy.stats import norm
+
+from utils import (
+    StreamingSampleMeans,
+    _binned_kde,
+    _histogram_edges,
+    first_shared_bday,
+    load_dataset,
+    monty_hall_batch,
+    monty_hall_sweep,
+    monty_hall_win_rate,
+    params_gaussian,
+    sample_means,
+    simulate_sweep,
+    students_until_match,
+)
+
+
+class CLTDashboard:
+    """
+    Population / sample means / QQ figure of the CLT widgets, created once and updated
+    in place: the histograms are step patches fed by np.histogram, the KDE is a binned
+    Gaussian smoothing of a fine histogram and the QQ plot updates the data of its lines.
+
+    With the inline backend the figure cannot change after it has been shown, so every
+    update displays it again (still without rebuilding any artist).
+    """
+
+    def __init__(self, bins=50, kde_bins=256):
+        self.bins = bins
+        self.kde_bins = kde_bins
+        self.inline = "inline" in plt.get_backend()
+
+        fig, axes = plt.subplot_mosaic(
+            [["top row", "top row"], ["bottom left", "bottom right"]], figsize=(10, 5)
+        )
+        self.fig = fig
+        self.ax_population = axes["top row"]
+        self.ax_means = axes["bottom left"]
+        self.ax_qq = axes["bottom right"]
+
+        self.ax_population.set_title("Population Distribution")
+        self.ax_means.set_title("Sample Means Distribution")
+        self.ax_qq.set_title("QQ Plot of Sample Means")
+        self.ax_qq.set_xlabel("Theoretical quantiles")
+        self.ax_qq.set_ylabel("Ordered Values")
+
+        self.population_hist = self.ax_population.stairs(
+            [0.0], [0.0, 1.0], fill=True, alpha=0.6
+        )
+        self.means_hist = self.ax_means.stairs(
+            [0.0], [0.0, 1.0], fill=True, alpha=0.6, label="hist"
+        )
+        (self.kde_line,) = self.ax_means.plot(
+            [], [], color="crimson", linestyle="dashed", label="kde"
+        )
+        self.kde_fill = self.ax_means.fill_between(
+            [0.0, 1.0], [0.0, 0.0], color="crimson", alpha=0.25
+        )
+        (self.gaussian_line,) = self.ax_means.plot(
+            [], [], color="black", label="gaussian", linestyle="solid"
+        )
+        self.ax_means.legend()
+        (self.qq_points,) = self.ax_qq.plot([], [], "o")
+        (self.qq_fit,) = self.ax_qq.plot([], [], "r-")
+
+        plt.tight_layout()
+        if self.inline:
+            plt.close(fig)
+
+    def update(self, population, sample_means_data, mu, sigma):
+        population = np.asarray(population)
+        sample_means_data = np.asarray(sample_means_data)
+
+        population_density, population_edges = np.histogram(
+            population, bins=_histogram_edges(population, self.bins), density=True
+        )
+        self.population_hist.set_data(population_density, population_edges)
+
+        density, edges = np.histogram(sample_means_data, bins=self.bins, density=True)
+        self.means_hist.set_data(density, edges)
+
+        counts, kde_edges = np.histogram(sample_means_data, bins=self.kde_bins)
+        centers, kde = _binned_kde(counts, kde_edges)
+        self.kde_line.set_data(centers, kde)
+        self.kde_fill.set_verts(
+            [np.column_stack([np.r_[centers, centers[::-1]], np.r_[kde, 0 * kde]])]
+        )
+
+        x_range = np.linspace(sample_means_data.min(), sample_means_data.max(), 100)
+        gaussian = params_gaussian(mu, sigma).pdf(x_range)
+        self.gaussian_line.set_data(x_range, gaussian)
+
+        (osm, osr), (slope, intercept, _) = stats.probplot(sample_means_data, fit=True)
+        self.qq_points.set_data(osm, osr)
+        self.qq_fit.set_data(osm, slope * osm + intercept)
+
+        self.ax_population.set_xlim(population_edges[0], population_edges[-1])
+        self.ax_population.set_ylim(0, population_density.max() * 1.05)
+        self.ax_means.set_xlim(x_range[0], x_range[-1])
+        self.ax_means.set_ylim(0, max(density.max(), kde.max(), gaussian.max()) * 1.05)
+        self.ax_qq.set_xlim(osm.min() - 0.2, osm.max() + 0.2)
+        margin = 0.05 * (osr.max() - osr.min())
+        self.ax_qq.set_ylim(osr.min() - margin, osr.max() + margin)
+
+        if self.inline:
+            display(self.fig)
+        else:
+            self.fig.canvas.draw_idle()
+
+
+def gaussian_clt():
+    dashboard = CLTDashboard()
+
+    def _plot(mu, sigma, sample_size):
+        gaussian_population = np.random.normal(mu, sigma, 100_000)
+        gaussiam_sample_means = sample_means(gaussian_population, sample_size)
+
+        dashboard.update(
+            gaussian_population,
+            gaussiam_sample_means,
+            mu,
+            sigma / np.sqrt(sample_size),
+        )
+
+    mu_selection = widgets.FloatSlider(
+        value=10.0,
+        min=0.01,
+        max=50.0,
+        step=1.0,
+        description="mu",
+        disabled=False,
+        continuous_update=False,
+        orientation="horizontal",
+        readout=True,
+        readout_format=".1f",
+    )
+
+    sigma_selection = widgets.FloatSlider(
+        value=5.0,
+        min=0.01,
+        max=20.0,
+        step=0.1,
+        description="sigma",
+        disabled=False,
+        continuous_update=False,
+        orientation="horizontal",
+        readout=True,
+        readout_format=".1f",
+    )
+
+    sample_size_selection = widgets.IntSlider(
+        value=2,
+        min=2,
+        max=100,
+        step=1,
+        description="sample_size",
+        disabled=False,
+        continuous_update=False,
+        orientation="horizontal",
+        readout=True,
+        readout_format="d",
+    )
+
+    interact_manual(
+        _plot, sample_size=sample_size_selection, mu=mu_selection, sigma=sigma_selection
+    )
+
+
+def binomial_clt():
+    dashboard = CLTDashboard()
+
+    def _plot(n, p, sample_size):
+        mu = n * p
+        sigma = np.sqrt(n * p * (1 - p)) / np.sqrt(sample_size)
+        N = n * sample_size
+
+        binomial_population = np.random.binomial(n, p, 100_000)
+
+        binomial_sample_means = sample_means(binomial_population, sample_size)
+
+        condition_val = np.min([N * p, N * (1 - p)])
+
+        print(f"Condition value: {condition_val:.1f}")
+
+        dashboard.update(binomial_population, binomial_sample_means, mu, sigma)
+
+    sample_size_selection = widgets.IntSlider(
+        value=2,
+        min=2,
+        max=50,
+        step=1,
+        description="sample_size",
+        disabled=False,
+        continuous_update=False,
+        orientation="horizontal",
+        readout=True,
+        readout_format="d",
+    )
+
+    n_selection = widgets.IntSlider(
+        value=2,
+        min=2,
+        max=50,
+        step=1,
+        description="n",
+        disabled=False,
+        continuous_update=False,
+        orientation="horizontal",
+        readout=True,
+        readout_format="d",
+    )
+
+    prob_success_selection = widgets.FloatSlider(
+        value=0.5,
+        min=0.01,
+        max=0.99,
+        step=0.1,
+        description="p",
+        disabled=False,
+        continuous_update=False,
+        orientation="horizontal",
+        readout=True,
+        readout_format=".1f",
+    )
+
+    interact_manual(
+        _plot,
+        sample_size=sample_size_selection,
+        p=prob_success_selection,
+        n=n_selection,
+    )
+
+
+def poisson_clt():
+    dashboard = CLTDashboard()
+
+    def _plot(mu, sample_size):
+        sigma = np.sqrt(mu) / np.sqrt(sample_size)
+
+        poisson_population = np.random.poisson(mu, 100_000)
+
+        poisson_sample_means = sample_means(poisson_population, sample_size)
+
+        dashboard.update(poisson_population, poisson_sample_means, mu, sigma)
+
+    sample_size_selection = widgets.IntSlider(
+        value=2,
+        min=2,
+        max=50,
+        step=1,
+        description="sample_size",
+        disabled=False,
+        continuous_update=False,
+        orientation="horizontal",
+        readout=True,
+        readout_format="d",
+    )
+
+    mu_selection = widgets.FloatSlider(
+        value=1.5,
+        min=0.01,
+        max=5.0,
+        #         step=1.0,
+        description="mu",
+        disabled=False,
+        continuous_update=False,
+        orientation="horizontal",
+        readout=True,
+        readout_format=".1f",
+    )
+
+    interact_manual(_plot, sample_size=sample_size_selection, mu=mu_selection)
+
+
+def plot_kde_and_qq(sample_means_data, mu_sample_means, sigma_sample_means):
+    if isinstance(sample_means_data, StreamingSampleMeans):
+        _plot_kde_and_qq_streaming(
+            sample_means_data, mu_sample_means, sigma_sample_means
+        )
+        return
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+
+    # Define the x-range for the Gaussian curve (this is just for plotting purposes)
+    x_range = np.linspace(min(sample_means_data), max(sample_means_data), 100)
+
+    # Histogram of sample means (blue)
+    sns.histplot(sample_means_data, stat="density", label="hist", ax=ax1)
+
+    # Estimated PDF of sample means (red)
+    sns.kdeplot(
+        data=sample_means_data,
+        color="crimson",
+        label="kde",
+        linestyle="dashed",
+        fill=True,
+        ax=ax1,
+    )
+
+    # Gaussian curve with estimated mu and sigma (black)
+    ax1.plot(
+        x_range,
+        norm.pdf(x_range, loc=mu_sample_means, scale=sigma_sample_means),
+        color="black",
+        label="gaussian",
+    )
+
+    res = stats.probplot(sample_means_data, plot=ax2, fit=True)
+
+    ax1.legend()
+    plt.show()
+
+
+def _plot_kde_and_qq_streaming(summary, mu_sample_means, sigma_sample_means):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+
+    # Only the sketch is available, so the x-range comes from its extreme quantiles
+    low, high = summary.quantile([0.0005, 0.9995])
+    x_range = np.linspace(low, high, 100)
+
+    ax1.stairs(summary.density(), summary.bin_edges, fill=True, alpha=0.5, label="hist")
+
+    centers, kde = _binned_kde(summary.counts, summary.bin_edges)
+    ax1.plot(centers, kde, color="crimson", label="kde", linestyle="dashed")
+    ax1.fill_between(centers, kde, color="crimson", alpha=0.25)
+
+    ax1.plot(
+        x_range,
+        norm.pdf(x_range, loc=mu_sample_means, scale=sigma_sample_means),
+        color="black",
+        label="gaussian",
+    )
+    ax1.set_xlim(low, high)
+
+    # QQ plot against the Gaussian using quantiles read from the t-digest
+    probs = (np.arange(1, 201) - 0.5) / 200
+    theoretical = norm.ppf(probs)
+    ordered = summary.quantile(probs)
+    slope, intercept = np.polyfit(theoretical, ordered, 1)
+
+    ax2.plot(theoretical, ordered, "o")
+    ax2.plot(theoretical, slope * theoretical + intercept, "r-")
+    ax2.set_title("Probability Plot")
+    ax2.set_xlabel("Theoretical quantiles")
+    ax2.set_ylabel("Ordered Values")
+
+    ax1.legend()
+    plt.show()
+
+
+class your_bday:
+    def __init__(self) -> None:
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+
+        self.fig = fig
+        self.ax = ax1
+        self.ax_hist = ax2
+        self.dates = [
+            (date(2015, 1, 1) + timedelta(days=n)).strftime("%m-%d") for n in range(365)
+        ]
+        self.bday_str = None
+        self.bday_index = None
+        self.n_students = 0
+        self.history = []
+        self.runs_scatter = self.ax.scatter([], [])
+        self.bday_picker = widgets.DatePicker(
+            description="Pick your bday",
+            disabled=False,
+            style={"description_width": "initial"},
+        )
+        self.start_button = widgets.Button(description="Simulate!")
+
+        display(self.bday_picker)
+        display(self.start_button)
+
+        self.start_button.on_click(self.on_button_clicked)
+
+    def on_button_clicked(self, b):
+        self.n_students = 0
+
+        self.get_bday()
+        self.add_students()
+
+    def get_bday(self):
+        try:
+            self.bday_str = self.bday_picker.value.strftime("%m-%d")
+        except AttributeError:
+            self.ax.set_title(f"Input a valid date and try again!")
+            return
+        self.bday_index = self.dates.index(self.bday_str)
+
+    def add_students(self):
+        if not self.bday_str:
+            return
+
+        self.simulate_runs(1)
+
+    def simulate_runs(self, n_runs):
+        # All the runs are simulated at once, the figure is only updated at the end
+        n_students = students_until_match(n_runs)
+        self.history.extend(n_students.tolist())
+        self.n_students = int(n_students[-1])
+
+        self.ax.set_title(
+            f"Match found. It took {self.n_students} students.\nNumber of runs: {len(self.history)}"
+        )
+        self.runs_scatter.set_offsets(
+            np.column_stack([np.arange(len(self.history)), self.history])
+        )
+        self.ax.relim()
+        self.ax.update_datalim(self.runs_scatter.get_offsets())
+        self.ax.autoscale_view()
+
+        self.ax_hist.clear()
+        sns.histplot(data=self.history, ax=self.ax_hist, bins=16)
+        self.fig.canvas.draw_idle()
+
+
+def plot_simulated_probs(sim_probs, class_size, exact_probs=None):
+    fig, ax = plt.subplots(1, 1, figsize=(10, 4))
+    #     ax.scatter(class_size, sim_probs)
+    sns.scatterplot(x=class_size, y=sim_probs, ax=ax, label="simulated probabilities")
+    if exact_probs is not None:
+        ax.plot(class_size, exact_probs, color="black", label="exact probabilities")
+    ax.set_ylabel("Simulated Probability")
+    ax.set_xlabel("Classroom Size")
+    ax.set_title("Probability vs Number of Students")
+    ax.plot([0, max(class_size)], [0.5, 0.5], color="red", label="p = 0.5")
+    ax.grid(which="minor", color="#EEEEEE", linewidth=0.8)
+    ax.minorticks_on()
+    ax.legend()
+    plt.show()
+
+
+def plot_simulated_probs_live(problem_func, class_size, n_simulations=1000, **kwargs):
+    fig, ax = plt.subplots(1, 1, figsize=(10, 4))
+    ax.set_ylabel("Simulated Probability")
+    ax.set_xlabel("Classroom Size")
+    ax.set_title("Probability vs Number of Students")
+    ax.plot([0, max(class_size)], [0.5, 0.5], color="red", label="p = 0.5")
+    ax.set_xlim(0, max(class_size) * 1.02)
+    ax.set_ylim(-0.05, 1.05)
+    ax.grid(which="minor", color="#EEEEEE", linewidth=0.8)
+    ax.minorticks_on()
+    sc = ax.scatter([], [], label="simulated probabilities")
+    ax.legend()
+
+    def _update(sim_probs):
+        # Points fill in as their blocks of trials come back from the workers
+        sc.set_offsets(np.column_stack([class_size, sim_probs]))
+        fig.canvas.draw_idle()
+        fig.canvas.flush_events()
+
+    sim_probs = simulate_sweep(
+        problem_func, class_size, n_simulations, callback=_update, **kwargs
+    )
+    plt.show()
+
+    return sim_probs
+
+
+class third_bday_problem:
+    def __init__(self, animate=True, max_fps=30) -> None:
+        fig, axes = plt.subplot_mosaic(
+            [["top row", "top row"], ["bottom left", "bottom right"]], figsize=(10, 8)
+        )
+        self.fig = fig
+        self.ax = axes["top row"]
+        self.count_ax = axes["bottom left"]
+        self.ax_hist = axes["bottom right"]
+        self.x = np.arange(365)
+        self.animate = animate
+        self.max_fps = max_fps
+        self.match = False
+        self.n_students = 0
+
+        self.dates = [
+            (date(2015, 1, 1) + timedelta(days=n)).strftime("%m-%d") for n in range(365)
+        ]
+        self.month_names = [
+            "January",
+            "February",
+            "March",
+            "April",
+            "May",
+            "June",
+            "July",
+            "August",
+            "September",
+            "October",
+            "November",
+            "December",
+        ]
+
+        self.history = []
+        self.match_index = None
+        self.match_str = None
+        self.runs_scatter = self.count_ax.scatter([], [])
+        self.count_ax.set_ylabel("# of students")
+        self.count_ax.set_xlabel("# of simulations")
+
+        self.new_run()
+
+        self.cpoint = self.fig.canvas.mpl_connect(
+            "button_press_event", self.on_button_clicked
+        )
+
+    def on_button_clicked(self, event):
+        if event.inaxes in [self.ax]:
+            self.new_run()
+            self.add_students()
+
+    def add_students(self):
+        n_students, shared_bday, bdays = first_shared_bday(1)
+        n_students, shared_bday = int(n_students[0]), int(shared_bday[0])
+
+        if self.animate:
+            self._animate_run(bdays[0, :n_students])
+
+        self.match = True
+        self.match_index = shared_bday
+        self.match_str = self.dates[shared_bday]
+        self._record_runs([n_students])
+
+    def simulate_runs(self, n_runs):
+        # No animation: every run is simulated at once and the figure is updated once
+        n_students, shared_bday, _ = first_shared_bday(n_runs)
+
+        self.match = True
+        self.match_index = int(shared_bday[-1])
+        self.match_str = self.dates[self.match_index]
+        self._record_runs(n_students.tolist())
+
+    def _animate_run(self, run_bdays):
+        y = np.full(365, np.nan)
+        y_match = np.full(365, np.nan)
+        last_frame = len(run_bdays) - 1
+        min_interval = 1 / self.max_fps
+        last_draw = -np.inf
+
+        for i, bday in enumerate(run_bdays):
+            if not np.isnan(y[bday]):
+                y_match[bday] = 1
+            y[bday] = 0.5
+
+            # Frames are dropped to respect max_fps, the last one is always drawn
+            now = time.perf_counter()
+            if now - last_draw < min_interval and i != last_frame:
+                continue
+            last_draw = now
+
+            self.ax.set_title(f"Number of students: {i + 1}")
+            self._update_stems(self.stems, y)
+            self._update_stems(self.match_stems, y_match)
+            self._blit()
+
+    @staticmethod
+    def _update_stems(stems, y):
+        markerline, stemlines, _ = stems
+        markerline.set_ydata(y)
+        present = ~np.isnan(y)
+        stemlines.set_segments(
+            [[(x, 0), (x, top)] for x, top in zip(np.flatnonzero(present), y[present])]
+        )
+
+    def _blit(self):
+        canvas = self.fig.canvas
+        if self.background is None or not canvas.supports_blit:
+            canvas.draw()
+            canvas.flush_events()
+            return
+
+        # Only the artists that change during a run are redrawn over the background
+        canvas.restore_region(self.background)
+        for artist in [*self.stems[:2], *self.match_stems[:2], self.ax.title]:
+            self.ax.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def _record_runs(self, n_students):
+        self.history.extend(n_students)
+        self.n_students = n_students[-1]
+
+        self.runs_scatter.set_offsets(
+            np.column_stack([np.arange(len(self.history)), self.history])
+        )
+        self.count_ax.update_datalim(self.runs_scatter.get_offsets())
+        self.count_ax.autoscale_view()
+
+        month_str = self.month_names[int(self.match_str.split("-")[0]) - 1]
+        day_value = self.match_str.split("-")[1]
+        self.ax.set_title(
+            f"Match found for {month_str} {day_value}\nIt took {self.n_students} students to get a match"
+        )
+        self.ax_hist.clear()
+        sns.histplot(data=self.history, ax=self.ax_hist, bins="auto")
+        self.fig.canvas.draw_idle()
+
+    def new_run(self):
+        self.n_students = 0
+        self.match = False
+        self.ax.clear()
+        self.ax.spines["top"].set_color("none")
+        self.ax.spines["right"].set_color("none")
+        self.ax.spines["left"].set_color("none")
+        self.ax.get_yaxis().set_visible(False)
+        self.ax.set_xlim(-5, 370)
+        self.ax.set_ylim(0, 1.1)
+
+        # The stems are created once per run and then updated in place
+        self.match_stems = self.ax.stem(self.x, np.full(365, np.nan), markerfmt="*")
+        plt.setp(self.match_stems.markerline, color="green")
+        plt.setp(self.match_stems.stemlines, "color", "green")
+        plt.setp(self.match_stems.stemlines, "linestyle", "dotted")
+        self.stems = self.ax.stem(self.x, np.full(365, np.nan), markerfmt="o")
+
+        self.background = None
+        if self.animate and self.fig.canvas.supports_blit:
+            for artist in [*self.stems[:2], *self.match_stems[:2], self.ax.title]:
+                artist.set_animated(True)
+            self.fig.canvas.draw()
+            self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+            for artist in [*self.stems[:2], *self.match_stems[:2], self.ax.title]:
+                artist.set_animated(False)
+
+
+class monty_hall_game:
+    def __init__(self) -> None:
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+        self.fig = fig
+        self.ax = ax1
+        self.results_ax = ax2
+        self.memory_wins = {"switch": 0, "stay": 0}
+        self.memory_games = {"switch": 0, "stay": 0}
+        self.games_finished = 0
+        self.start()
+
+        self.cpoint = self.fig.canvas.mpl_connect("button_press_event", self.click_plot)
+
+    def start(self) -> None:
+        self.ax.clear()
+        values = [10, 10, 10]
+        door_numbers = ["Door 1", "Door 2", "Door 3"]
+
+        self.ax.spines["top"].set_color("none")
+        self.ax.spines["right"].set_color("none")
+        self.ax.spines["left"].set_color("none")
+        self.ax.get_yaxis().set_visible(False)
+
+        self.ax.bar(
+            door_numbers,
+            values,
+            color=["brown", "brown", "brown"],
+            width=0.6,
+            edgecolor=["black", "black", "black"],
+        )
+        self.ax.set_title(f"New game started, pick any door.")
+
+        self.prize_coordinates = [-0.15, 0.85, 1.85]
+
+        self.doors, self.winner_index = self.init_monty_hall()
+        self.prizes = list(map(lambda x: "GOAT" if x == 0 else "CAR", list(self.doors)))
+
+        self.choice = None
+        self.switch = None
+        self.temptative_final_door = None
+        self.final_choice = None
+        self.first_pick = True
+        self.game_over = False
+        self.won = None
+        self.ilegal_move = False
+
+    def click_plot(self, event):
+        if event.inaxes in [self.ax]:
+            if self.game_over:
+                self.start()
+                return
+
+            # if self.choice and self.final_choice:
+            #     self.start()
+
+            if self.first_pick:
+                self.first_pick_mtd(event.xdata)
+            else:
+                self.second_pick_mtd(event.xdata)
+
+            if ((self.choice is not None) or (self.final_choice is not None)) and (
+                not self.ilegal_move
+            ):
+                self.update_bar_chart()
+
+    def first_pick_mtd(self, x_coord):
+        if (x_coord >= -0.3) and (x_coord <= 0.3):
+            self.choice = 0
+        elif (x_coord >= 0.7) and (x_coord <= 1.3):
+            self.choice = 1
+        elif (x_coord >= 1.7) and (x_coord <= 2.3):
+            self.choice = 2
+        else:
+            self.choice = None
+            #             print("click a door")
+            # self.ax.set_title(f"Click on a door to move forward")
+            self.start()
+
+    def second_pick_mtd(self, x_coord):
+        if (x_coord >= -0.3) and (x_coord <= 0.3):
+            self.final_choice = 0
+        elif (x_coord >= 0.7) and (x_coord <= 1.3):
+            self.final_choice = 1
+        elif (x_coord >= 1.7) and (x_coord <= 2.3):
+            self.final_choice = 2
+        else:
+            self.final_choice = None
+            #             print("click a door")
+            # self.ax.set_title(f"Click on a door to move forward")
+            self.start()
+
+        if self.final_choice == self.opened_door:
+            self.ax.set_title(f"You selected the opened door.\nThis game doesn't count")
+            self.ilegal_move = True
+            self.game_over = True
+
+    def update_bar_chart(self):
+        if self.first_pick:
+            values = [10, 10, 10]
+            colors = ["brown", "brown", "brown"]
+            edge_colors = ["black", "black", "black"]
+            linewidths = [1, 1, 1]
+            # colors[self.choice] = "red"
+            edge_colors[self.choice] = "red"
+            linewidths[self.choice] = 5
+
+            door_numbers = ["Door 1", "Door 2", "Door 3"]
+            self.opened_door = self.open_door()
+            # values[opened_door] = 0
+
+            colors[self.opened_door] = "gray"
+
+            self.ax.clear()
+            self.ax.text(
+                self.prize_coordinates[self.opened_door],
+                5,
+                f"{self.prizes[self.opened_door]}",
+            )
+
+            # self.ax.text(0,10,f"You chose door {self.choice} and host opened door {opened_door}")
+            # self.ax.text(0.4,5,f"{self.doors}")
+            # self.results_ax.bar(door_numbers, values, color = colors,width = 0.6, edgecolor = ['black', 'black', 'black'])
+
+            self.ax.bar(
+                door_numbers,
+                values,
+                color=colors,
+                width=0.6,
+                edgecolor=edge_colors,
+                linewidth=linewidths,
+            )
+            self.ax.set_title(
+                f"You chose door {self.choice+1} and host opened door {self.opened_door+1}.\nDecide your final door."
+            )
+            self.first_pick = False
+        else:
+            values = [10, 10, 10]
+            colors = ["gray", "gray", "gray"]
+            colors[self.winner_index] = "green"
+            edge_colors = ["black", "black", "black"]
+            edge_colors[self.final_choice] = "red"
+            linewidths = [1, 1, 1]
+            linewidths[self.final_choice] = 5
+            door_numbers = ["Door 1", "Door 2", "Door 3"]
+            self.ax.clear()
+            for i in range(3):
+                self.ax.text(self.prize_coordinates[i], 5, f"{self.prizes[i]}")
+            self.ax.bar(
+                door_numbers,
+                values,
+                color=colors,
+                width=0.6,
+                edgecolor=edge_colors,
+                linewidth=linewidths,
+            )
+            self.game_over = True
+            self.check_if_switch()
+            msg = " " if self.switch else " NOT "
+            self.ax.set_title(
+                f"You decided{msg}to switch and chose door #{self.final_choice+1}\n You got a {self.prizes[self.final_choice]}"
+            )
+
+            self.games_finished += 1
+            if self.switch:
+                self.memory_wins["switch"] += self.doors[self.final_choice]
+                self.memory_games["switch"] += 1
+            else:
+                self.memory_wins["stay"] += self.doors[self.final_choice]
+                self.memory_games["stay"] += 1
+
+            self.update_results_chart()
+
+    def update_results_chart(self):
+        self.results_ax.clear()
+        self.results_ax.set_title(
+            f"Games finished: {self.games_finished}\nGames you switched: {self.memory_games['switch']}, Games you stayed: {self.memory_games['stay']}"
+        )
+        self.results_ax.scatter(
+            ["switch", "stay"],
+            [
+                self.memory_wins["switch"] / self.memory_games["switch"],
+                self.memory_wins["stay"] / self.memory_games["stay"],
+            ],
+            s=350,
+        )
+        self.results_ax.set_ylim(0, 1)
+
+    def check_if_switch(self):
+        self.switch = False if self.choice == self.final_choice else True
+
+    def init_monty_hall(self):
+        doors = np.array([0, 0, 0])
+        winner_index = np.random.randint(0, 3)
+        doors[winner_index] = 1
+
+        return doors, winner_index
+
+    def open_door(self):
+        openable_doors = [
+            i for i in range(3) if i not in (self.winner_index, self.choice)
+        ]
+        door_to_open = np.random.choice(openable_doors)
+
+        return door_to_open
+
+
+def _plot_win_rate(switch, n_iterations, win_rate, exact_win_rate, figsize):
+    loss_rate = 1 - win_rate
+
+    fig, ax = plt.subplots(1, 1, figsize=figsize)
+    ax.pie(
+        [win_rate, loss_rate],
+        labels=["Win a car", "Win... a goat?"],
+        colors=sns.color_palette("pastel")[2:],
+        autopct="%.0f%%",
+    )
+
+    msg = "always" if switch else "never"
+    ax.set_title(f"Win rate if you {msg} switch doors ({n_iterations} simulations)")
+    if exact_win_rate is not None:
+        ax.set_xlabel(
+            f"Simulated: {win_rate:.2%}, exact: {exact_win_rate:.2%} (gap {win_rate - exact_win_rate:+.2%})"
+        )
+    plt.show()
+
+
+def success_rate_plot(f, batch=False):
+    """
+    Widget that plays f(switch=...) (or f(switch=..., n=..., k=...) for
+    generalized_monty_hall) n_iterations times and plots the win rate.
+
+    Args:
+        f (callable): The notebook's monty_hall or generalized_monty_hall.
+        batch (bool): Simulate the standard rules with monty_hall_batch instead of calling
+            f game by game. This allows up to 1,000,000 iterations and shows the exact win
+            rate, but f itself is not run.
+    """
+
+    def _plot(switch, n_iterations):
+        if batch:
+            wins = monty_hall_batch(n_iterations, switch).sum()
+        else:
+            wins = 0
+            for _ in range(n_iterations):
+                wins += f(switch=switch)
+
+        _plot_win_rate(
+            switch,
+            n_iterations,
+            wins / n_iterations,
+            monty_hall_win_rate(switch) if batch else None,
+            figsize=(10, 4),
+        )
+
+    def _plot_generalized(switch, n_iterations, n=3, k=1):
+        try:
+            if batch:
+                wins = monty_hall_batch(n_iterations, switch, n=n, k=k).sum()
+            else:
+                wins = 0
+                for _ in range(n_iterations):
+                    wins += f(switch=switch, n=n, k=k)
+        except ValueError:
+            print(
+                "n is the number of doors and k is the amount of doors the host opens. Since you have already picked one door, k has to be at most n-2, so there is at least one openable door after the host open the k doors."
+            )
+            return
+
+        _plot_win_rate(
+            switch,
+            n_iterations,
+            wins / n_iterations,
+            monty_hall_win_rate(switch, n=n, k=k) if batch else None,
+            figsize=(12, 4),
+        )
+
+    n_iterations_selection = widgets.SelectionSlider(
+        options=[1, 10, 100, 1000] + ([10_000, 100_000, 1_000_000] if batch else []),
+        value=1,
+        description="# iterations",
+        disabled=False,
+        continuous_update=False,
+        orientation="horizontal",
+        readout=True,
+    )
+
+    strategy_selection = widgets.RadioButtons(
+        options=[True, False],
+        value=False,
+        description="Switch Doors?",
+        disabled=False,
+    )
+
+    if f.__name__ == "monty_hall":
+        interact_manual(
+            _plot,
+            switch=strategy_selection,
+            n_iterations=n_iterations_selection,
+        )
+
+    if f.__name__ == "generalized_monty_hall":
+        disabled = False
+
+        n_selection = widgets.SelectionSlider(
+            options=range(3, 101),
+            value=3,
+            description="n",
+            disabled=disabled,
+        )
+
+        k_selection = widgets.SelectionSlider(
+            options=range(0, 99),
+            value=1,
+            description="k",
+            disabled=disabled,
+        )
+
+        interact_manual(
+            _plot_generalized,
+            switch=strategy_selection,
+            n_iterations=n_iterations_selection,
+            n=n_selection,
+            k=k_selection,
+        )
+
+
+def plot_monty_hall_surface(n_iterations=1000, seed=0, **kwargs):
+    sweep = monty_hall_sweep(n_iterations, seed, **kwargs)
+    extent = [
+        sweep["k"][0] - 0.5,
+        sweep["k"][-1] + 0.5,
+        sweep["n"][0] - 0.5,
+        sweep["n"][-1] + 0.5,
+    ]
+
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5), sharey=True)
+    for ax, strategy in zip(axes, ["switch", "stay"]):
+        im = ax.imshow(
+            sweep[strategy],
+            origin="lower",
+            aspect="auto",
+            extent=extent,
+            vmin=0,
+            vmax=1,
+            cmap="viridis",
+        )
+        ax.set_title(f"Win rate if you {strategy}")
+        ax.set_xlabel("k (doors opened by the host)")
+    axes[0].set_ylabel("n (doors)")
+    fig.colorbar(im, ax=axes, label="win rate")
+    plt.show()
+
+
+def success_rate_surface(n_iterations=1000, seed=0, **kwargs):
+    # Same pie chart as success_rate_plot, but every slider position is a lookup into
+    # the cached (n, k) sweep instead of a new simulation
+    sweep = monty_hall_sweep(n_iterations, seed, **kwargs)
+    n_index = {int(n): i for i, n in enumerate(sweep["n"])}
+
+    def _plot(switch, n=3, k=1):
+        if not (0 <= k <= n - 2):
+            print(
+                "n is the number of doors and k is the amount of doors the host opens. Since you have already picked one door, k has to be at most n-2, so there is at least one openable door after the host open the k doors."
+            )
+            return
+
+        win_rate = sweep["switch" if switch else "stay"][n_index[n], k]
+        _plot_win_rate(
+            switch,
+            n_iterations,
+            win_rate,
+            monty_hall_win_rate(switch, n=n, k=k),
+            figsize=(12, 4),
+        )
+
+    interact(
+        _plot,
+        switch=widgets.RadioButtons(
+            options=[True, False], value=False, description="Switch Doors?"
+        ),
+        n=widgets.SelectionSlider(
+            options=[int(n) for n in sweep["n"]], value=3, description="n"
+        ),
+        k=widgets.SelectionSlider(
+            options=[int(k) for k in sweep["k"]], value=1, description="k"
+        ),
+    )
+
+
+def plot_gaussian_distributions(gaussian_0, gaussian_1, gaussian_2):
+    fig, ax = plt.subplots(1, 1, figsize=(10, 4))
+    ax.hist(gaussian_0, alpha=0.5, label="gaussian_0", bins=32)
+    ax.hist(gaussian_1, alpha=0.5, label="gaussian_1", bins=32)
+    ax.hist(gaussian_2, alpha=0.5, label="gaussian_2", bins=32)
+    ax.set_title("Histograms of Gaussian distributions")
+    ax.set_xlabel("Values")
+    ax.set_ylabel("Frequencies")
+    ax.legend()
+    plt.show()
+
+
+def plot_binomial_distributions(binomial_0, binomial_1, binomial_2):
+    fig, ax = plt.subplots(1, 1, figsize=(10, 4))
+    ax.hist(binomial_0, alpha=0.5, label="binomial_0")
+    ax.hist(binomial_1, alpha=0.5, label="binomial_1")
+    ax.hist(binomial_2, alpha=0.5, label="binomial_2")
+    ax.set_title("Histograms of Binomial distributions")
+    ax.set_xlabel("Values")
+    ax.set_ylabel("Frequencies")
+    ax.legend()
+    plt.show()
+
+
+def plot_anscombes_quartet():
+    anscombe = load_dataset("anscombe")
+    fig, axs = plt.subplots(2, 2, figsize=(8, 5), tight_layout=True)
+    i = 1
+    fig.suptitle("Anscombe's quartet", fontsize=16)
+    for line in axs:
+        for ax in line:
+            points = anscombe.group_points[i]
+            ax.scatter(points[:, 0], points[:, 1])
+            ax.set_title(f"Group {i}")
+            ax.set_ylim(2, 15)
+            ax.set_xlim(0, 21)
+            ax.set_xlabel("x")
+            ax.set_ylabel("y")
+            i += 1
+
+
+def display_widget():
+    # Group coordinates and statistics are precomputed once, callbacks only read them
+    datasaurus = load_dataset("datasaurus")
+    dropdown_graph_1 = widgets.Dropdown(
+        options=list(datasaurus.group_index),
+        value="dino",
+        description="Data set 1: ",
+        disabled=False,
+    )
+
+    statistics_graph_1 = widgets.Button(
+        value=False,
+        description="Compute stats",
+        disabled=False,
+        button_style="",
+        tooltip="Description",
+        icon="",
+    )
+
+    dropdown_graph_2 = widgets.Dropdown(
+        options=list(datasaurus.group_index),
+        value="h_lines",
+        description="Data set 2: ",
+        disabled=False,
+    )
+
+    statistics_graph_2 = widgets.Button(
+        value=False,
+        description="Compute stats",
+        disabled=False,
+        button_style="",
+        tooltip="Description",
+        icon="",
+    )
+    plotted_stats_graph_1 = None
+    plotted_stats_graph_2 = None
+
+    fig = plt.figure(figsize=(8, 4), tight_layout=True)
+    gs = gridspec.GridSpec(2, 2)
+    ax_1 = fig.add_subplot(gs[0, 0])
+    ax_2 = fig.add_subplot(gs[1, 0])
+    ax_text_1 = fig.add_subplot(gs[0, 1])
+    ax_text_2 = fig.add_subplot(gs[1, 1])
+    points_1 = datasaurus.group_points["dino"]
+    points_2 = datasaurus.group_points["h_lines"]
+    sc_1 = ax_1.scatter(points_1[:, 0], points_1[:, 1], s=4)
+    sc_2 = ax_2.scatter(points_2[:, 0], points_2[:, 1], s=4)
+    ax_1.set_xlabel("x")
+    ax_1.set_ylabel("y")
+    ax_2.set_xlabel("x")
+    ax_2.set_ylabel("y")
+    ax_text_1.axis("off")
+    ax_text_2.axis("off")
+
+    def dropdown_choice(value, plotted_stats, ax_text, sc):
+        if value.new != plotted_stats:
+            ax_text.clear()
+            ax_text.axis("off")
+        sc.set_offsets(datasaurus.group_points[value.new])
+        fig.canvas.draw_idle()
+
+    def get_stats(value, plotted_stats, ax_text, dropdown, val):
+        value = dropdown.value
+        if value == plotted_stats:
+            return
+        ax_text.clear()
+        ax_text.axis("off")
+        group_stats = datasaurus.statistics[value]
+        ax_text.text(
+            0,
+            0,
+            f"Statistics:\n      Mean x:      {group_stats['mean_x']:.2f}\n      Variance x: {group_stats['var_x']:.2f}\n\n      Mean y:      {group_stats['mean_y']:.2f}\n      Variance y: {group_stats['var_y']:.2f}\n\n      Correlation:  {group_stats['corr']:.2f}",
+        )
+        if val == 1:
+            plotted_stats_graph_1 = value
+        if val == 2:
+            plotted_stats_graph_2 = value
+
+    dropdown_graph_1.observe(
+        lambda value: dropdown_choice(value, plotted_stats_graph_1, ax_text_1, sc_1),
+        names="value",
+    )
+    statistics_graph_1.on_click(
+        lambda value: get_stats(
+            value, plotted_stats_graph_1, ax_text_1, dropdown_graph_1, 1
+        )
+    )
+    dropdown_graph_2.observe(
+        lambda value: dropdown_choice(value, plotted_stats_graph_2, ax_text_2, sc_2),
+        names="value",
+    )
+    statistics_graph_2.on_click(
+        lambda value: get_stats(
+            value, plotted_stats_graph_2, ax_text_2, dropdown_graph_2, 2
+        )
+    )
+    graph_1_box = HBox([dropdown_graph_1, statistics_graph_1])
+    graph_2_box = HBox([dropdown_graph_2, statistics_graph_2])
+    display(VBox([graph_1_box, graph_2_box]))
+
+
+def plot_datasaurus():
+    datasaurus = load_dataset("datasaurus")
+    fig, axs = plt.subplots(6, 2, figsize=(7, 9), tight_layout=True)
+    i = 0
+    fig.suptitle("Datasaurus", fontsize=16)
+    for line in axs:
+        for ax in line:
+            if i > 12:
+                ax.axis("off")
+            else:
+                group = datasaurus.groups[i]
+                points = datasaurus.group_points[group]
+                ax.scatter(points[:, 0], points[:, 1], s=4)
+                ax.set_title(f"Group {group}")
+                ax.set_ylim(-5, 110)
+                ax.set_xlim(10, 110)
+                ax.set_xlabel("x")
+                ax.set_ylabel("y")
+                i += 1
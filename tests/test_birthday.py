@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+import utils
+
+
+def test_user_problem_function_is_not_replaced_by_kernel():
+    calls = []
+
+    def problem_1(n_students):
+        calls.append(n_students)
+        return True
+
+    assert utils.count_matches(problem_1, 23, 50) == 50
+    assert calls == [23] * 50
+    assert utils.simulate(problem_1, 23, 50) == 1.0
+
+
+@pytest.mark.parametrize("problem", [1, 2, 3, 4])
+def test_batch_kernels_match_exact_probability(problem):
+    kernel = utils._BATCH_PROBLEMS[problem][0]
+    n_students = 30
+    n_trials = 40_000
+
+    simulated = utils.simulate(kernel, n_students, n_trials, np.random.default_rng(0))
+    exact = utils.exact_birthday_prob(problem, n_students)
+
+    assert simulated == pytest.approx(exact, abs=4 * np.sqrt(0.25 / n_trials))
+
+
+def test_count_matches_in_small_chunks():
+    n_trials = 20_000
+    count = utils.count_matches(
+        utils.problem_3_batch, 23, n_trials, np.random.default_rng(1), 23 * 7
+    )
+
+    assert count / n_trials == pytest.approx(
+        utils.exact_birthday_prob(3, 23), abs=4 * np.sqrt(0.25 / n_trials)
+    )
+
+
+def test_problem_number_rejects_user_functions():
+    def problem_3(n_students):
+        return False
+
+    assert utils._problem_number(utils.problem_3_batch) == 3
+    assert utils._problem_number("problem_2") == 2
+    with pytest.raises(ValueError):
+        utils._problem_number(problem_3)
+
+
+def test_exact_birthday_prob_known_values():
+    assert utils.exact_birthday_prob(3, 23) == pytest.approx(0.507297, abs=1e-6)
+    assert utils.exact_birthday_prob(3, 88, k=3) == pytest.approx(0.511, abs=1e-3)
+    assert utils.exact_birthday_prob(1, 253) == pytest.approx(1 - (364 / 365) ** 253)
+    assert utils.exact_birthday_prob(3, 366) == pytest.approx(1.0)
+    assert utils.exact_birthday_prob(3, 23, weights=np.ones(365)) == pytest.approx(
+        utils.exact_birthday_prob(3, 23)
+    )
+
+
+def test_exact_birthday_prob_rejects_invalid_arguments():
+    with pytest.raises(ValueError):
+        utils.exact_birthday_prob(1, 23, k=3)
+    with pytest.raises(ValueError):
+        utils.exact_birthday_prob(3, 23, k=1)
+    with pytest.raises(ValueError):
+        utils.exact_birthday_prob(4, 23, weights=np.ones(365))
+
+
+def test_exact_birthday_table_is_memoized_and_read_only():
+    table = utils.exact_birthday_table(3, [10, 23])
+
+    assert list(table) == [10, 23]
+    assert table[23] == utils.exact_birthday_prob(3, 23)
+    with pytest.raises(TypeError):
+        table[23] = 0.0
+
+    hits = utils._exact_birthday_table.cache_info().hits
+    again = utils.exact_birthday_table(utils.problem_3_batch, (10, 23))
+    assert utils._exact_birthday_table.cache_info().hits == hits + 1
+    assert dict(again) == dict(table)
+
+    copy = dict(again)
+    copy[23] = 0.0
+    assert utils.exact_birthday_table(3, [23, 10])[23] > 0.5
+
+
+def test_compare_with_simulation():
+    report = utils.compare_with_simulation(
+        2, [10, 100, 300], n_simulations=2000, rng=np.random.default_rng(2)
+    )
+
+    assert np.array_equal(report["class_sizes"], [10, 100, 300])
+    assert np.allclose(report["deviation"], report["simulated"] - report["exact"])
+    assert np.all(np.abs(report["deviation"]) <= 2 * report["band"])
+
+
+def test_first_shared_bday_finds_the_first_repeat():
+    n_students, shared_bday, bdays = utils.first_shared_bday(
+        200, np.random.default_rng(3)
+    )
+
+    assert bdays.shape == (200, 366)
+    for run, n, day in zip(bdays, n_students, shared_bday):
+        seen = set()
+        for i, bday in enumerate(run):
+            if bday in seen:
+                break
+            seen.add(bday)
+        assert (n, day) == (i + 1, bday)
+
+
+def test_first_shared_bday_distribution():
+    n_runs = 20_000
+    n_students, _, _ = utils.first_shared_bday(n_runs, np.random.default_rng(4))
+
+    assert np.mean(n_students <= 23) == pytest.approx(
+        utils.exact_birthday_prob(3, 23), abs=4 * np.sqrt(0.25 / n_runs)
+    )
+
+
+def test_students_until_match_is_geometric():
+    n_students = utils.students_until_match(20_000, np.random.default_rng(5))
+
+    assert n_students.min() >= 1
+    assert n_students.mean() == pytest.approx(365, rel=0.03)
@@ -0,0 +1,107 @@
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+
+
+@pytest.fixture(scope="module")
+def df():
+    return utils.generate_breed_data(
+        {0: 300, 1: 250, 2: 200}, rng=np.random.default_rng(0)
+    )
+
+
+def _breed_matrix(df, breed):
+    return df[df["breed"] == breed][utils.FEATURES].to_numpy(dtype=float)
+
+
+def test_bootstrap_block_matches_resampled_estimates(df):
+    X = _breed_matrix(df, 0)
+    seed_seq = np.random.SeedSequence(1)
+
+    replicates = utils._bootstrap_block(X, utils.FEATURES, 50, 40, 10**6, seed_seq)
+
+    idx = np.random.default_rng(seed_seq).integers(0, len(X), size=(40, 50))
+    expected = np.array(
+        [utils._point_estimates(X[rows], utils.FEATURES) for rows in idx]
+    )
+    assert np.allclose(replicates[:, :6], expected[:, :6])
+
+    # The min and max are read from the sorted column at the same indices, which is
+    # also a resample of that column
+    ordered = np.sort(X[:, 3])
+    assert np.array_equal(replicates[:, 6], ordered[idx].min(axis=1))
+    assert np.array_equal(replicates[:, 7], ordered[idx].max(axis=1))
+
+
+def test_jackknife_matches_leave_one_out(df):
+    X = _breed_matrix(df, 2)[:60]
+
+    expected = [
+        utils._point_estimates(np.delete(X, i, axis=0), utils.FEATURES)
+        for i in range(len(X))
+    ]
+    assert np.allclose(utils._jackknife_estimates(X, utils.FEATURES), expected)
+
+
+@pytest.mark.parametrize("method", ["percentile", "bca", "m_out_of_n"])
+def test_bootstrap_params_intervals(df, method):
+    intervals = utils.bootstrap_params(
+        df, n_boot=2000, method=method, seed=3, max_workers=1
+    )
+    params = utils.compute_training_params(df, utils.FEATURES)
+
+    assert list(intervals) == [0, 1, 2]
+    for breed, features in intervals.items():
+        X = _breed_matrix(df, breed)
+        lo, hi = features["height"]["mu"]
+        assert lo < params[breed]["height"]["mu"] < hi
+        # About 2 * 1.96 standard errors wide
+        assert hi - lo == pytest.approx(
+            2 * 1.96 * X[:, 0].std() / np.sqrt(len(X)), rel=0.2
+        )
+        assert features["bark_days"]["n"] == (30, 30)
+        for name in ("a", "b"):
+            lo, hi = features["ear_head_ratio"][name]
+            assert lo <= hi
+
+
+def test_bootstrap_params_does_not_depend_on_workers(df, monkeypatch):
+    serial = utils.bootstrap_params(
+        df, n_boot=900, seed=4, block_size=200, max_workers=1
+    )
+    monkeypatch.setattr(
+        utils,
+        "ProcessPoolExecutor",
+        functools.partial(
+            ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")
+        ),
+    )
+    parallel = utils.bootstrap_params(
+        df, n_boot=900, seed=4, block_size=200, max_workers=2
+    )
+
+    assert parallel == serial
+
+
+def test_bootstrap_params_rejects_invalid_arguments(df):
+    with pytest.raises(ValueError):
+        utils.bootstrap_params(df, n_boot=10, alpha=1.5, max_workers=1)
+    with pytest.raises(ValueError):
+        utils.bootstrap_params(df, n_boot=10, method="normal", max_workers=1)
+
+
+def test_bootstrap_params_bca_with_a_single_row_class(df):
+    tiny = pd.concat([df[df["breed"] != 2], df[df["breed"] == 2].head(1)])
+
+    bca = utils.bootstrap_params(tiny, n_boot=200, method="bca", seed=5, max_workers=1)
+    percentile = utils.bootstrap_params(tiny, n_boot=200, seed=5, max_workers=1)
+
+    assert bca[2] == percentile[2]
+    height = tiny[tiny["breed"] == 2]["height"].item()
+    assert bca[2]["height"]["mu"] == (height, height)
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+
+N_SAMPLES = {0: 12_000, 1: 13_500, 2: 9_000}
+
+
+def test_breed_chunks_are_stratified():
+    chunks = list(utils.iter_breed_chunks(N_SAMPLES, chunk_size=5000, seed=3))
+    total = sum(N_SAMPLES.values())
+
+    assert [len(c) for c in chunks[:-1]] == [5000] * (len(chunks) - 1)
+    assert sum(len(c) for c in chunks) == total
+
+    breeds = np.concatenate([c["breed"] for c in chunks])
+    for breed, n in N_SAMPLES.items():
+        assert np.count_nonzero(breeds == breed) == n
+
+    for chunk in chunks[:-1]:
+        share = np.count_nonzero(chunk["breed"] == 2) / len(chunk)
+        assert share == pytest.approx(N_SAMPLES[2] / total, abs=0.03)
+
+
+def test_generate_breed_chunk_matches_iteration():
+    chunks = list(utils.iter_breed_chunks(N_SAMPLES, chunk_size=4000, seed=5))
+
+    for index in (0, 4, len(chunks) - 1):
+        chunk = utils.generate_breed_chunk(index, N_SAMPLES, 4000, seed=5)
+        assert np.array_equal(chunk, chunks[index])
+
+
+def test_write_and_regenerate_shards(tmp_path):
+    manifest = utils.write_breed_shards(tmp_path, N_SAMPLES, chunk_size=10_000, seed=7)
+    shards = list(utils.iter_breed_shards(tmp_path))
+
+    assert [s["rows"] for s in manifest["shards"]] == [len(s) for s in shards]
+    assert np.array_equal(utils.regenerate_breed_shard(tmp_path, 2), shards[2])
+
+    stats = utils.fit_breed_shards(tmp_path, max_workers=1).finalize()
+    assert stats[0]["height"]["mu"] == pytest.approx(35, abs=0.1)
+    assert stats[1]["bark_days"]["p"] == pytest.approx(0.5, abs=0.02)
+
+
+def test_manifest_stores_resolved_seed(tmp_path):
+    manifest = utils.write_breed_shards(
+        tmp_path, N_SAMPLES, chunk_size=10_000, seed=None
+    )
+    shards = list(utils.iter_breed_shards(tmp_path))
+
+    assert isinstance(utils._read_manifest(tmp_path)["seed"], int)
+    assert manifest["seed"] == utils._read_manifest(tmp_path)["seed"]
+    for index, shard in enumerate(shards):
+        assert np.array_equal(utils.regenerate_breed_shard(tmp_path, index), shard)
+
+
+def _generate_data_reference():
+    # generate_data as it was written before it was batched
+    frames = [
+        utils.generate_data_for_breed(
+            breed,
+            utils.FEATURES,
+            n,
+            utils.breed_params,
+            np.random.normal,
+            np.random.binomial,
+            np.random.uniform,
+        )
+        for breed, n in {0: 1200, 1: 1350, 2: 900}.items()
+    ]
+    return pd.concat(frames).reset_index(drop=True).sample(frac=1)
+
+
+def test_generate_data_matches_breed_by_breed_generation():
+    np.random.seed(11)
+    expected = _generate_data_reference()
+    np.random.seed(11)
+    df = utils.generate_data(np.random.normal, np.random.binomial, np.random.uniform)
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_generate_breed_data():
+    df = utils.generate_breed_data(N_SAMPLES, rng=np.random.default_rng(8))
+
+    assert list(df.columns) == utils.FEATURES + ["breed"]
+    assert df["breed"].value_counts().to_dict() == N_SAMPLES
+    assert not df["breed"].is_monotonic_increasing
+
+    by_breed = df.groupby("breed")
+    for breed, params in utils.breed_params.items():
+        group = by_breed.get_group(breed)
+        assert group["height"].mean() == pytest.approx(params["height"].mu, abs=0.1)
+        assert group["bark_days"].mean() == pytest.approx(
+            params["bark_days"].n * params["bark_days"].p, abs=0.2
+        )
+        low, high = sorted([params["ear_head_ratio"].a, params["ear_head_ratio"].b])
+        assert group["ear_head_ratio"].between(low, high).all()
+
+    unshuffled = utils.generate_breed_data(N_SAMPLES, shuffle=False)
+    assert unshuffled["breed"].is_monotonic_increasing
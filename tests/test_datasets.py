@@ -0,0 +1,98 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+
+
+@pytest.fixture
+def cache_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "CACHE_DIR", str(tmp_path / "package"))
+    monkeypatch.setattr(utils, "USER_CACHE_DIR", str(tmp_path / "user"))
+    utils._load_dataset.cache_clear()
+    utils._dataset_frame.cache_clear()
+    yield tmp_path
+    utils._load_dataset.cache_clear()
+    utils._dataset_frame.cache_clear()
+
+
+def unwritable(tmp_path, name):
+    # A path below a regular file cannot be created, even when running as root
+    blocker = tmp_path / f"{name}_file"
+    blocker.write_text("")
+    return str(blocker / "cache")
+
+
+@pytest.mark.parametrize("name", ["anscombe", "datasaurus"])
+def test_dataset_matches_csv(cache_dirs, name):
+    df = pd.read_csv(os.path.join(utils.DATA_DIR, utils._DATASETS[name]))
+    dataset = utils.load_dataset(name)
+
+    assert dataset.directory.startswith(str(cache_dirs / "package"))
+    assert list(dataset.groups) == list(df["group"].unique())
+    pd.testing.assert_frame_equal(utils.dataset_frame(name), df)
+
+    for label in dataset.groups[:3]:
+        group = df[df["group"] == label]
+        assert np.array_equal(dataset.group_column(label, "x"), group["x"])
+        stats = dataset.statistics[label]
+        assert stats["mean_y"] == pytest.approx(group["y"].mean())
+        assert stats["var_x"] == pytest.approx(group["x"].var())
+        assert stats["corr"] == pytest.approx(group["x"].corr(group["y"]))
+
+
+def test_dataset_cache_falls_back_to_user_dir(cache_dirs, monkeypatch):
+    monkeypatch.setattr(utils, "CACHE_DIR", unwritable(cache_dirs, "package"))
+
+    dataset = utils.load_dataset("anscombe")
+
+    assert dataset.directory.startswith(str(cache_dirs / "user"))
+    assert len(dataset.column("x")) == 44
+
+
+def test_dataset_cache_falls_back_to_memory(cache_dirs, monkeypatch):
+    monkeypatch.setattr(utils, "CACHE_DIR", unwritable(cache_dirs, "package"))
+    monkeypatch.setattr(utils, "USER_CACHE_DIR", unwritable(cache_dirs, "user"))
+
+    dataset = utils.load_dataset("anscombe")
+
+    assert dataset.directory is None
+    assert len(dataset.column("x")) == 44
+    assert set(dataset.group_points) == set(dataset.groups)
+
+
+def test_outdated_cache_is_replaced_atomically(cache_dirs):
+    directory = utils.load_dataset("anscombe").directory
+    meta_path = os.path.join(directory, "meta.json")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta["source"] = {"mtime_ns": 0, "size": 0}
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    utils._load_dataset.cache_clear()
+
+    rebuilt = utils.load_dataset("anscombe")
+
+    assert rebuilt.directory == directory
+    assert rebuilt.meta["source"]["size"] > 0
+    with open(meta_path) as f:
+        assert json.load(f)["source"] == rebuilt.meta["source"]
+    assert os.listdir(os.path.dirname(directory)) == ["anscombe"]
+
+
+def test_group_points_and_statistics_cover_every_group(cache_dirs):
+    df = pd.read_csv(os.path.join(utils.DATA_DIR, utils._DATASETS["datasaurus"]))
+    dataset = utils.load_dataset("datasaurus")
+    frame = dataset.statistics_frame()
+
+    assert list(frame.index) == list(df["group"].unique())
+    for label, group in df.groupby("group", sort=False):
+        assert np.array_equal(dataset.group_points[label], group[["x", "y"]])
+
+        slope, intercept = np.polyfit(group["x"], group["y"], 1)
+        assert frame.loc[label, "var_y"] == pytest.approx(group["y"].var())
+        assert frame.loc[label, "slope"] == pytest.approx(slope)
+        assert frame.loc[label, "intercept"] == pytest.approx(intercept)
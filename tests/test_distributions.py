@@ -0,0 +1,132 @@
+import itertools
+
+import numpy as np
+import pytest
+from scipy import stats
+
+import utils
+
+
+def test_discrete_table_matches_scipy():
+    table = utils.discrete_table("binomial", 30, 0.8)
+    k = np.arange(-2, 33)
+
+    assert np.allclose(table.pmf(k), stats.binom.pmf(k, 30, 0.8))
+    assert np.allclose(table.cdf(k + 0.5), stats.binom.cdf(k + 0.5, 30, 0.8))
+    assert np.array_equal(
+        table.ppf([0.01, 0.5, 0.99]), stats.binom.ppf([0.01, 0.5, 0.99], 30, 0.8)
+    )
+
+    # Non-integer and negative points have no mass, even where int() would truncate
+    x = np.array([-1.5, -0.5, -0.0, 0.5, 2.5, 29.99, 30.0, 30.5])
+    assert np.allclose(table.pmf(x), stats.binom.pmf(x, 30, 0.8))
+    assert np.array_equal(
+        np.isfinite(table.logpmf(x)), np.isfinite(stats.binom.logpmf(x, 30, 0.8))
+    )
+    params = utils.params_binomial(n=30, p=0.8)
+    assert np.array_equal(params.pmf(x) > 0, stats.binom.pmf(x, 30, 0.8) > 0)
+
+    poisson = utils.discrete_table("poisson", 4.0)
+    assert np.allclose(poisson.pmf(np.arange(20)), stats.poisson.pmf(np.arange(20), 4))
+    assert np.array_equal(poisson.pmf([-0.5, 1.5]), [0.0, 0.0])
+
+
+def test_cached_discrete_tables_are_read_only():
+    table = utils.discrete_table("binomial", 30, 0.5)
+    before = table.pmf(15)
+
+    for array in (table.pmf_table, table.log_pmf_table, table.cdf_table, table.support):
+        with pytest.raises(ValueError):
+            array *= 2
+
+    assert utils.discrete_table("binomial", 30, 0.5).pmf(15) == before
+
+
+def test_discrete_table_does_not_freeze_callers_array():
+    pmf = np.array([0.25, 0.5, 0.25])
+    utils.DiscreteTable(1, pmf)
+
+    pmf[0] = 0.3
+
+
+def load_dice(n_sides, loaded_number):
+    probs = np.full(n_sides, 1 / (n_sides + 1))
+    probs[loaded_number - 1] = 1 - probs[:-1].sum()
+    return probs
+
+
+@pytest.mark.parametrize("rng", [None, np.random.default_rng(0)])
+def test_categorical_sampler_frequencies(rng):
+    np.random.seed(0)
+    probs = load_dice(6, 2)
+    dice = np.arange(6) + 1
+    sampler = utils.CategoricalSampler(probs, values=dice)
+
+    assert sampler.sample(10, rng).shape == (10,)
+    assert sampler.sample_sum(2, 10, rng).shape == (10,)
+
+    n = 200_000
+    rolls = sampler.sample(n, rng)
+    frequencies = np.array([np.mean(rolls == d) for d in dice])
+    assert np.allclose(frequencies, probs, atol=4 * np.sqrt(0.25 / n))
+
+    sums = sampler.sample_sum(2, n, rng)
+    totals, exact = utils.dice_sum_pmf(probs, 2, values=dice)
+    observed = np.array([np.mean(sums == total) for total in totals])
+    assert np.allclose(observed, exact, atol=4 * np.sqrt(0.25 / n))
+
+
+def test_categorical_sampler_rejects_invalid_probs():
+    with pytest.raises(ValueError):
+        utils.CategoricalSampler([0.5, -0.1, 0.6])
+    with pytest.raises(ValueError):
+        utils.CategoricalSampler([0.5, 0.5], values=[1, 2, 3])
+
+
+def _enumerated_sum_pmf(probs, values, n_dice):
+    pmf = {}
+    for faces in itertools.product(range(len(probs)), repeat=n_dice):
+        total = sum(values[f] for f in faces)
+        pmf[total] = pmf.get(total, 0.0) + np.prod([probs[f] for f in faces])
+    return pmf
+
+
+@pytest.mark.parametrize("method", ["direct", "fft"])
+def test_dice_sum_pmf_matches_enumeration(method):
+    sums, pmf = utils.dice_sum_pmf(np.ones(6), 2, method=method)
+    assert np.array_equal(sums, np.arange(2, 13))
+    assert np.allclose(pmf * 36, [1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1])
+
+    probs = np.array([0.1, 0.2, 0.3, 0.4])
+    values = np.array([-1, 0, 2, 5])
+    sums, pmf = utils.dice_sum_pmf(probs, 3, values=values, method=method)
+    expected = _enumerated_sum_pmf(probs, values, 3)
+
+    assert pmf.sum() == pytest.approx(1)
+    for total, p in zip(sums, pmf):
+        assert p == pytest.approx(expected.get(total, 0.0), abs=1e-12)
+
+
+def test_conditional_sum_pmf_matches_enumeration():
+    first = np.array([1, 1, 1, 1, 1, 3.0])
+    second = np.ones(6)
+    sums, pmf = utils.conditional_sum_pmf(first, second, lambda x: x >= 4)
+
+    expected = {}
+    for i, j in itertools.product(range(6), repeat=2):
+        total = i + 1 + (j + 1 if i + 1 >= 4 else 0)
+        expected[total] = expected.get(total, 0.0) + first[i] / 8 * second[j] / 6
+
+    assert pmf.sum() == pytest.approx(1)
+    assert dict(zip(sums.tolist(), pmf)) == pytest.approx(
+        {s: expected.get(s, 0.0) for s in sums.tolist()}
+    )
+
+
+def test_dice_sum_pmf_rejects_invalid_arguments():
+    with pytest.raises(ValueError):
+        utils.dice_sum_pmf(np.ones(6), 0)
+    with pytest.raises(ValueError):
+        utils.dice_sum_pmf(np.ones(2), 2, values=[0.5, 1.5])
+    with pytest.raises(ValueError):
+        utils.dice_sum_pmf(np.ones(6), 2, method="exact")
@@ -0,0 +1,119 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+
+import plotting
+import utils
+
+
+@pytest.mark.parametrize("switch", [True, False])
+@pytest.mark.parametrize("n, k", [(3, 1), (10, 3), (100, 0)])
+def test_monty_hall_batch_matches_exact_win_rate(switch, n, k):
+    n_games = 200_000
+    wins = utils.monty_hall_batch(n_games, switch, n, k, np.random.default_rng(0))
+    exact = utils.monty_hall_win_rate(switch, n, k)
+
+    assert wins.mean() == pytest.approx(exact, abs=4 * np.sqrt(0.25 / n_games))
+
+
+def test_monty_hall_batch_rejects_invalid_k():
+    with pytest.raises(ValueError):
+        utils.monty_hall_batch(10, True, n=3, k=2)
+
+
+@pytest.fixture
+def interactions(monkeypatch):
+    captured = []
+    monkeypatch.setattr(
+        plotting,
+        "interact_manual",
+        lambda f, **widgets: captured.append((f, widgets)),
+    )
+    monkeypatch.setattr(plotting.plt, "show", lambda: plotting.plt.close("all"))
+    return captured
+
+
+def test_success_rate_plot_runs_the_users_function(interactions):
+    calls = []
+
+    def monty_hall(switch):
+        calls.append(switch)
+        return 1
+
+    utils.success_rate_plot(monty_hall)
+    ((plot, widgets),) = interactions
+    assert max(widgets["n_iterations"].options) == 1000
+
+    plot(switch=True, n_iterations=100)
+    assert calls == [True] * 100
+
+
+def test_success_rate_plot_batch_is_opt_in(interactions):
+    def monty_hall(switch):
+        raise AssertionError("not called in batch mode")
+
+    utils.success_rate_plot(monty_hall, batch=True)
+    ((plot, widgets),) = interactions
+    assert max(widgets["n_iterations"].options) == 1_000_000
+
+    plot(switch=True, n_iterations=1000)
+
+
+def test_monty_hall_row_in_chunks():
+    n, n_iterations = 12, 50_000
+    seed_seq = np.random.SeedSequence(0)
+    switch, stay = utils._monty_hall_row(n, n_iterations, 1000, seed_seq)
+
+    k = np.arange(n - 1)
+    exact_switch = (n - 1) / (n * (n - 1 - k))
+    band = 4 * np.sqrt(0.25 / n_iterations)
+    assert switch.shape == stay.shape == (n - 1,)
+    assert np.allclose(switch, exact_switch, atol=band)
+    assert np.allclose(stay, 1 / n, atol=band)
+
+
+def test_monty_hall_sweep_shape(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "CACHE_DIR", str(tmp_path))
+    sweep = utils.monty_hall_sweep(200, seed=1, n_values=range(3, 8), max_workers=1)
+
+    assert sweep["switch"].shape == (5, 6)
+    assert np.isnan(sweep["switch"][0, 2:]).all()
+    assert not np.isnan(sweep["switch"][-1]).any()
+
+    cached = utils.monty_hall_sweep(200, seed=1, n_values=range(3, 8))
+    assert np.array_equal(cached["switch"], sweep["switch"], equal_nan=True)
+
+
+def test_monty_hall_sweep_without_writable_cache(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(utils, "CACHE_DIR", str(blocker / "cache"))
+
+    sweep = utils.monty_hall_sweep(100, seed=2, n_values=range(3, 6), max_workers=1)
+
+    assert sweep["stay"].shape == (3, 4)
+
+
+def test_monty_hall_sweep_cache_is_keyed_by_every_argument(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "CACHE_DIR", str(tmp_path))
+
+    def sweep(**kwargs):
+        return utils.monty_hall_sweep(300, seed=3, max_workers=1, **kwargs)
+
+    small = sweep(n_values=range(3, 6), max_chunk_elements=64)
+    other_chunks = sweep(n_values=range(3, 6), max_chunk_elements=2**20)
+    other_range = sweep(n_values=range(4, 8), max_chunk_elements=64)
+
+    assert len(list(tmp_path.glob("*.npz"))) == 3
+    assert not np.array_equal(other_chunks["switch"], small["switch"], equal_nan=True)
+    for expected, kwargs in [
+        (small, dict(n_values=range(3, 6), max_chunk_elements=64)),
+        (other_chunks, dict(n_values=range(3, 6), max_chunk_elements=2**20)),
+        (other_range, dict(n_values=range(4, 8), max_chunk_elements=64)),
+    ]:
+        cached = sweep(**kwargs)
+        assert np.array_equal(cached["switch"], expected["switch"], equal_nan=True)
+    assert len(list(tmp_path.glob("*.npz"))) == 3
@@ -0,0 +1,67 @@
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+import utils
+
+
+@pytest.fixture
+def spawn_pool(monkeypatch):
+    # The start method of macOS and Windows: workers re-import everything by name
+    monkeypatch.setattr(
+        utils,
+        "ProcessPoolExecutor",
+        functools.partial(
+            ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")
+        ),
+    )
+
+
+def test_importable():
+    assert utils._importable(utils.problem_3_batch)
+    assert utils._importable(np.mean)
+    assert not utils._importable(lambda n: True)
+
+    def local(n):
+        return True
+
+    assert not utils._importable(local)
+
+
+def test_simulate_sweep_with_spawned_workers(spawn_pool):
+    sizes = [10, 23, 40]
+    parallel = utils.simulate_sweep(
+        utils.problem_3_batch, sizes, 600, seed=0, block_size=200, max_workers=2
+    )
+    serial = utils.simulate_sweep(
+        utils.problem_3_batch, sizes, 600, seed=0, block_size=200, max_workers=1
+    )
+
+    assert parallel == serial
+
+
+def test_simulate_sweep_runs_unpicklable_functions_serially(spawn_pool):
+    def problem_1(n_students):
+        return n_students > 20
+
+    probs = utils.simulate_sweep(problem_1, [10, 30], 100, seed=0, max_workers=2)
+
+    assert probs == [0.0, 1.0]
+
+
+def test_serial_sweep_leaves_the_global_state_alone():
+    def problem_1(n_students):
+        return np.random.random() < 0.5
+
+    np.random.seed(123)
+    expected = np.random.random(3)
+
+    np.random.seed(123)
+    probs = utils.simulate_sweep(problem_1, [10, 30], 200, seed=7)
+    assert np.array_equal(np.random.random(3), expected)
+
+    np.random.seed(456)
+    assert utils.simulate_sweep(problem_1, [10, 30], 200, seed=7) == probs
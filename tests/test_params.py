@@ -0,0 +1,124 @@
+import warnings
+from collections.abc import Mapping
+
+import numpy as np
+import pytest
+from scipy import stats
+
+import utils
+
+
+def test_param_dataclasses_match_scipy():
+    x = np.linspace(-1, 40, 50)
+
+    gaussian = utils.params_gaussian(mu=20, sigma=1.5)
+    assert np.allclose(gaussian.pdf(x), stats.norm.pdf(x, 20, 1.5))
+    assert np.allclose(gaussian.logpdf(x), stats.norm.logpdf(x, 20, 1.5))
+    assert np.allclose(gaussian.cdf(x), stats.norm.cdf(x, 20, 1.5))
+
+    # breed_params stores breed 0 with a > b
+    uniform = utils.params_uniform(a=0.6, b=0.1)
+    u = np.linspace(0, 0.7, 15)
+    assert np.allclose(uniform.pdf(u), stats.uniform.pdf(u, 0.1, 0.5))
+    assert np.allclose(uniform.cdf(u), stats.uniform.cdf(u, 0.1, 0.5))
+
+    binomial = utils.params_binomial(n=30, p=0.8)
+    k = np.arange(31)
+    assert np.allclose(binomial.pmf(k), stats.binom.pmf(k, 30, 0.8))
+
+
+def test_degenerate_params_give_inf_or_nan():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        gaussian = utils.params_gaussian(mu=1.0, sigma=0.0)
+        uniform = utils.params_uniform(a=2, b=2)
+
+        assert not np.isfinite(gaussian.pdf([0.0, 1.0, 2.0])).any()
+        assert not np.isfinite(gaussian.logpdf([0.0, 1.0, 2.0])).any()
+        assert not np.isfinite(uniform.pdf([2.0])).any()
+        assert np.array_equal(uniform.pdf([1.0, 3.0]), [0.0, 0.0])
+
+
+def test_param_dataclasses_follow_reassignment():
+    gaussian = utils.params_gaussian(mu=0.0, sigma=1.0)
+    gaussian.mu, gaussian.sigma = 5.0, 2.0
+    assert np.isclose(gaussian.pdf(5.0), stats.norm.pdf(5.0, 5.0, 2.0))
+
+    uniform = utils.params_uniform(a=0, b=1)
+    uniform.b = 4
+    assert np.isclose(uniform.pdf(2.0), 0.25)
+
+    binomial = utils.params_binomial(n=10, p=0.5)
+    binomial.table
+    binomial.n = 20
+    assert np.isclose(binomial.pmf(15), stats.binom.pmf(15, 20, 0.5))
+
+
+def test_param_table_round_trips_degenerate_params():
+    params = {
+        0: {
+            "height": {"mu": 30.0, "sigma": 0.0},
+            "weight": {"mu": 20.0, "sigma": 1.0},
+            "bark_days": {"n": 30, "p": 0.8},
+            "ear_head_ratio": {"a": 0.2, "b": 0.2},
+        }
+    }
+
+    restored = utils.ParamTable.from_params_dict(params).to_params_dict(
+        dataclasses=True
+    )
+    assert restored[0]["height"] == utils.params_gaussian(mu=30.0, sigma=0.0)
+    assert restored[0]["ear_head_ratio"] == utils.params_uniform(a=0.2, b=0.2)
+
+
+def test_param_table_views_are_mappings():
+    table = utils.ParamTable.from_params_dict(utils.breed_params)
+    breed = table[0]
+    height = breed["height"]
+
+    assert isinstance(breed, Mapping) and isinstance(height, Mapping)
+    assert len(breed) == len(utils.FEATURES) and list(breed) == utils.FEATURES
+    assert list(height) == ["mu", "sigma"] and len(height) == 2
+    assert "mu" in height and "n" not in height
+    assert height.mu == height["mu"] == 35
+    assert dict(breed["bark_days"]) == {"n": 30, "p": 0.8}
+    assert height == {"mu": 35.0, "sigma": 1.5}
+    assert not hasattr(height, "__dict__")
+
+    with pytest.raises(KeyError):
+        height["n"]
+    with pytest.raises(KeyError):
+        breed["tail_length"]
+    with pytest.raises(AttributeError):
+        height.n
+
+
+def test_param_table_save_and_load(tmp_path):
+    df = utils.generate_breed_data(rng=np.random.default_rng(0))
+    stats = utils.BreedStats().update(df)
+    table = utils.ParamTable.from_breed_stats(stats)
+
+    assert np.array_equal(
+        table.data, utils.ParamTable.from_params_dict(stats.finalize()).data
+    )
+
+    path = tmp_path / "params.npy"
+    table.save(path)
+    loaded = utils.ParamTable.load(path)
+
+    assert isinstance(loaded.data, np.memmap)
+    assert not loaded.data.flags.writeable
+    assert loaded.to_params_dict() == table.to_params_dict()
+    assert isinstance(utils.ParamTable.load(path, mmap=False).data, np.ndarray)
+
+    predictions, posteriors = utils.predict_breed_batch(df, loaded)
+    expected = utils.predict_breed_batch(df, table)
+    assert np.array_equal(predictions, expected[0])
+    assert np.array_equal(posteriors, expected[1])
+
+    rounded = table.round(2).to_params_dict()
+    for breed, features in table.to_params_dict().items():
+        for feature, values in features.items():
+            assert rounded[breed][feature] == {
+                k: round(v, 2) for k, v in values.items()
+            }
@@ -0,0 +1,112 @@
+import subprocess
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+from scipy import stats
+
+import plotting
+import utils
+
+
+def test_utils_forwards_plotting_names():
+    assert utils.gaussian_clt is plotting.gaussian_clt
+    assert utils.CLTDashboard is plotting.CLTDashboard
+    assert "success_rate_plot" in dir(utils)
+
+
+def test_import_utils_is_headless():
+    code = (
+        "import sys, utils; "
+        "print(any(m in sys.modules for m in "
+        "['matplotlib', 'seaborn', 'ipywidgets', 'plotting', 'scipy.stats']))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=utils.DATA_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_headless_bday_simulations():
+    problem = plotting.third_bday_problem(animate=False)
+    problem.simulate_runs(500)
+    assert len(problem.history) == 500
+    assert problem.n_students == problem.history[-1]
+    assert problem.match_str == problem.dates[problem.match_index]
+
+    bday = plotting.your_bday()
+    bday.simulate_runs(300)
+    assert len(bday.history) == 300 and min(bday.history) >= 1
+    plotting.plt.close("all")
+
+
+def test_datasaurus_widget_reads_precomputed_groups(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "CACHE_DIR", str(tmp_path))
+    utils._load_dataset.cache_clear()
+    displayed = []
+    monkeypatch.setattr(plotting, "display", displayed.append)
+
+    plotting.display_widget()
+    ((box,),) = [displayed]
+    dropdown, button = box.children[0].children
+    fig = plotting.plt.gcf()
+    ax_1, _, ax_text_1, _ = fig.axes
+
+    dropdown.value = "star"
+    points = utils.load_dataset("datasaurus").group_points["star"]
+    assert np.array_equal(ax_1.collections[0].get_offsets(), points)
+
+    button.click()
+    (text,) = ax_text_1.texts
+    mean_x = utils.load_dataset("datasaurus").statistics["star"]["mean_x"]
+    assert f"{mean_x:.2f}" in text.get_text()
+    plotting.plt.close("all")
+
+
+def test_clt_dashboard_updates_artists_in_place():
+    dashboard = plotting.CLTDashboard(bins=20)
+    artists = [list(ax.get_children()) for ax in dashboard.fig.axes]
+    rng = np.random.default_rng(0)
+
+    for population in [rng.exponential(size=5000), rng.binomial(10, 0.3, 5000)]:
+        means = utils.sample_means(population, 5, 2000, rng=rng)
+        dashboard.update(population, means, population.mean(), population.std() / 2)
+
+        density, edges = np.histogram(means, bins=20, density=True)
+        assert np.allclose(dashboard.means_hist.get_data().values, density)
+        assert np.allclose(dashboard.means_hist.get_data().edges, edges)
+
+        (osm, osr), _ = stats.probplot(means)
+        assert np.allclose(dashboard.qq_points.get_xdata(), osm)
+        assert np.allclose(dashboard.qq_points.get_ydata(), osr)
+
+    # Binomial populations get one bin per value
+    edges = dashboard.population_hist.get_data().edges
+    assert np.allclose(np.diff(edges), 1) and edges[0] % 1 == 0.5
+
+    assert [list(ax.get_children()) for ax in dashboard.fig.axes] == artists
+    plotting.plt.close("all")
+
+
+def test_clt_widgets_share_one_dashboard(monkeypatch):
+    plotting.plt.close("all")
+    captured = []
+    monkeypatch.setattr(
+        plotting, "interact_manual", lambda f, **widgets: captured.append(f)
+    )
+
+    plotting.binomial_clt()
+    (plot,) = captured
+    (fig,) = map(plotting.plt.figure, plotting.plt.get_fignums())
+
+    plot(n=10, p=0.5, sample_size=4)
+    plot(n=20, p=0.2, sample_size=9)
+    assert plotting.plt.get_fignums() == [fig.number]
+    plotting.plt.close("all")
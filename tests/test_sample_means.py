@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+import utils
+
+
+@pytest.mark.parametrize("bandwidth", [None, 0.5, 40.0])
+def test_binned_kde_peaks_at_single_spike(bandwidth):
+    counts = np.zeros(20)
+    counts[5] = 100
+    edges = np.arange(21.0)
+
+    centers, density = utils._binned_kde(counts, edges, bandwidth)
+
+    assert len(density) == len(counts)
+    assert np.argmax(density) == 5
+    assert centers[np.argmax(density)] == 5.5
+
+
+def test_streaming_moments_match_numpy_and_merge():
+    rng = np.random.default_rng(0)
+    values = rng.gamma(2.0, size=10_000)
+
+    moments = utils.StreamingMoments()
+    for batch in np.array_split(values, 7):
+        moments.update(batch)
+    merged = utils.StreamingMoments().update(values[:3000])
+    merged.merge(utils.StreamingMoments().update(values[3000:]))
+
+    for m in (moments, merged):
+        assert m.n == len(values)
+        assert m.mean == pytest.approx(values.mean())
+        assert m.var == pytest.approx(values.var())
+        centered = values - values.mean()
+        assert m.skewness == pytest.approx(np.mean(centered**3) / values.std() ** 3)
+        assert m.kurtosis == pytest.approx(np.mean(centered**4) / values.var() ** 2 - 3)
+
+
+def test_tdigest_quantiles():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=100_000)
+
+    digest = utils.TDigest()
+    for batch in np.array_split(values, 10):
+        digest.update(batch)
+
+    q = [0.001, 0.1, 0.5, 0.9, 0.999]
+    assert digest.total_weight == len(values)
+    ranks = np.searchsorted(np.sort(values), digest.quantile(q)) / len(values)
+    assert np.allclose(ranks, q, atol=0.001)
+    assert digest.quantile(0) == values.min()
+    assert digest.quantile(1) == values.max()
+
+
+def test_sample_means_streaming_matches_array():
+    population = np.random.default_rng(2).exponential(size=5000)
+
+    means = utils.sample_means(
+        population, 10, 20_000, rng=np.random.default_rng(3), max_chunk_elements=5000
+    )
+    summary = utils.sample_means(
+        population,
+        10,
+        20_000,
+        rng=np.random.default_rng(3),
+        streaming=True,
+        max_chunk_elements=5000,
+    )
+
+    assert means.shape == (20_000,)
+    assert summary.n == 20_000
+    assert summary.mean == pytest.approx(means.mean())
+    assert summary.std == pytest.approx(means.std())
+    assert summary.counts.sum() + summary.underflow + summary.overflow == 20_000
+    assert np.allclose(
+        summary.quantile([0.1, 0.9]), np.quantile(means, [0.1, 0.9]), atol=0.02
+    )
+
+
+def test_sample_means_from_population_sampler():
+    means = utils.sample_means(
+        lambda rng, size: rng.normal(5, 2, size),
+        25,
+        4000,
+        rng=np.random.default_rng(4),
+    )
+
+    assert means.shape == (4000,)
+    assert means.mean() == pytest.approx(5, abs=0.05)
+    assert means.std() == pytest.approx(2 / 5, rel=0.05)
+
+
+def test_resample_statistics_matches_manual_resamples():
+    data = np.random.default_rng(5).normal(size=300)
+    samples = data[utils._draw_indices(np.random.default_rng(6), len(data), (500, 8))]
+
+    results = utils.resample_statistics(
+        data,
+        8,
+        500,
+        rng=np.random.default_rng(6),
+        statistics=("mean", "var", "std", "median", "min", "max"),
+        quantiles=[0.25, 0.75],
+    )
+
+    assert np.allclose(results["mean"], samples.mean(axis=1))
+    assert np.allclose(results["var"], samples.var(axis=1))
+    assert np.allclose(results["std"], samples.std(axis=1))
+    assert np.allclose(results["median"], np.median(samples, axis=1))
+    assert np.array_equal(results["min"], samples.min(axis=1))
+    assert np.array_equal(results["max"], samples.max(axis=1))
+    assert results["quantiles"].shape == (500, 2)
+    assert np.allclose(
+        results["quantiles"], np.quantile(samples, [0.25, 0.75], axis=1).T
+    )
+
+
+def test_resample_statistics_in_chunks():
+    data = np.arange(10.0)
+    results = utils.resample_statistics(
+        data, 4, 1001, rng=np.random.default_rng(7), max_chunk_elements=10
+    )
+
+    assert results["mean"].shape == (1001,)
+    assert np.all((results["mean"] >= 0) & (results["mean"] <= 9))
+    assert results["mean"].mean() == pytest.approx(4.5, abs=0.15)
+
+
+def test_sample_means_uses_global_state_without_rng():
+    data = np.arange(100.0)
+
+    np.random.seed(0)
+    first = utils.sample_means(data, 5, 200)
+    np.random.seed(0)
+    assert np.array_equal(utils.sample_means(data, 5, 200), first)
+
+
+def test_resample_statistics_rejects_invalid_arguments():
+    with pytest.raises(ValueError):
+        utils.resample_statistics(np.arange(5), 2, statistics=("mode",))
+    with pytest.raises(ValueError):
+        utils.resample_statistics(np.arange(5), 0)
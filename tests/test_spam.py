@@ -0,0 +1,140 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+import utils
+
+
+def _texts(n):
+    rng = np.random.default_rng(0)
+    words = np.array([f"w{i}" for i in range(50)])
+    return [" ".join(rng.choice(words, size=rng.integers(1, 8))) for _ in range(n)]
+
+
+@pytest.fixture
+def counted_pools(monkeypatch):
+    pools = []
+
+    def make_pool(*args, **kwargs):
+        pools.append(kwargs)
+        return ProcessPoolExecutor(
+            *args, mp_context=multiprocessing.get_context("spawn"), **kwargs
+        )
+
+    monkeypatch.setattr(utils, "ProcessPoolExecutor", make_pool)
+    return pools
+
+
+def test_tokenizer_matches_document_term_matrix():
+    texts = _texts(60)
+    X, vocabulary = utils.document_term_matrix(texts)
+
+    tokenizer = utils.EmailTokenizer(chunk_size=7, max_workers=1)
+    corpus = tokenizer.transform(texts)
+
+    assert tokenizer.vocabulary == vocabulary
+    assert len(corpus) == len(texts)
+    assert (corpus.to_csr() != X).nnz == 0
+
+
+def test_tokenizer_reuses_one_pool_per_stream(counted_pools):
+    texts = _texts(100)
+    serial = utils.EmailTokenizer(chunk_size=10, max_workers=1)
+    expected = list(serial.iter_chunks(texts))
+
+    # 10 chunks in windows of 2 chunks: five batches of tasks, one pool
+    tokenizer = utils.EmailTokenizer(chunk_size=10, max_workers=2)
+    chunks = list(tokenizer.iter_chunks(texts))
+
+    assert len(counted_pools) == 1
+    assert tokenizer.vocabulary == serial.vocabulary
+    assert len(chunks) == len(expected) == 10
+    for chunk, other in zip(chunks, expected):
+        assert np.array_equal(chunk.token_ids, other.token_ids)
+        assert np.array_equal(chunk.offsets, other.offsets)
+
+
+def test_hashing_tokenizer_is_stable_across_workers(counted_pools):
+    texts = _texts(40)
+    serial = utils.EmailTokenizer(n_features=64, chunk_size=10, max_workers=1)
+    parallel = utils.EmailTokenizer(n_features=64, chunk_size=10, max_workers=2)
+
+    X = serial.transform(texts).to_csr()
+    assert X.shape == (40, 64)
+    assert (parallel.transform(texts).to_csr() != X).nnz == 0
+
+
+def _spam_corpus(n, seed=1):
+    rng = np.random.default_rng(seed)
+    spam_words = np.array([f"offer{i}" for i in range(20)] + ["free", "win"])
+    ham_words = np.array([f"meeting{i}" for i in range(20)] + ["free", "notes"])
+    labels = rng.integers(0, 2, n)
+    texts = [
+        " ".join(rng.choice(spam_words if y else ham_words, size=rng.integers(2, 9)))
+        for y in labels
+    ]
+    return texts, labels
+
+
+def test_spam_naive_bayes_matches_laplace_estimate():
+    texts, labels = _spam_corpus(300)
+    model = utils.SpamNaiveBayes(alpha=1.0, max_workers=1).fit(texts, labels)
+
+    vocabulary = model.vocabulary
+    counts = np.zeros((len(vocabulary), 2))
+    for text, y in zip(texts, labels):
+        for word in set(text.split()):
+            counts[vocabulary[word], 0 if y else 1] += 1
+    log_lik = np.log(counts + 1) - np.log((counts + 1).sum(axis=0))
+    log_ratio = log_lik[:, 0] - log_lik[:, 1]
+    log_prior = np.log(labels.sum()) - np.log(len(labels) - labels.sum())
+
+    test = ["free offer3 win unseen", "meeting4 notes free", "nothing known"]
+    expected = [
+        sum(log_ratio[vocabulary[w]] for w in set(t.split()) if w in vocabulary)
+        + log_prior
+        for t in test
+    ]
+
+    assert np.allclose(model.log_odds(test), expected)
+    assert np.array_equal(model.predict(test), np.array(expected) > 0)
+    assert np.mean(model.predict(texts) == labels) > 0.95
+
+
+def test_spam_naive_bayes_inputs_agree():
+    texts, labels = _spam_corpus(500, seed=2)
+    model = utils.SpamNaiveBayes(chunk_size=64, max_workers=1).fit(texts, labels)
+
+    X, vocabulary = utils.document_term_matrix(texts)
+    from_matrix = utils.SpamNaiveBayes(max_workers=1).fit(X, labels, vocabulary)
+    streamed = utils.SpamNaiveBayes(chunk_size=64, max_workers=1).fit_stream(
+        iter(texts), labels
+    )
+
+    assert model.vocabulary == vocabulary == streamed.vocabulary
+    for other in (from_matrix, streamed):
+        assert np.allclose(other.word_counts, model.word_counts)
+        assert np.allclose(other.predict_proba(texts), model.predict_proba(texts))
+
+
+def test_spam_naive_bayes_with_hashing():
+    texts, labels = _spam_corpus(400, seed=3)
+    model = utils.SpamNaiveBayes(n_features=2**12, max_workers=1).fit(texts, labels)
+
+    assert model.word_counts.shape == (2**12, 2)
+    assert np.mean(model.predict(texts) == labels) > 0.95
+
+
+def test_spam_naive_bayes_rejects_invalid_use():
+    with pytest.raises(ValueError):
+        utils.SpamNaiveBayes(alpha=0)
+    with pytest.raises(ValueError):
+        utils.SpamNaiveBayes().predict(["free offer"])
+
+    X, _ = utils.document_term_matrix(["free offer"])
+    with pytest.raises(ValueError):
+        utils.SpamNaiveBayes().fit(X, [1])
+    with pytest.raises(ValueError):
+        utils.SpamNaiveBayes(max_workers=1).fit(["a", "b"], [1])
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+import utils
+
+N_SAMPLES = {0: 1200, 1: 1350, 2: 900}
+
+
+@pytest.fixture(scope="module")
+def df():
+    return utils.generate_breed_data(N_SAMPLES, rng=np.random.default_rng(0))
+
+
+def _training_params_reference(df, features):
+    # compute_training_params as it was written, one slice of df per breed
+    estimators = {
+        "height": (utils.estimate_gaussian_params, ("mu", "sigma")),
+        "weight": (utils.estimate_gaussian_params, ("mu", "sigma")),
+        "bark_days": (utils.estimate_binomial_params, ("n", "p")),
+        "ear_head_ratio": (utils.estimate_uniform_params, ("a", "b")),
+    }
+    params_dict = {}
+    for breed in sorted(df["breed"].unique()):
+        df_breed = df[df["breed"] == breed][features]
+        params_dict[breed] = {
+            col: dict(zip(estimators[col][1], estimators[col][0](df_breed[col])))
+            for col in df_breed.columns
+        }
+    return params_dict
+
+
+def _assert_params_close(params, expected):
+    assert list(params) == list(expected)
+    for breed, features in expected.items():
+        assert list(params[breed]) == list(features)
+        for feature, values in features.items():
+            for name, value in values.items():
+                assert params[breed][feature][name] == pytest.approx(value)
+
+
+def test_compute_training_params_matches_per_breed_loop(df):
+    params = utils.compute_training_params(df, utils.FEATURES)
+    _assert_params_close(params, _training_params_reference(df, utils.FEATURES))
+
+
+def test_compute_training_params_subset_of_features(df):
+    features = ["weight", "bark_days"]
+    params = utils.compute_training_params(df, features)
+    _assert_params_close(params, _training_params_reference(df, features))
+
+
+def test_breed_stats_merge_matches_single_pass(df):
+    full = utils.BreedStats().update(df)
+
+    # Chunks sorted by breed, so most of them miss some of the classes
+    ordered = df.sort_values("breed", kind="stable")
+    chunks = [ordered.iloc[i : i + 500] for i in range(0, len(ordered), 500)]
+    merged = utils.BreedStats()
+    for chunk in chunks[:4]:
+        merged.update(chunk)
+    rest = utils.BreedStats()
+    for chunk in chunks[4:]:
+        rest.update(chunk)
+    merged.merge(rest)
+
+    assert np.array_equal(merged.classes, full.classes)
+    assert np.array_equal(merged.counts, [1200, 1350, 900])
+    _assert_params_close(merged.finalize(), full.finalize())
+
+
+def test_breed_stats_merge_rejects_other_features():
+    with pytest.raises(ValueError):
+        utils.BreedStats().merge(utils.BreedStats(["height"]))
+
+
+def _log_likelihoods_reference(df, params_dict):
+    log_lik = np.zeros((len(df), len(params_dict)))
+    for c, params in enumerate(params_dict.values()):
+        for feature in utils.FEATURES:
+            x = df[feature].to_numpy()
+            m = params[feature]
+            match feature:
+                case "height" | "weight":
+                    log_lik[:, c] += stats.norm.logpdf(x, m.mu, m.sigma)
+                case "bark_days":
+                    log_lik[:, c] += stats.binom.logpmf(x, m.n, m.p)
+                case "ear_head_ratio":
+                    low, high = min(m.a, m.b), max(m.a, m.b)
+                    log_lik[:, c] += stats.uniform.logpdf(x, low, high - low)
+    return log_lik
+
+
+def test_predict_breed_batch_matches_scipy(df):
+    probs = {0: 0.2, 1: 0.5, 2: 0.3}
+    predictions, posteriors = utils.predict_breed_batch(df, utils.breed_params, probs)
+
+    log_joint = _log_likelihoods_reference(df, utils.breed_params) + np.log(
+        list(probs.values())
+    )
+    expected = np.exp(log_joint - log_joint.max(axis=1, keepdims=True))
+    expected /= expected.sum(axis=1, keepdims=True)
+
+    assert np.array_equal(predictions, np.argmax(log_joint, axis=1))
+    assert np.allclose(posteriors, expected)
+    assert np.mean(predictions == df["breed"].to_numpy()) > 0.95
+
+
+def test_predict_breed_batch_with_param_table(df):
+    params = utils.compute_training_params(df, utils.FEATURES)
+    table = utils.ParamTable.from_params_dict(params)
+
+    from_dict = utils.predict_breed_batch(df, params)
+    from_table = utils.predict_breed_batch(df, table)
+
+    assert np.array_equal(from_dict[0], from_table[0])
+    assert np.allclose(from_dict[1], from_table[1])
+
+
+def test_predict_breed_batch_impossible_sample():
+    X = [[35.0, 20.0, 24.0, 5.0]]
+    predictions, posteriors = utils.predict_breed_batch(X, utils.breed_params)
+
+    assert predictions[0] == 0
+    assert np.isnan(posteriors).all()
+
+
+def test_log_likelihoods_rejects_non_integer_bark_days():
+    X = np.array([[35.0, 20.0, b, 0.3] for b in (24.0, 24.5, -0.5)])
+    _, log_lik = utils.log_likelihoods(X, utils.breed_params)
+
+    assert np.isfinite(log_lik[0]).any()
+    assert np.all(log_lik[1:] == -np.inf)
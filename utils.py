@@ -1,883 +1,1033 @@
 import numpy as np
-from datetime import timedelta, date
-import matplotlib.pyplot as plt
-import seaborn as sns
-import ipywidgets as widgets
-from ipywidgets import interact_manual
-from dataclasses import dataclass
 import pandas as pd
+from dataclasses import dataclass, asdict
+import importlib
+import itertools
 import os
-from IPython.display import display
-import matplotlib.gridspec as gridspec
-from ipywidgets import interact, HBox, VBox
-from scipy import stats
-from scipy.stats import norm
+import json
+import shutil
+import sys
+import tempfile
+import zlib
+from functools import lru_cache, cached_property
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from types import MappingProxyType
+from scipy import sparse
+from scipy.special import expit, gammaln, ndtr, ndtri, xlog1py, xlogy
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+# Used when CACHE_DIR is not writable, e.g. for a read-only install
+USER_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "prob_stat_for_ml",
+)
+
+
+def _draw_indices(rng, high, size, dtype=np.int64):
+    # rng=None keeps the legacy global state so np.random.seed still applies
+    if rng is None:
+        return np.random.randint(0, high, size=size, dtype=dtype)
+    return rng.integers(0, high, size=size, dtype=dtype)
+
+
+def resample_statistics(
+    data,
+    sample_size,
+    n_resamples=10_000,
+    rng=None,
+    statistics=("mean",),
+    quantiles=None,
+    max_chunk_elements=2**22,
+):
+    """
+    Draws n_resamples samples (with replacement) of size sample_size from data and
+    summarizes every sample in a single vectorized pass.
 
+    The resamples are drawn as an (n_resamples, sample_size) index matrix that is
+    processed in chunks of at most max_chunk_elements entries, so memory stays bounded
+    for large sample sizes.
 
-def sample_means(data, sample_size):
-    means = []
+    Args:
+        data (array-like): The population to resample from.
+        sample_size (int): Number of elements in every resample.
+        n_resamples (int): Number of resamples to draw.
+        rng (numpy.random.Generator): Source of randomness. If None the global numpy state is used.
+        statistics (iterable[str]): Any of "mean", "var", "std", "median", "min" and "max".
+        quantiles (array-like): Optional quantile levels computed for every resample.
+        max_chunk_elements (int): Upper bound on the size of each index chunk.
 
-    for _ in range(10_000):
-        sample = np.random.choice(data, size=sample_size)
-        means.append(np.mean(sample))
+    Returns:
+        dict: Maps each requested statistic to an array of shape (n_resamples,).
+            If quantiles are requested they are stored under "quantiles" with shape
+            (n_resamples, len(quantiles)).
+    """
 
-    return np.array(means)
+    data = np.asarray(data)
+    statistics = tuple(statistics)
+
+    unknown = set(statistics) - {"mean", "var", "std", "median", "min", "max"}
+    if unknown:
+        raise ValueError(f"Unknown statistics: {sorted(unknown)}")
+    if sample_size < 1:
+        raise ValueError("sample_size must be a positive integer")
+
+    results = {name: np.empty(n_resamples) for name in statistics}
+    if quantiles is not None:
+        quantiles = np.atleast_1d(np.asarray(quantiles, dtype=float))
+        results["quantiles"] = np.empty((n_resamples, len(quantiles)))
+
+    chunk_rows = max(1, max_chunk_elements // sample_size)
+
+    for start in range(0, n_resamples, chunk_rows):
+        stop = min(start + chunk_rows, n_resamples)
+        samples = data[_draw_indices(rng, len(data), (stop - start, sample_size))]
+
+        for name in statistics:
+            match name:
+                case "mean":
+                    results[name][start:stop] = samples.mean(axis=1)
+                case "var":
+                    results[name][start:stop] = samples.var(axis=1)
+                case "std":
+                    results[name][start:stop] = samples.std(axis=1)
+                case "median":
+                    results[name][start:stop] = np.median(samples, axis=1)
+                case "min":
+                    results[name][start:stop] = samples.min(axis=1)
+                case "max":
+                    results[name][start:stop] = samples.max(axis=1)
+
+        if quantiles is not None:
+            results["quantiles"][start:stop] = np.quantile(samples, quantiles, axis=1).T
+
+    return results
+
+
+def sample_means(
+    data,
+    sample_size,
+    n_resamples=10_000,
+    rng=None,
+    streaming=False,
+    max_chunk_elements=2**22,
+):
+    """
+    Computes the means of n_resamples samples of size sample_size drawn from data.
 
+    Args:
+        data (array-like or callable): The population. A callable is treated as a sampler
+            population(rng, size) that draws from the population distribution, so the
+            population never has to be materialized.
+        sample_size (int): Number of elements in every sample.
+        n_resamples (int): Number of samples to draw.
+        rng (numpy.random.Generator): Source of randomness. If None the global numpy state is used.
+        streaming (bool): If True the means are consumed batch by batch and a
+            StreamingSampleMeans summary is returned instead of the raw array.
+        max_chunk_elements (int): Upper bound on the number of values drawn at once.
 
-def gaussian_clt():
-    def _plot(mu, sigma, sample_size):
-        #         mu = 10
-        #         sigma = 5
+    Returns:
+        ndarray or StreamingSampleMeans: The sample means, or their streaming summary.
+    """
 
-        gaussian_population = np.random.normal(mu, sigma, 100_000)
-        gaussiam_sample_means = sample_means(gaussian_population, sample_size)
-        x_range = np.linspace(
-            min(gaussiam_sample_means), max(gaussiam_sample_means), 100
-        )
+    if not streaming:
+        if callable(data):
+            return np.concatenate(
+                list(
+                    iter_resample_means(
+                        data, sample_size, n_resamples, rng, max_chunk_elements
+                    )
+                )
+            )
+        return resample_statistics(
+            data,
+            sample_size,
+            n_resamples=n_resamples,
+            rng=rng,
+            max_chunk_elements=max_chunk_elements,
+        )["mean"]
+
+    summary = StreamingSampleMeans()
+    for batch in iter_resample_means(
+        data, sample_size, n_resamples, rng, max_chunk_elements
+    ):
+        summary.update(batch)
+
+    return summary
+
+
+def iter_resample_means(
+    data, sample_size, n_resamples=10_000, rng=None, max_chunk_elements=2**22
+):
+    """
+    Yields the sample means in batches so that at most max_chunk_elements values are
+    held in memory at any time.
+    """
 
-        sample_means_mean = np.mean(gaussiam_sample_means)
-        sample_means_std = np.std(gaussiam_sample_means)
-        clt_std = sigma / np.sqrt(sample_size)
+    chunk_rows = max(1, max_chunk_elements // sample_size)
 
-        estimated_pop_sigma = sample_means_std * np.sqrt(sample_size)
+    for start in range(0, n_resamples, chunk_rows):
+        rows = min(chunk_rows, n_resamples - start)
 
-        std_err = abs(clt_std - sample_means_std) / clt_std
+        if callable(data):
+            samples = data(np.random if rng is None else rng, (rows, sample_size))
+        else:
+            data = np.asarray(data)
+            samples = data[_draw_indices(rng, len(data), (rows, sample_size))]
 
-        clt_holds = True if std_err < 0.1 else False
+        yield samples.mean(axis=1)
 
-        #         print(f"Mean of sample means: {sample_means_mean:.2f}\n")
-        #         print(f"Std of sample means: {sample_means_std:.2f}\n")
-        #         print(f"Theoretical sigma: {clt_std:.2f}\n")
-        #         print(f"Estimated population sigma: {estimated_pop_sigma:.2f}\n")
 
-        #         print(f"Error: {std_err:.2f}\n")
-        #         print(f"CLT holds?: {clt_holds}\n")
+class StreamingMoments:
+    """
+    Running count, mean and central moments (up to the fourth) of a stream of values.
 
-        mu2 = mu
-        sigma2 = sigma / np.sqrt(sample_size)
-        #         fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(10, 6))
-        fig, axes = plt.subplot_mosaic(
-            [["top row", "top row"], ["bottom left", "bottom right"]], figsize=(10, 5)
-        )
+    Batches are combined with the pairwise update formulas of Chan et al. and Pébay,
+    so two accumulators can also be merged exactly.
+    """
 
-        ax1 = axes["top row"]
-        ax2 = axes["bottom left"]
-        ax3 = axes["bottom right"]
-        sns.histplot(gaussian_population, stat="density", ax=ax1)
-        ax1.set_title("Population Distribution")
-        ax2.set_title("Sample Means Distribution")
-        ax3.set_title("QQ Plot of Sample Means")
-
-        sns.histplot(gaussiam_sample_means, stat="density", ax=ax2, label="hist")
-        sns.kdeplot(
-            data=gaussiam_sample_means,
-            color="crimson",
-            ax=ax2,
-            label="kde",
-            linestyle="dashed",
-            fill=True,
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return self
+
+        other = StreamingMoments()
+        other.n = len(values)
+        other.mean = values.mean()
+        centered = values - other.mean
+        centered_2 = centered**2
+        other.m2 = centered_2.sum()
+        other.m3 = (centered_2 * centered).sum()
+        other.m4 = (centered_2**2).sum()
+
+        return self.merge(other)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean = other.n, other.mean
+            self.m2, self.m3, self.m4 = other.m2, other.m3, other.m4
+            return self
+
+        n_a, n_b = self.n, other.n
+        n = n_a + n_b
+        delta = other.mean - self.mean
+
+        m4 = (
+            self.m4
+            + other.m4
+            + delta**4 * n_a * n_b * (n_a**2 - n_a * n_b + n_b**2) / n**3
+            + 6 * delta**2 * (n_a**2 * other.m2 + n_b**2 * self.m2) / n**2
+            + 4 * delta * (n_a * other.m3 - n_b * self.m3) / n
         )
-        ax2.plot(
-            x_range,
-            norm.pdf(x_range, loc=mu2, scale=sigma2),
-            color="black",
-            label="gaussian",
-            linestyle="solid",
+        m3 = (
+            self.m3
+            + other.m3
+            + delta**3 * n_a * n_b * (n_a - n_b) / n**2
+            + 3 * delta * (n_a * other.m2 - n_b * self.m2) / n
         )
-        ax2.legend()
-
-        stats.probplot(gaussiam_sample_means, plot=ax3, fit=True)
-        plt.tight_layout()
-        plt.show()
-
-    mu_selection = widgets.FloatSlider(
-        value=10.0,
-        min=0.01,
-        max=50.0,
-        step=1.0,
-        description="mu",
-        disabled=False,
-        continuous_update=False,
-        orientation="horizontal",
-        readout=True,
-        readout_format=".1f",
-    )
+        m2 = self.m2 + other.m2 + delta**2 * n_a * n_b / n
 
-    sigma_selection = widgets.FloatSlider(
-        value=5.0,
-        min=0.01,
-        max=20.0,
-        step=0.1,
-        description="sigma",
-        disabled=False,
-        continuous_update=False,
-        orientation="horizontal",
-        readout=True,
-        readout_format=".1f",
-    )
+        self.n = n
+        self.mean = self.mean + delta * n_b / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
 
-    sample_size_selection = widgets.IntSlider(
-        value=2,
-        min=2,
-        max=100,
-        step=1,
-        description="sample_size",
-        disabled=False,
-        continuous_update=False,
-        orientation="horizontal",
-        readout=True,
-        readout_format="d",
-    )
+        return self
 
-    interact_manual(
-        _plot, sample_size=sample_size_selection, mu=mu_selection, sigma=sigma_selection
-    )
+    @property
+    def var(self):
+        return self.m2 / self.n if self.n else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
 
+    @property
+    def skewness(self):
+        return np.sqrt(self.n) * self.m3 / self.m2**1.5 if self.m2 > 0 else np.nan
 
-def binomial_clt():
-    def _plot(n, p, sample_size):
-        mu = n * p
-        sigma = np.sqrt(n * p * (1 - p)) / np.sqrt(sample_size)
-        N = n * sample_size
-        #         sigma = np.sqrt(n * p * (1 - p)) / np.sqrt(N)
+    @property
+    def kurtosis(self):
+        # Excess kurtosis, 0 for a Gaussian
+        return self.n * self.m4 / self.m2**2 - 3 if self.m2 > 0 else np.nan
 
-        binomial_population = np.random.binomial(n, p, 100_000)
 
-        binomial_sample_means = sample_means(binomial_population, sample_size)
+class TDigest:
+    """
+    Merging t-digest quantile sketch.
+
+    Values are kept as weighted centroids that are recompressed after every batch with
+    the arcsine scale function, so the number of centroids is bounded by the compression
+    while the tails keep (close to) single-value resolution.
+    """
 
-        x_range = np.linspace(
-            min(binomial_sample_means), max(binomial_sample_means), 100
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def total_weight(self):
+        return self.weights.sum()
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return self
+
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(
+            np.concatenate([self.means, values]),
+            np.concatenate([self.weights, np.ones(len(values))]),
         )
 
-        condition_val = np.min([N * p, N * (1 - p)])
+        return self
 
-        condition = True if condition_val >= 5 else False
+    def merge(self, other):
+        if len(other.means) == 0:
+            return self
 
-        sample_means_mean = np.mean(binomial_sample_means)
-        sample_means_std = np.std(binomial_sample_means)
-        clt_std = np.std(binomial_population) / np.sqrt(sample_size)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+        )
 
-        estimated_pop_sigma = sample_means_std * np.sqrt(sample_size)
+        return self
 
-        std_err = abs(clt_std - sample_means_std) / clt_std
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
 
-        clt_holds = True if std_err < 0.1 else False
+        cum_weights = np.cumsum(weights)
+        q = (cum_weights - weights / 2) / cum_weights[-1]
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        cluster = np.floor(k).astype(np.int64)
 
-        #         print(f"Value of N: {N}\n")
-        print(f"Condition value: {condition_val:.1f}")
+        starts = np.flatnonzero(np.r_[True, np.diff(cluster) != 0])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
 
-        #         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        fig, axes = plt.subplot_mosaic(
-            [["top row", "top row"], ["bottom left", "bottom right"]], figsize=(10, 5)
-        )
+    def quantile(self, q):
+        q = np.asarray(q, dtype=float)
+        if len(self.means) == 0:
+            return np.full(q.shape, np.nan)
 
-        ax1 = axes["top row"]
-        ax2 = axes["bottom left"]
-        ax3 = axes["bottom right"]
-        ax1.set_title("Population Distribution")
-        ax2.set_title("Sample Means Distribution")
-        ax3.set_title("QQ Plot of Sample Means")
-        sns.histplot(binomial_population, stat="density", ax=ax1)
-
-        sns.histplot(binomial_sample_means, stat="density", ax=ax2, label="hist")
-        sns.kdeplot(
-            data=binomial_sample_means,
-            color="crimson",
-            ax=ax2,
-            label="kde",
-            linestyle="dashed",
-            fill=True,
-        )
-        ax2.plot(
-            x_range,
-            norm.pdf(x_range, loc=mu, scale=sigma),
-            color="black",
-            label="gaussian",
-            linestyle="solid",
-        )
-        ax2.legend()
-        stats.probplot(binomial_sample_means, plot=ax3, fit=True)
-        plt.tight_layout()
-        plt.show()
-
-    #         print(f"Condition holds?: {condition} with value of {condition_val:.2f}\n")
-
-    #         print(f"Mean of sample means: {sample_means_mean:.2f}\n")
-    #         print(f"Std of sample means: {sample_means_std:.2f}\n")
-    #         print(f"Theoretical sigma: {clt_std:.2f}\n")
-    #         print(f"Estimated population sigma: {estimated_pop_sigma:.2f}\n")
-
-    sample_size_selection = widgets.IntSlider(
-        value=2,
-        min=2,
-        max=50,
-        step=1,
-        description="sample_size",
-        disabled=False,
-        continuous_update=False,
-        orientation="horizontal",
-        readout=True,
-        readout_format="d",
-    )
+        cum_weights = np.cumsum(self.weights)
+        centers = cum_weights - self.weights / 2
+        positions = np.r_[0.0, centers, cum_weights[-1]]
+        values = np.r_[self.min, self.means, self.max]
 
-    n_selection = widgets.IntSlider(
-        value=2,
-        min=2,
-        max=50,
-        step=1,
-        description="n",
-        disabled=False,
-        continuous_update=False,
-        orientation="horizontal",
-        readout=True,
-        readout_format="d",
-    )
+        return np.interp(q * cum_weights[-1], positions, values)
 
-    prob_success_selection = widgets.FloatSlider(
-        value=0.5,
-        min=0.01,
-        max=0.99,
-        step=0.1,
-        description="p",
-        disabled=False,
-        continuous_update=False,
-        orientation="horizontal",
-        readout=True,
-        readout_format=".1f",
-    )
 
-    interact_manual(
-        _plot,
-        sample_size=sample_size_selection,
-        p=prob_success_selection,
-        n=n_selection,
-    )
+class StreamingSampleMeans:
+    """
+    Constant-memory summary of a stream of sample means: running moments, a fixed-bin
+    histogram and a t-digest quantile sketch.
 
+    The histogram range is fixed from the first batch (widened by its own spread on
+    both sides) unless explicit bin edges are given. Values that fall outside of it are
+    only counted in underflow and overflow.
+    """
 
-def poisson_clt():
-    def _plot(mu, sample_size):
-        sigma = np.sqrt(mu) / np.sqrt(sample_size)
+    def __init__(self, bins=64, bin_edges=None, compression=200):
+        self.moments = StreamingMoments()
+        self.digest = TDigest(compression)
+        self.n_bins = bins
+        self.bin_edges = None if bin_edges is None else np.asarray(bin_edges)
+        self.counts = (
+            None if bin_edges is None else np.zeros(len(self.bin_edges) - 1, np.int64)
+        )
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, batch):
+        batch = np.asarray(batch, dtype=float).ravel()
+        if len(batch) == 0:
+            return self
+
+        if self.bin_edges is None:
+            low, high = batch.min(), batch.max()
+            spread = high - low if high > low else max(abs(low), 1.0)
+            self.bin_edges = np.linspace(
+                low - spread / 2, high + spread / 2, self.n_bins + 1
+            )
+            self.counts = np.zeros(self.n_bins, np.int64)
 
-        poisson_population = np.random.poisson(mu, 100_000)
+        self.moments.update(batch)
+        self.digest.update(batch)
 
-        poisson_sample_means = sample_means(poisson_population, sample_size)
+        self.counts += np.histogram(batch, bins=self.bin_edges)[0]
+        self.underflow += np.count_nonzero(batch < self.bin_edges[0])
+        self.overflow += np.count_nonzero(batch > self.bin_edges[-1])
 
-        x_range = np.linspace(min(poisson_sample_means), max(poisson_sample_means), 100)
+        return self
 
-        fig, axes = plt.subplot_mosaic(
-            [["top row", "top row"], ["bottom left", "bottom right"]], figsize=(10, 5)
-        )
+    @property
+    def n(self):
+        return self.moments.n
 
-        ax1 = axes["top row"]
-        ax2 = axes["bottom left"]
-        ax3 = axes["bottom right"]
-        ax1.set_title("Population Distribution")
-        ax2.set_title("Sample Means Distribution")
-        ax3.set_title("QQ Plot of Sample Means")
-        sns.histplot(poisson_population, stat="density", ax=ax1)
-
-        sns.histplot(poisson_sample_means, stat="density", ax=ax2, label="hist")
-        sns.kdeplot(
-            data=poisson_sample_means,
-            color="crimson",
-            ax=ax2,
-            label="kde",
-            linestyle="dashed",
-            fill=True,
-        )
-        ax2.plot(
-            x_range,
-            norm.pdf(x_range, loc=mu, scale=sigma),
-            color="black",
-            label="gaussian",
-            linestyle="solid",
-        )
-        ax2.legend()
-        stats.probplot(poisson_sample_means, plot=ax3, fit=True)
-        plt.tight_layout()
-        plt.show()
-
-    sample_size_selection = widgets.IntSlider(
-        value=2,
-        min=2,
-        max=50,
-        step=1,
-        description="sample_size",
-        disabled=False,
-        continuous_update=False,
-        orientation="horizontal",
-        readout=True,
-        readout_format="d",
-    )
+    @property
+    def mean(self):
+        return self.moments.mean
 
-    mu_selection = widgets.FloatSlider(
-        value=1.5,
-        min=0.01,
-        max=5.0,
-        #         step=1.0,
-        description="mu",
-        disabled=False,
-        continuous_update=False,
-        orientation="horizontal",
-        readout=True,
-        readout_format=".1f",
-    )
+    @property
+    def std(self):
+        return self.moments.std
 
-    interact_manual(_plot, sample_size=sample_size_selection, mu=mu_selection)
+    def density(self):
+        widths = np.diff(self.bin_edges)
+        return self.counts / (self.n * widths)
 
+    def quantile(self, q):
+        return self.digest.quantile(q)
 
-def plot_kde_and_qq(sample_means_data, mu_sample_means, sigma_sample_means):
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
 
-    # Define the x-range for the Gaussian curve (this is just for plotting purposes)
-    x_range = np.linspace(min(sample_means_data), max(sample_means_data), 100)
+def _binned_kde(counts, edges, bandwidth=None):
+    # Gaussian KDE evaluated on the bin centers by smoothing the histogram
+    counts = np.asarray(counts, dtype=float)
+    centers = (edges[:-1] + edges[1:]) / 2
+    width = edges[1] - edges[0]
+    total = counts.sum()
 
-    # Histogram of sample means (blue)
-    sns.histplot(sample_means_data, stat="density", label="hist", ax=ax1)
+    if bandwidth is None:
+        mean = np.sum(counts * centers) / total
+        std = np.sqrt(np.sum(counts * (centers - mean) ** 2) / total)
+        bandwidth = 1.06 * std * total ** (-1 / 5)
 
-    # Estimated PDF of sample means (red)
-    sns.kdeplot(
-        data=sample_means_data,
-        color="crimson",
-        label="kde",
-        linestyle="dashed",
-        fill=True,
-        ax=ax1,
-    )
+    bandwidth = max(bandwidth, width / 2)
+    half_width = int(np.ceil(4 * bandwidth / width))
+    offsets = np.arange(-half_width, half_width + 1) * width
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum()
 
-    # Gaussian curve with estimated mu and sigma (black)
-    ax1.plot(
-        x_range,
-        norm.pdf(x_range, loc=mu_sample_means, scale=sigma_sample_means),
-        color="black",
-        label="gaussian",
-    )
+    # "full" then cropping stays centred on the counts even when the kernel is longer
+    smoothed = np.convolve(counts, kernel, mode="full")[
+        half_width : half_width + len(counts)
+    ]
 
-    res = stats.probplot(sample_means_data, plot=ax2, fit=True)
+    return centers, smoothed / (total * width)
 
-    ax1.legend()
-    plt.show()
 
+def _histogram_edges(data, bins):
+    # Integer data (binomial, poisson) gets one bin per value
+    if np.issubdtype(data.dtype, np.integer):
+        return np.arange(data.min() - 0.5, data.max() + 1.5)
+    return np.histogram_bin_edges(data, bins=bins)
 
-class your_bday:
-    def __init__(self) -> None:
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
 
-        self.fig = fig
-        self.ax = ax1
-        self.ax_hist = ax2
-        self.dates = [
-            (date(2015, 1, 1) + timedelta(days=n)).strftime("%m-%d") for n in range(365)
-        ]
-        self.match = False
-        self.bday_str = None
-        self.bday_index = None
-        self.n_students = 0
-        self.history = []
-        self.bday_picker = widgets.DatePicker(
-            description="Pick your bday",
-            disabled=False,
-            style={"description_width": "initial"},
-        )
-        self.start_button = widgets.Button(description="Simulate!")
+def students_until_match(n_runs, rng=None):
+    """
+    Number of students that have to be generated until one of them has a given bday,
+    for n_runs independent runs. Every student matches with probability 1/365, so this
+    is a geometric draw.
+    """
 
-        display(self.bday_picker)
-        display(self.start_button)
+    return (np.random if rng is None else rng).geometric(1 / 365, n_runs)
 
-        self.start_button.on_click(self.on_button_clicked)
 
-    def on_button_clicked(self, b):
-        self.match = False
-        self.n_students = 0
+def first_shared_bday(n_runs, rng=None):
+    """
+    Simulates n_runs classrooms that grow one student at a time until two students
+    share a bday.
 
-        self.get_bday()
-        self.add_students()
+    By the pigeonhole principle 366 students always contain a match, so every run is a
+    row of 366 bdays. Sorting a row (stably) puts repeated bdays next to each other, and
+    the first match happens at the smallest position of a repeated (non-first) occurrence.
 
-    def get_bday(self):
-        try:
-            self.bday_str = self.bday_picker.value.strftime("%m-%d")
-        except AttributeError:
-            self.ax.set_title(f"Input a valid date and try again!")
-            return
-        self.bday_index = self.dates.index(self.bday_str)
-
-    def generate_bday(self):
-        # gen_bdays = np.random.randint(0, 365, (n_people))
-        gen_bday = np.random.randint(0, 365)
-        # if not np.isnan(self.y[gen_bday]):
-        if gen_bday == self.bday_index:
-            self.match = True
-
-    def add_students(self):
-        if not self.bday_str:
-            return
-
-        while True:
-            if self.match:
-                self.history.append(self.n_students)
-                #                 print(f"Match found. It took {self.n_students} students to get a match")
-                n_runs = [i for i in range(len(self.history))]
-                self.ax.scatter(n_runs, self.history)
-                # counts, bins = np.histogram(self.history)
-                # plt.stairs(counts, bins)
-                # self.ax_hist.hist(bins[:-1], bins, weights=counts)
-                self.ax_hist.clear()
-                sns.histplot(data=self.history, ax=self.ax_hist, bins=16)
-                # plt.show()
-                break
-
-            self.generate_bday()
-            self.n_students += 1
-            self.ax.set_title(
-                f"Match found. It took {self.n_students} students.\nNumber of runs: {len(self.history)+1}"
-            )
-            # self.fig.canvas.draw()
-            # self.fig.canvas.flush_events()
+    Returns:
+        tuple: (n_students, shared_bday, bdays) where n_students[i] is the number of
+            students of run i when the match was found, shared_bday[i] the matching day
+            and bdays the (n_runs, 366) generated bdays.
+    """
+
+    bdays = _draw_indices(rng, 365, (n_runs, 366), np.int16)
+    order = np.argsort(bdays, axis=1, kind="stable")
+    sorted_bdays = np.take_along_axis(bdays, order, axis=1)
+
+    repeated = sorted_bdays[:, 1:] == sorted_bdays[:, :-1]
+    first_match = np.where(repeated, order[:, 1:], 366).min(axis=1)
+    shared_bday = bdays[np.arange(n_runs), first_match]
+
+    return first_match + 1, shared_bday, bdays
 
 
 big_classroom_sizes = [*range(1, 1000, 5)]
 small_classroom_sizes = [*range(1, 80)]
 
 
-def plot_simulated_probs(sim_probs, class_size):
-    fig, ax = plt.subplots(1, 1, figsize=(10, 4))
-    #     ax.scatter(class_size, sim_probs)
-    sns.scatterplot(x=class_size, y=sim_probs, ax=ax, label="simulated probabilities")
-    ax.set_ylabel("Simulated Probability")
-    ax.set_xlabel("Classroom Size")
-    ax.set_title("Probability vs Number of Students")
-    ax.plot([0, max(class_size)], [0.5, 0.5], color="red", label="p = 0.5")
-    ax.grid(which="minor", color="#EEEEEE", linewidth=0.8)
-    ax.minorticks_on()
-    ax.legend()
-    plt.show()
-
-
-class third_bday_problem:
-    def __init__(self) -> None:
-        fig, axes = plt.subplot_mosaic(
-            [["top row", "top row"], ["bottom left", "bottom right"]], figsize=(10, 8)
-        )
-        self.fig = fig
-        self.ax = axes["top row"]
-        self.count_ax = axes["bottom left"]
-        self.ax_hist = axes["bottom right"]
-        self.ax.spines["top"].set_color("none")
-        self.ax.spines["right"].set_color("none")
-        self.ax.spines["left"].set_color("none")
-        self.ax.get_yaxis().set_visible(False)
-        x = np.arange(365)
-        y = np.zeros((365,))
-        y[y == 0] = np.nan
-
-        y_match = np.zeros((365,))
-        y_match[y_match == 0] = np.nan
-
-        self.x = x
-        self.y = y
-        self.y_match = y_match
-        self.match = False
-        self.n_students = 0
-
-        self.dates = [
-            (date(2015, 1, 1) + timedelta(days=n)).strftime("%m-%d") for n in range(365)
-        ]
-        self.month_names = [
-            "January",
-            "February",
-            "March",
-            "April",
-            "May",
-            "June",
-            "July",
-            "August",
-            "September",
-            "October",
-            "November",
-            "December",
-        ]
+def problem_1_batch(bdays, predef_bdays):
+    # Does any student share the predefined bday of their trial?
+    return (bdays == np.asarray(predef_bdays)[:, None]).any(axis=1)
+
+
+def problem_2_batch(bdays, rnd_index):
+    # Does another student share the bday of the randomly picked student?
+    rows = np.arange(len(bdays))
+    rnd_bdays = bdays[rows, rnd_index]
+    return np.count_nonzero(bdays == rnd_bdays[:, None], axis=1) > 1
+
+
+def problem_3_batch(bdays):
+    # Do any two students share a bday? Sort every trial and look for equal neighbours
+    sorted_bdays = np.sort(bdays, axis=1)
+    return (sorted_bdays[:, 1:] == sorted_bdays[:, :-1]).any(axis=1)
+
+
+def problem_4_batch(bdays_1, bdays_2):
+    # Does any student of classroom 1 share a bday with a student of classroom 2?
+    rows = np.arange(len(bdays_1))[:, None]
+    occupied = np.zeros((len(bdays_1), 365), dtype=bool)
+    occupied[rows, bdays_1] = True
+    return occupied[rows, bdays_2].any(axis=1)
+
+
+# Batch kernel of every birthday problem and its inputs for n_trials classrooms of
+# n_students each
+_BATCH_PROBLEMS = {
+    1: (
+        problem_1_batch,
+        lambda rng, t, n: (
+            _draw_indices(rng, 365, (t, n), np.int16),
+            _draw_indices(rng, 365, t, np.int16),
+        ),
+    ),
+    2: (
+        problem_2_batch,
+        lambda rng, t, n: (
+            _draw_indices(rng, 365, (t, n), np.int16),
+            _draw_indices(rng, n, t),
+        ),
+    ),
+    3: (
+        problem_3_batch,
+        lambda rng, t, n: (_draw_indices(rng, 365, (t, n), np.int16),),
+    ),
+    4: (
+        problem_4_batch,
+        lambda rng, t, n: (
+            _draw_indices(rng, 365, (t, n), np.int16),
+            _draw_indices(rng, 365, (t, n), np.int16),
+        ),
+    ),
+}
 
-        self.history = []
-        self.match_index = None
-        self.match_str = None
 
-        self.cpoint = self.fig.canvas.mpl_connect(
-            "button_press_event", self.on_button_clicked
-        )
+def _batch_problem(problem_func):
+    # Number of the birthday problem if problem_func is one of the bundled batch kernels.
+    # Matched by identity: a user's own problem_1 is never swapped for the kernel.
+    for problem, (kernel, _) in _BATCH_PROBLEMS.items():
+        if problem_func is kernel:
+            return problem
+    return None
 
-        # self.start_button = widgets.Button(description="Simulate!")
 
-        # display(self.start_button)
+def count_matches(
+    problem_func, n_students, n_trials, rng=None, max_chunk_elements=2**22
+):
+    """
+    Counts in how many of n_trials simulated classrooms problem_func finds a match.
 
-        # self.start_button.on_click(self.on_button_clicked)
+    The bundled kernels problem_1_batch to problem_4_batch run vectorized over a trials
+    axis, in chunks of at most max_chunk_elements birthdays. Any other function (such as
+    the notebook's problem_1) is called once per trial with the number of students.
+    """
 
-    def generate_bday(self):
-        gen_bday = np.random.randint(0, 365)
+    problem = _batch_problem(problem_func)
 
-        if not np.isnan(self.y[gen_bday]):
-            self.match_index = gen_bday
-            self.match_str = self.dates[gen_bday]
-            self.y_match[gen_bday] = 1
-            self.match = True
+    if problem is None:
+        return sum(bool(problem_func(n_students)) for _ in range(n_trials))
 
-        self.y[gen_bday] = 0.5
+    kernel, draw_inputs = _BATCH_PROBLEMS[problem]
+    chunk_trials = max(1, max_chunk_elements // max(n_students, 1))
+    matches = 0
 
-    def on_button_clicked(self, event):
-        if event.inaxes in [self.ax]:
-            self.new_run()
-            self.add_students()
+    for start in range(0, n_trials, chunk_trials):
+        trials = min(chunk_trials, n_trials - start)
+        matches += np.count_nonzero(kernel(*draw_inputs(rng, trials, n_students)))
 
-    def add_students(self):
-        while True:
-            if self.match:
-                self.history.append(self.n_students)
-                n_runs = [i for i in range(len(self.history))]
-                self.count_ax.scatter(n_runs, self.history)
-                self.count_ax.set_ylabel("# of students")
-                self.count_ax.set_xlabel("# of simulations")
+    return int(matches)
 
-                month_str = self.month_names[int(self.match_str.split("-")[0]) - 1]
-                day_value = self.match_str.split("-")[1]
-                self.ax.set_title(
-                    f"Match found for {month_str} {day_value}\nIt took {self.n_students} students to get a match"
-                )
-                self.ax_hist.clear()
-                sns.histplot(data=self.history, ax=self.ax_hist, bins="auto")
-                break
 
-            self.generate_bday()
-            self.n_students += 1
-            self.ax.set_title(f"Number of students: {self.n_students}")
+def simulate(problem_func, n_students=365, n_simulations=1000, rng=None):
+    return count_matches(problem_func, n_students, n_simulations, rng) / n_simulations
 
-            self.fig.canvas.draw()
-            self.fig.canvas.flush_events()
 
-            if not np.isnan(self.y_match).all():
-                markerline, stemlines, baseline = self.ax.stem(
-                    self.x, self.y_match, markerfmt="*"
-                )
-                plt.setp(markerline, color="green")
-                plt.setp(stemlines, "color", plt.getp(markerline, "color"))
-                plt.setp(stemlines, "linestyle", "dotted")
-            self.ax.stem(self.x, self.y, markerfmt="o")
-
-    def new_run(self):
-        y = np.zeros((365,))
-        y[y == 0] = np.nan
-        y_match = np.zeros((365,))
-        y_match[y_match == 0] = np.nan
-        self.y_match = y_match
-        self.y = y
-        self.n_students = 0
-        self.match = False
-        self.ax.clear()
-
-
-class monty_hall_game:
-    def __init__(self) -> None:
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
-        self.fig = fig
-        self.ax = ax1
-        self.results_ax = ax2
-        self.memory_wins = {"switch": 0, "stay": 0}
-        self.memory_games = {"switch": 0, "stay": 0}
-        self.games_finished = 0
-        self.start()
-
-        self.cpoint = self.fig.canvas.mpl_connect("button_press_event", self.click_plot)
-
-    def start(self) -> None:
-        self.ax.clear()
-        values = [10, 10, 10]
-        door_numbers = ["Door 1", "Door 2", "Door 3"]
-
-        self.ax.spines["top"].set_color("none")
-        self.ax.spines["right"].set_color("none")
-        self.ax.spines["left"].set_color("none")
-        self.ax.get_yaxis().set_visible(False)
-
-        self.ax.bar(
-            door_numbers,
-            values,
-            color=["brown", "brown", "brown"],
-            width=0.6,
-            edgecolor=["black", "black", "black"],
-        )
-        self.ax.set_title(f"New game started, pick any door.")
-
-        self.prize_coordinates = [-0.15, 0.85, 1.85]
-
-        self.doors, self.winner_index = self.init_monty_hall()
-        self.prizes = list(map(lambda x: "GOAT" if x == 0 else "CAR", list(self.doors)))
-
-        self.choice = None
-        self.switch = None
-        self.temptative_final_door = None
-        self.final_choice = None
-        self.first_pick = True
-        self.game_over = False
-        self.won = None
-        self.ilegal_move = False
-
-    def click_plot(self, event):
-        if event.inaxes in [self.ax]:
-            if self.game_over:
-                self.start()
-                return
-
-            # if self.choice and self.final_choice:
-            #     self.start()
-
-            if self.first_pick:
-                self.first_pick_mtd(event.xdata)
-            else:
-                self.second_pick_mtd(event.xdata)
-
-            if ((self.choice is not None) or (self.final_choice is not None)) and (
-                not self.ilegal_move
-            ):
-                self.update_bar_chart()
-
-    def first_pick_mtd(self, x_coord):
-        if (x_coord >= -0.3) and (x_coord <= 0.3):
-            self.choice = 0
-        elif (x_coord >= 0.7) and (x_coord <= 1.3):
-            self.choice = 1
-        elif (x_coord >= 1.7) and (x_coord <= 2.3):
-            self.choice = 2
-        else:
-            self.choice = None
-            #             print("click a door")
-            # self.ax.set_title(f"Click on a door to move forward")
-            self.start()
-
-    def second_pick_mtd(self, x_coord):
-        if (x_coord >= -0.3) and (x_coord <= 0.3):
-            self.final_choice = 0
-        elif (x_coord >= 0.7) and (x_coord <= 1.3):
-            self.final_choice = 1
-        elif (x_coord >= 1.7) and (x_coord <= 2.3):
-            self.final_choice = 2
-        else:
-            self.final_choice = None
-            #             print("click a door")
-            # self.ax.set_title(f"Click on a door to move forward")
-            self.start()
-
-        if self.final_choice == self.opened_door:
-            self.ax.set_title(f"You selected the opened door.\nThis game doesn't count")
-            self.ilegal_move = True
-            self.game_over = True
-
-    def update_bar_chart(self):
-        if self.first_pick:
-            values = [10, 10, 10]
-            colors = ["brown", "brown", "brown"]
-            edge_colors = ["black", "black", "black"]
-            linewidths = [1, 1, 1]
-            # colors[self.choice] = "red"
-            edge_colors[self.choice] = "red"
-            linewidths[self.choice] = 5
-
-            door_numbers = ["Door 1", "Door 2", "Door 3"]
-            self.opened_door = self.open_door()
-            # values[opened_door] = 0
-
-            colors[self.opened_door] = "gray"
-
-            self.ax.clear()
-            self.ax.text(
-                self.prize_coordinates[self.opened_door],
-                5,
-                f"{self.prizes[self.opened_door]}",
+def _problem_number(problem):
+    # Accepts 1-4, "problem_3" or one of the bundled *_batch kernels
+    if callable(problem):
+        number = _batch_problem(problem)
+        if number is None:
+            raise ValueError(
+                "Pass the problem number (1 to 4) or one of the problem_*_batch kernels"
             )
+        return number
+    if isinstance(problem, str):
+        problem = int(problem.removeprefix("problem_").removesuffix("_batch"))
+    if problem not in (1, 2, 3, 4):
+        raise ValueError("problem must be one of the birthday problems 1 to 4")
+    return problem
 
-            # self.ax.text(0,10,f"You chose door {self.choice} and host opened door {opened_door}")
-            # self.ax.text(0.4,5,f"{self.doors}")
-            # self.results_ax.bar(door_numbers, values, color = colors,width = 0.6, edgecolor = ['black', 'black', 'black'])
-
-            self.ax.bar(
-                door_numbers,
-                values,
-                color=colors,
-                width=0.6,
-                edgecolor=edge_colors,
-                linewidth=linewidths,
-            )
-            self.ax.set_title(
-                f"You chose door {self.choice+1} and host opened door {self.opened_door+1}.\nDecide your final door."
-            )
-            self.first_pick = False
-        else:
-            values = [10, 10, 10]
-            colors = ["gray", "gray", "gray"]
-            colors[self.winner_index] = "green"
-            edge_colors = ["black", "black", "black"]
-            edge_colors[self.final_choice] = "red"
-            linewidths = [1, 1, 1]
-            linewidths[self.final_choice] = 5
-            door_numbers = ["Door 1", "Door 2", "Door 3"]
-            self.ax.clear()
-            for i in range(3):
-                self.ax.text(self.prize_coordinates[i], 5, f"{self.prizes[i]}")
-            self.ax.bar(
-                door_numbers,
-                values,
-                color=colors,
-                width=0.6,
-                edgecolor=edge_colors,
-                linewidth=linewidths,
-            )
-            self.game_over = True
-            self.check_if_switch()
-            msg = " " if self.switch else " NOT "
-            self.ax.set_title(
-                f"You decided{msg}to switch and chose door #{self.final_choice+1}\n You got a {self.prizes[self.final_choice]}"
-            )
 
-            self.games_finished += 1
-            if self.switch:
-                self.memory_wins["switch"] += self.doors[self.final_choice]
-                self.memory_games["switch"] += 1
-            else:
-                self.memory_wins["stay"] += self.doors[self.final_choice]
-                self.memory_games["stay"] += 1
+def _day_weights(weights):
+    if weights is None:
+        return np.full(365, 1 / 365)
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum()
 
-            self.update_results_chart()
 
-    def update_results_chart(self):
-        self.results_ax.clear()
-        self.results_ax.set_title(
-            f"Games finished: {self.games_finished}\nGames you switched: {self.memory_games['switch']}, Games you stayed: {self.memory_games['stay']}"
-        )
-        self.results_ax.scatter(
-            ["switch", "stay"],
-            [
-                self.memory_wins["switch"] / self.memory_games["switch"],
-                self.memory_wins["stay"] / self.memory_games["stay"],
-            ],
-            s=350,
+def _truncated_product(a, b, degree):
+    # Product of two polynomials keeping the coefficients up to degree, rescaled to
+    # a maximum of 1 to stay in floating point range. Returns (coeffs, log_scale).
+    product = np.convolve(a, b)[: degree + 1]
+    peak = product.max()
+    return product / peak, np.log(peak)
+
+
+def _prob_no_k_share(n_students, k, weights):
+    """
+    Probability that no day is shared by k or more of n_students.
+
+    Uses the generating function n! [x^n] prod_d sum_{j<k} (w_d x)^j / j!, evaluated
+    with x scaled by n_students so that the coefficient of x^n stays close to the peak,
+    and every product rescaled to keep it in floating point range.
+    """
+
+    if n_students == 0:
+        return 1.0
+    if n_students > (k - 1) * len(weights):
+        return 0.0
+
+    scale = n_students
+    j = np.arange(min(k, n_students + 1))
+    log_factorials = gammaln(j + 1)
+
+    coeffs, log_scale = np.ones(1), 0.0
+
+    if np.all(weights == weights[0]):
+        # Identical factors for every day: exponentiate by repeated squaring
+        base = np.exp(j * np.log(weights[0] * scale) - log_factorials)
+        power = len(weights)
+        while power:
+            if power & 1:
+                coeffs, s = _truncated_product(coeffs, base, n_students)
+                log_scale += s
+            power >>= 1
+            if power:
+                base, s = _truncated_product(base, base, n_students)
+                log_scale += s * power
+    else:
+        for w in weights:
+            factor = np.exp(j * np.log(w * scale) - log_factorials) if w > 0 else [1.0]
+            coeffs, s = _truncated_product(coeffs, factor, n_students)
+            log_scale += s
+
+    if len(coeffs) <= n_students or coeffs[n_students] <= 0:
+        return 0.0
+
+    log_prob = (
+        gammaln(n_students + 1)
+        - n_students * np.log(scale)
+        + np.log(coeffs[n_students])
+        + log_scale
+    )
+
+    return min(1.0, np.exp(log_prob))
+
+
+def _prob_no_cross_match(n_students):
+    # Problem 4 with uniform bdays: condition on the number of distinct bdays in
+    # classroom 1, whose distribution follows from a Markov chain over the students
+    days = np.arange(366)
+    distinct = np.zeros(366)
+    distinct[0] = 1.0
+
+    for _ in range(n_students):
+        distinct = (
+            distinct * days / 365 + np.r_[0.0, distinct[:-1] * (366 - days[1:]) / 365]
         )
-        self.results_ax.set_ylim(0, 1)
 
-    def check_if_switch(self):
-        self.switch = False if self.choice == self.final_choice else True
+    return np.sum(distinct * ((365 - days) / 365) ** n_students)
 
-    def init_monty_hall(self):
-        doors = np.array([0, 0, 0])
-        winner_index = np.random.randint(0, 3)
-        doors[winner_index] = 1
 
-        return doors, winner_index
+def exact_birthday_prob(problem, n_students, k=2, weights=None):
+    """
+    Exact probability of a match for one of the birthday problems.
 
-    def open_door(self):
-        openable_doors = [
-            i for i in range(3) if i not in (self.winner_index, self.choice)
-        ]
-        door_to_open = np.random.choice(openable_doors)
+    Args:
+        problem (int, str or callable): Birthday problem 1 to 4, or its problem_*_batch kernel.
+        n_students (int): Number of students in the classroom.
+        k (int): For problem 3, the number of students that must share a bday.
+        weights (array-like): Optional (unnormalized) probability of every one of the 365
+            days. The predefined bday of problem 1 is still uniformly distributed.
+
+    Returns:
+        float: The probability of a match.
+    """
 
-        return door_to_open
+    problem = _problem_number(problem)
+    if k != 2 and problem != 3:
+        raise ValueError("k only applies to problem 3")
+    if k < 2:
+        raise ValueError("k must be at least 2")
+    if weights is not None and problem == 4:
+        raise ValueError("problem 4 only has an exact solution for uniform bdays")
+
+    w = _day_weights(weights)
+
+    match problem:
+        case 1:
+            return 1 - np.mean((1 - w) ** n_students)
+        case 2:
+            return 1 - np.sum(w * (1 - w) ** max(n_students - 1, 0))
+        case 3:
+            return 1 - _prob_no_k_share(n_students, k, w)
+        case 4:
+            return 1 - _prob_no_cross_match(n_students)
+
+
+@lru_cache(maxsize=64)
+def _exact_birthday_table(problem, class_sizes, k, weights):
+    # Every caller gets the same cached table, so it is handed out read-only
+    return MappingProxyType(
+        {
+            n: exact_birthday_prob(problem, n, k, weights and np.array(weights))
+            for n in class_sizes
+        }
+    )
 
 
-def success_rate_plot(f):
-    def _plot(switch, n_iterations):
-        wins = 0
-        # iterations = 1000
+def exact_birthday_table(problem, class_sizes=None, k=2, weights=None):
+    """
+    Memoized, read-only {class_size: exact probability} mapping (dict(...) gives an
+    editable copy). By default it covers big_classroom_sizes for problems 1 and 2 and
+    small_classroom_sizes for 3 and 4.
+    """
 
-        for _ in range(n_iterations):
-            wins += f(switch=switch)
+    problem = _problem_number(problem)
+    if class_sizes is None:
+        class_sizes = big_classroom_sizes if problem <= 2 else small_classroom_sizes
+    weights = None if weights is None else tuple(np.asarray(weights, dtype=float))
 
-        win_rate = wins / n_iterations
-        loss_rate = 1 - win_rate
+    return _exact_birthday_table(problem, tuple(class_sizes), k, weights)
 
-        fig, ax = plt.subplots(1, 1, figsize=(10, 4))
-        ax.pie(
-            [win_rate, loss_rate],
-            labels=["Win a car", "Win... a goat?"],
-            colors=sns.color_palette("pastel")[2:],
-            autopct="%.0f%%",
-        )
 
-        msg = "always" if switch else "never"
-        ax.set_title(f"Win rate if you {msg} switch doors ({n_iterations} simulations)")
-        plt.show()
+def compare_with_simulation(
+    problem, class_sizes=None, n_simulations=1000, confidence=0.95, rng=None
+):
+    """
+    Runs the Monte Carlo estimate for every class size and reports how far it is from
+    the exact probability.
 
-    def _plot_generalized(switch, n_iterations, n=3, k=1):
-        wins = 0
-        # iterations = 1000
+    Returns:
+        dict: Arrays "class_sizes", "exact", "simulated", "deviation" (simulated - exact),
+            "band" (half width of the confidence band of a simulation with n_simulations
+            trials around the exact value) and "within_band".
+    """
 
-        for _ in range(n_iterations):
-            try:
-                wins += f(switch=switch, n=n, k=k)
-            except ValueError:
-                print(
-                    "n is the number of doors and k is the amount of doors the host opens. Since you have already picked one door, k has to be at most n-2, so there is at least one openable door after the host open the k doors."
-                )
-                return
+    problem = _problem_number(problem)
+    table = exact_birthday_table(problem, class_sizes)
+    kernel = _BATCH_PROBLEMS[problem][0]
+
+    sizes = np.array(list(table))
+    exact = np.array(list(table.values()))
+    simulated = np.array([simulate(kernel, n, n_simulations, rng) for n in sizes])
+
+    z = ndtri(0.5 + confidence / 2)
+    band = z * np.sqrt(exact * (1 - exact) / n_simulations)
+    deviation = simulated - exact
+
+    return {
+        "class_sizes": sizes,
+        "exact": exact,
+        "simulated": simulated,
+        "deviation": deviation,
+        "band": band,
+        "within_band": np.abs(deviation) <= band,
+    }
+
+
+def _iter_parallel(func, units, seed=None, max_workers=None, executor=None):
+    """
+    Runs func(*unit, seed_sequence) for every unit in a process pool and yields
+    (unit_index, result) pairs as soon as they complete.
+
+    Every unit gets its own SeedSequence.spawn child, so the results only depend on the
+    seed and the list of units, never on the number of workers or the completion order.
+    max_workers=1 runs the units in order in this process. Callers that submit several
+    batches pass their own executor so the worker processes are started only once.
+    """
+
+    children = np.random.SeedSequence(seed).spawn(len(units))
+
+    if max_workers == 1:
+        for i, (unit, child) in enumerate(zip(units, children)):
+            yield i, func(*unit, child)
+        return
+
+    with (
+        nullcontext(executor)
+        if executor is not None
+        else ProcessPoolExecutor(max_workers=max_workers)
+    ) as executor:
+        futures = {
+            executor.submit(func, *unit, child): i
+            for i, (unit, child) in enumerate(zip(units, children))
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _importable(func):
+    # Workers started with spawn (the default on macOS and Windows) re-import pickled
+    # functions by name, which fails for notebook (__main__) functions, lambdas and closures
+    module = sys.modules.get(getattr(func, "__module__", None))
+    if module is None or module.__name__ == "__main__":
+        return False
+
+    target = module
+    for name in getattr(func, "__qualname__", "<>").split("."):
+        target = getattr(target, name, None)
+
+    return target is func
+
+
+def _simulate_block(problem, n_students, n_trials, seed_seq):
+    # problem is the number of a bundled batch kernel or a per-trial problem function
+    if isinstance(problem, int):
+        rng = np.random.default_rng(seed_seq)
+        return count_matches(_BATCH_PROBLEMS[problem][0], n_students, n_trials, rng)
+
+    # Per-trial problem functions draw from the global numpy state. Unimportable ones
+    # run in the caller's process (max_workers=1), so the caller's state is restored
+    state = np.random.get_state()
+    try:
+        np.random.seed(seed_seq.generate_state(4))
+        return count_matches(problem, n_students, n_trials)
+    finally:
+        np.random.set_state(state)
+
+
+def iter_simulated_probs(
+    problem_func,
+    class_sizes,
+    n_simulations=1000,
+    seed=None,
+    block_size=250,
+    max_workers=None,
+):
+    """
+    Sweeps simulate() over class_sizes in a process pool, sharding every class size into
+    blocks of at most block_size trials. Problem functions that worker processes cannot
+    import (defined in a notebook, lambdas, closures) are run serially in this process,
+    with the same per-block seeds.
+
+    Yields:
+        tuple: (index, class_size, probability, n_done) every time a block finishes, where
+            probability is the running estimate for that class size after n_done trials.
+    """
 
-        win_rate = wins / n_iterations
-        loss_rate = 1 - win_rate
+    class_sizes = list(class_sizes)
+
+    # Workers get the number of a bundled kernel, or the function itself if they can
+    # import it. Anything else (e.g. a function defined in the notebook) runs serially.
+    problem = _batch_problem(problem_func)
+    if problem is None:
+        problem = problem_func
+        if not _importable(problem_func):
+            max_workers = 1
+
+    units = [
+        (problem, n_students, min(block_size, n_simulations - start))
+        for n_students in class_sizes
+        for start in range(0, n_simulations, block_size)
+    ]
+    blocks_per_size = len(units) // len(class_sizes)
+
+    matches = np.zeros(len(class_sizes), dtype=np.int64)
+    done = np.zeros(len(class_sizes), dtype=np.int64)
+
+    for unit_index, block_matches in _iter_parallel(
+        _simulate_block, units, seed, max_workers
+    ):
+        i = unit_index // blocks_per_size
+        matches[i] += block_matches
+        done[i] += units[unit_index][2]
+        yield i, class_sizes[i], matches[i] / done[i], done[i]
+
+
+def simulate_sweep(
+    problem_func,
+    class_sizes,
+    n_simulations=1000,
+    seed=None,
+    block_size=250,
+    max_workers=None,
+    callback=None,
+):
+    """
+    Parallel equivalent of [simulate(problem_func, n, n_simulations) for n in class_sizes].
+
+    Args:
+        callback (callable): Optional, called with the array of running probabilities
+            (NaN for class sizes without finished blocks yet) after every block.
+
+    Returns:
+        list[float]: The simulated probability for every class size.
+    """
+
+    sim_probs = np.full(len(class_sizes), np.nan)
+
+    for i, _, prob, _ in iter_simulated_probs(
+        problem_func, class_sizes, n_simulations, seed, block_size, max_workers
+    ):
+        sim_probs[i] = prob
+        if callback is not None:
+            callback(sim_probs)
 
-        fig, ax = plt.subplots(1, 1, figsize=(12, 4))
-        ax.pie(
-            [win_rate, loss_rate],
-            labels=["Win a car", "Win... a goat?"],
-            colors=sns.color_palette("pastel")[2:],
-            autopct="%.0f%%",
+    return sim_probs.tolist()
+
+
+def _check_monty_hall_params(n, k):
+    if not (0 <= k <= n - 2):
+        raise ValueError(
+            "k must be between 0 and n-2, so the Host can leave at least 1 openable door!"
         )
 
-        msg = "always" if switch else "never"
-        ax.set_title(f"Win rate if you {msg} switch doors ({n_iterations} simulations)")
-        plt.show()
-
-    n_iterations_selection = widgets.SelectionSlider(
-        options=[1, 10, 100, 1000],
-        value=1,
-        description="# iterations",
-        disabled=False,
-        continuous_update=False,
-        orientation="horizontal",
-        readout=True,
-    )
 
-    strategy_selection = widgets.RadioButtons(
-        options=[True, False],
-        value=False,
-        description="Switch Doors?",
-        disabled=False,
+def monty_hall_batch(n_games, switch, n=3, k=1, rng=None):
+    """
+    Simulates n_games of the generalized Monty Hall problem at once.
+
+    The host never opens the car, so if the first pick was wrong the car is one of the
+    n-1-k closed doors the player can switch to, each equally likely to be picked.
+    Switching therefore wins when the first pick was wrong and a uniform draw over those
+    n-1-k doors hits the car (index 0), and no door lists are needed.
+
+    Returns:
+        ndarray: 1 for every game where the car was won, 0 otherwise.
+    """
+
+    _check_monty_hall_params(n, k)
+
+    winner = _draw_indices(rng, n, n_games)
+    choice = _draw_indices(rng, n, n_games)
+
+    if not switch:
+        return (winner == choice).astype(np.int64)
+
+    switched_to_car = _draw_indices(rng, n - 1 - k, n_games) == 0
+
+    return ((winner != choice) & switched_to_car).astype(np.int64)
+
+
+def monty_hall_win_rate(switch, n=3, k=1):
+    _check_monty_hall_params(n, k)
+
+    if not switch:
+        return 1 / n
+
+    return (n - 1) / (n * (n - 1 - k))
+
+
+def _monty_hall_row(n, n_iterations, max_chunk_elements, seed_seq):
+    # Every valid k for n doors at once (one row of games per k), in chunks of games so
+    # that only about max_chunk_elements draws are held at a time
+    rng = np.random.default_rng(seed_seq)
+    k = np.arange(n - 1)
+    switch_wins = np.zeros(len(k), dtype=np.int64)
+    stay_wins = np.zeros(len(k), dtype=np.int64)
+    chunk_games = max(1, max_chunk_elements // len(k))
+
+    for start in range(0, n_iterations, chunk_games):
+        games = min(chunk_games, n_iterations - start)
+        winner = rng.integers(0, n, size=(len(k), games))
+        choice = rng.integers(0, n, size=(len(k), games))
+        switched_to_car = rng.integers(0, (n - 1 - k)[:, None], size=winner.shape) == 0
+
+        won_first = winner == choice
+        stay_wins += np.count_nonzero(won_first, axis=1)
+        switch_wins += np.count_nonzero(~won_first & switched_to_car, axis=1)
+
+    return switch_wins / n_iterations, stay_wins / n_iterations
+
+
+def monty_hall_sweep(
+    n_iterations=1000,
+    seed=0,
+    n_values=range(3, 101),
+    max_workers=None,
+    cache=True,
+    max_chunk_elements=2**20,
+):
+    """
+    Simulated switch and stay win rates over the whole valid (n, k) triangle.
+
+    Every n is simulated in its own process-pool task (for all its k at once). Results
+    are stored under CACHE_DIR keyed by (n_iterations, seed, max_chunk_elements,
+    n_values), so later calls with the same arguments are a file read. A seed of None disables the cache. Every task draws
+    its games in chunks of about max_chunk_elements, so memory does not grow with
+    n_iterations.
+
+    Returns:
+        dict: "n" and "k" value arrays plus "switch" and "stay" win rates of shape
+            (len(n), len(k)), NaN where k > n - 2.
+    """
+
+    n_values = np.asarray(list(n_values), dtype=np.int64)
+    # Every argument that changes the draws is part of the key; n_values by checksum
+    n_key = zlib.crc32(n_values.tobytes())
+    path = os.path.join(
+        CACHE_DIR,
+        f"monty_hall_sweep_{n_iterations}_{seed}_{max_chunk_elements}_{n_key:08x}.npz",
     )
 
-    if f.__qualname__ == "monty_hall":
-        interact_manual(
-            _plot,
-            switch=strategy_selection,
-            n_iterations=n_iterations_selection,
-        )
+    if cache and seed is not None and os.path.exists(path):
+        with np.load(path) as cached:
+            if np.array_equal(cached["n"], n_values):
+                return dict(cached)
 
-    if f.__qualname__ == "generalized_monty_hall":
-        disabled = False
+    k_values = np.arange(n_values.max() - 1)
+    switch = np.full((len(n_values), len(k_values)), np.nan)
+    stay = np.full((len(n_values), len(k_values)), np.nan)
 
-        n_selection = widgets.SelectionSlider(
-            options=range(3, 101),
-            value=3,
-            description="n",
-            disabled=disabled,
-        )
+    units = [(int(n), n_iterations, max_chunk_elements) for n in n_values]
+    for i, (row_switch, row_stay) in _iter_parallel(
+        _monty_hall_row, units, seed, max_workers
+    ):
+        switch[i, : len(row_switch)] = row_switch
+        stay[i, : len(row_stay)] = row_stay
 
-        k_selection = widgets.SelectionSlider(
-            options=range(0, 99),
-            value=1,
-            description="k",
-            disabled=disabled,
-        )
+    sweep = {"n": n_values, "k": k_values, "switch": switch, "stay": stay}
 
-        interact_manual(
-            _plot_generalized,
-            switch=strategy_selection,
-            n_iterations=n_iterations_selection,
-            n=n_selection,
-            k=k_selection,
-        )
+    if cache and seed is not None:
+        try:
+            # Written under a temporary name and renamed, so readers never see a partial file
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, staging = tempfile.mkstemp(dir=CACHE_DIR, suffix=".npz")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **sweep)
+            os.replace(staging, path)
+        except OSError:
+            # Read-only install: the sweep is simply not cached
+            pass
+
+    return sweep
 
 
 FEATURES = ["height", "weight", "bark_days", "ear_head_ratio"]
@@ -888,9 +1038,39 @@ class params_gaussian:
     mu: float
     sigma: float
 
+    # Derived values are recomputed on access so they follow reassigned parameters, and
+    # sigma=0 gives inf/nan densities (as the scipy path does) instead of raising
+    @property
+    def _inv_sigma(self):
+        with np.errstate(divide="ignore"):
+            return np.divide(1.0, self.sigma)
+
+    @property
+    def _log_norm(self):
+        with np.errstate(divide="ignore"):
+            return -np.log(self.sigma) - 0.5 * np.log(2 * np.pi)
+
     def __repr__(self):
         return f"params_gaussian(mu={self.mu:.3f}, sigma={self.sigma:.3f})"
 
+    def logpdf(self, x):
+        with np.errstate(invalid="ignore"):
+            z = (np.asarray(x, dtype=float) - self.mu) * self._inv_sigma
+            return self._log_norm - 0.5 * z * z
+
+    def pdf(self, x):
+        return np.exp(self.logpdf(x))
+
+    def cdf(self, x):
+        with np.errstate(invalid="ignore"):
+            return ndtr((np.asarray(x, dtype=float) - self.mu) * self._inv_sigma)
+
+    def ppf(self, q):
+        return self.mu + self.sigma * ndtri(q)
+
+    def sample(self, size=None, rng=None):
+        return (np.random if rng is None else rng).normal(self.mu, self.sigma, size)
+
 
 @dataclass
 class params_binomial:
@@ -900,15 +1080,80 @@ class params_binomial:
     def __repr__(self):
         return f"params_binomial(n={self.n:.3f}, p={self.p:.3f})"
 
+    @property
+    def table(self):
+        # Looked up on every use so it follows reassigned n and p; discrete_table caches
+        # the build, so this is a dictionary lookup after the first call
+        return discrete_table("binomial", int(self.n), float(self.p))
+
+    def logpmf(self, x):
+        return self.table.logpmf(x)
+
+    def pmf(self, x):
+        return self.table.pmf(x)
+
+    # The classifier treats every feature as having a density
+    logpdf = logpmf
+    pdf = pmf
+
+    def cdf(self, x):
+        return self.table.cdf(x)
+
+    def ppf(self, q):
+        return self.table.ppf(q)
+
+    def sample(self, size=None, rng=None):
+        return (np.random if rng is None else rng).binomial(int(self.n), self.p, size)
+
 
 @dataclass
 class params_uniform:
     a: int
     b: int
 
+    # breed_params has a > b for breed 0, so the support is [min(a, b), max(a, b)]. As
+    # for params_gaussian, a == b gives inf/nan densities rather than an error
+    @property
+    def _low(self):
+        return min(self.a, self.b)
+
+    @property
+    def _high(self):
+        return max(self.a, self.b)
+
+    @property
+    def _width(self):
+        return float(self._high - self._low)
+
     def __repr__(self):
         return f"params_uniform(a={self.a:.3f}, b={self.b:.3f})"
 
+    def _inside(self, x):
+        return (x >= self._low) & (x <= self._high)
+
+    def logpdf(self, x):
+        x = np.asarray(x, dtype=float)
+        with np.errstate(divide="ignore"):
+            return np.where(self._inside(x), -np.log(self._width), -np.inf)
+
+    def pdf(self, x):
+        x = np.asarray(x, dtype=float)
+        with np.errstate(divide="ignore"):
+            return np.where(self._inside(x), np.divide(1.0, self._width), 0.0)
+
+    def cdf(self, x):
+        x = np.asarray(x, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.clip(np.divide(x - self._low, self._width), 0.0, 1.0)
+
+    def ppf(self, q):
+        return self._low + self._width * np.asarray(q, dtype=float)
+
+    def sample(self, size=None, rng=None):
+        return self._low + self._width * (np.random if rng is None else rng).random(
+            size
+        )
+
 
 breed_params = {
     0: {
@@ -957,318 +1202,2040 @@ def generate_data_for_breed(breed, features, n_samples, params, gg, bg, ug):
             The DataFrame will have columns for each feature and an additional column for the breed.
     """
 
-    df = pd.DataFrame()
+    columns = _generate_breed_columns(breed, features, n_samples, params, gg, bg, ug)
+    columns["breed"] = np.full(n_samples, breed)
+
+    return pd.DataFrame(columns)
+
+
+def _generate_breed_columns(breed, features, n_samples, params, gg, bg, ug):
+    columns = {}
 
     for feature in features:
         match feature:
             case "height" | "weight":
-                df[feature] = gg(
+                columns[feature] = gg(
                     params[breed][feature].mu, params[breed][feature].sigma, n_samples
                 )
 
             case "bark_days":
-                df[feature] = bg(
+                columns[feature] = bg(
                     params[breed][feature].n, params[breed][feature].p, n_samples
                 )
 
             case "ear_head_ratio":
-                df[feature] = ug(
+                columns[feature] = ug(
                     params[breed][feature].a, params[breed][feature].b, n_samples
                 )
 
-    df["breed"] = breed
-
-    return df
+    return columns
 
 
 def generate_data(gaussian_generator, binomial_generator, uniform_generator):
-    # Generate data for each breed
-    df_0 = generate_data_for_breed(
-        breed=0,
-        features=FEATURES,
-        n_samples=1200,
-        params=breed_params,
-        gg=gaussian_generator,
-        bg=binomial_generator,
-        ug=uniform_generator,
-    )
-    df_1 = generate_data_for_breed(
-        breed=1,
-        features=FEATURES,
-        n_samples=1350,
-        params=breed_params,
-        gg=gaussian_generator,
-        bg=binomial_generator,
-        ug=uniform_generator,
-    )
-    df_2 = generate_data_for_breed(
-        breed=2,
-        features=FEATURES,
-        n_samples=900,
-        params=breed_params,
-        gg=gaussian_generator,
-        bg=binomial_generator,
-        ug=uniform_generator,
-    )
+    n_samples = {0: 1200, 1: 1350, 2: 900}
+
+    # Generate data for each breed (same call order as generating breed by breed)
+    breed_columns = [
+        _generate_breed_columns(
+            breed,
+            FEATURES,
+            n,
+            breed_params,
+            gaussian_generator,
+            binomial_generator,
+            uniform_generator,
+        )
+        for breed, n in n_samples.items()
+    ]
 
-    # Concatenate all breeds into a single dataframe
-    df_all_breeds = pd.concat([df_0, df_1, df_2]).reset_index(drop=True)
+    # One array per column holding all breeds, then a single shuffle through a
+    # permutation index (the same one df.sample(frac=1) would draw)
+    total = sum(n_samples.values())
+    permutation = np.random.choice(total, size=total, replace=False)
 
-    # Shuffle the data
-    df_all_breeds = df_all_breeds.sample(frac=1)
+    columns = {
+        feature: np.concatenate([columns[feature] for columns in breed_columns])[
+            permutation
+        ]
+        for feature in FEATURES
+    }
+    columns["breed"] = np.repeat(list(n_samples), list(n_samples.values()))[permutation]
 
-    return df_all_breeds
+    return pd.DataFrame(columns, index=permutation)
 
 
-def compute_training_params(df, features):
+def generate_breed_data(n_samples=None, params=breed_params, rng=None, shuffle=True):
     """
-    Computes the estimated parameters for training a model based on the provided dataframe and features.
+    Vectorized synthetic breed dataset: every feature column is drawn for all breeds in
+    a single call, with the parameters broadcast per row.
 
     Args:
-        df (pandas.DataFrame): The dataframe containing the training data.
-        features (list): A list of feature names to consider.
+        n_samples (dict): Number of samples per breed. Defaults to the sizes used by generate_data.
+        params (dict): Parameters of every breed and feature, like breed_params.
+        rng (numpy.random.Generator): Source of randomness. If None the global numpy state is used.
+        shuffle (bool): Whether to shuffle the rows.
 
     Returns:
-        - params_dict (dict): A dictionary that contains the estimated parameters for each breed and feature.
+        pandas.DataFrame: Columns FEATURES plus "breed".
     """
 
-    # Dict that should contain the estimated parameters
-    params_dict = {}
+    if n_samples is None:
+        n_samples = {0: 1200, 1: 1350, 2: 900}
 
-    ### START CODE HERE ###
+    return pd.DataFrame(
+        _draw_breed_columns(
+            n_samples, params, np.random if rng is None else rng, shuffle
+        )
+    )
 
-    # Loop over the breeds
-    for breed in range(3):  # @REPLACE for None in None:
-        # Slice the original df to only include data for the current breed and the feature columns
-        # For reference in slicing with pandas, you can use the df_breed.groupby function followed by .get_group
-        # or you can use the syntax df[df['breed'] == group]
-        df_breed = df[df["breed"] == breed][
-            features
-        ]  # @REPLACE df_breed = df[df["breed"] == None][features]
 
-        # Initialize the inner dict
-        inner_dict = {}
+def _draw_breed_columns(n_samples, params, rng, shuffle):
+    breeds = list(n_samples)
+    counts = list(n_samples.values())
 
-        # Loop over the columns of the sliced dataframe
-        # You can get the columns of a dataframe like this: dataframe.columns
-        for col in df_breed.columns:
-            match col:
-                case "height" | "weight":
-                    mu, sigma = estimate_gaussian_params(df_breed[col])
-                    m = {"mu": mu, "sigma": sigma}
+    def _per_row(feature, attr):
+        return np.repeat([getattr(params[b][feature], attr) for b in breeds], counts)
 
-                case "bark_days":
-                    n, p = estimate_binomial_params(df_breed[col])
-                    m = {"n": n, "p": p}
+    columns = {}
+    for feature in FEATURES:
+        match feature:
+            case "height" | "weight":
+                columns[feature] = rng.normal(
+                    _per_row(feature, "mu"), _per_row(feature, "sigma")
+                )
 
-                case "ear_head_ratio":
-                    a, b = estimate_uniform_params(df_breed[col])
-                    m = {"a": a, "b": b}
+            case "bark_days":
+                columns[feature] = rng.binomial(
+                    _per_row(feature, "n"), _per_row(feature, "p")
+                ).astype(float)
 
-            # Save the dataclass object within the inner dict
-            inner_dict[col] = m
+            case "ear_head_ratio":
+                # a + (b - a) * u like np.random.uniform, which also allows a > b
+                a, b = _per_row(feature, "a"), _per_row(feature, "b")
+                columns[feature] = a + (b - a) * rng.random(len(a))
 
-        # Save inner dict within outer dict
-        params_dict[breed] = inner_dict
+    columns["breed"] = np.repeat(breeds, counts)
 
-    ### END CODE HERE ###
+    if shuffle:
+        permutation = rng.permutation(len(columns["breed"]))
+        columns = {name: values[permutation] for name, values in columns.items()}
 
-    return params_dict
+    return columns
 
 
-def estimate_gaussian_params(sample):
-    ### START CODE HERE ###
-    mu = np.mean(sample)
-    sigma = np.std(sample)
-    ### END CODE HERE ###
+BREED_DTYPE = np.dtype([(feature, "f8") for feature in FEATURES] + [("breed", "i8")])
 
-    return mu, sigma
 
+def _iter_chunk_counts(n_samples, chunk_size, seed):
+    """
+    Breed counts of every chunk: each chunk takes a multivariate hypergeometric draw of
+    chunk_size rows from the rows that are left, like splitting a globally shuffled
+    dataset. Every shard is therefore stratified and the totals are exactly n_samples.
+    The draw of chunk i uses SeedSequence(seed, spawn_key=(i, 0)).
+    """
 
-def estimate_binomial_params(sample):
-    ### START CODE HERE ###
-    n = 30
-    p = (sample / n).mean()
-    ### END CODE HERE ###
+    breeds = list(n_samples)
+    remaining = np.array([n_samples[b] for b in breeds], dtype=np.int64)
+    chunk_index = 0
 
-    return n, p
+    while remaining.sum() > 0:
+        rng = np.random.default_rng(
+            np.random.SeedSequence(seed, spawn_key=(chunk_index, 0))
+        )
+        rows = min(chunk_size, int(remaining.sum()))
+        counts = rng.multivariate_hypergeometric(remaining, rows)
+        remaining -= counts
 
+        yield {b: int(c) for b, c in zip(breeds, counts) if c > 0}
+        chunk_index += 1
 
-def estimate_uniform_params(sample):
-    ### START CODE HERE ###
-    a = sample.min()
-    b = sample.max()
-    ### END CODE HERE ###
 
-    return a, b
+def _chunk_counts(n_samples, chunk_index, chunk_size, seed):
+    # Only the counts of the previous chunks are drawn, not their rows
+    for i, counts in enumerate(_iter_chunk_counts(n_samples, chunk_size, seed)):
+        if i == chunk_index:
+            return counts
 
+    raise IndexError(f"chunk {chunk_index} is past the end of the dataset")
 
-def plot_gaussian_distributions(gaussian_0, gaussian_1, gaussian_2):
-    fig, ax = plt.subplots(1, 1, figsize=(10, 4))
-    ax.hist(gaussian_0, alpha=0.5, label="gaussian_0", bins=32)
-    ax.hist(gaussian_1, alpha=0.5, label="gaussian_1", bins=32)
-    ax.hist(gaussian_2, alpha=0.5, label="gaussian_2", bins=32)
-    ax.set_title("Histograms of Gaussian distributions")
-    ax.set_xlabel("Values")
-    ax.set_ylabel("Frequencies")
-    ax.legend()
-    plt.show()
-
-
-def plot_binomial_distributions(binomial_0, binomial_1, binomial_2):
-    fig, ax = plt.subplots(1, 1, figsize=(10, 4))
-    ax.hist(binomial_0, alpha=0.5, label="binomial_0")
-    ax.hist(binomial_1, alpha=0.5, label="binomial_1")
-    ax.hist(binomial_2, alpha=0.5, label="binomial_2")
-    ax.set_title("Histograms of Binomial distributions")
-    ax.set_xlabel("Values")
-    ax.set_ylabel("Frequencies")
-    ax.legend()
-    plt.show()
-
-
-df_anscombe = pd.read_csv("df_anscombe.csv")
-df_datasaurus = pd.read_csv("datasaurus.csv")
-
-
-def plot_anscombes_quartet():
-    fig, axs = plt.subplots(2, 2, figsize=(8, 5), tight_layout=True)
-    i = 1
-    fig.suptitle("Anscombe's quartet", fontsize=16)
-    for line in axs:
-        for ax in line:
-            ax.scatter(
-                df_anscombe[df_anscombe.group == i]["x"],
-                df_anscombe[df_anscombe.group == i]["y"],
-            )
-            ax.set_title(f"Group {i}")
-            ax.set_ylim(2, 15)
-            ax.set_xlim(0, 21)
-            ax.set_xlabel("x")
-            ax.set_ylabel("y")
-            i += 1
-
-
-def display_widget():
-    dropdown_graph_1 = widgets.Dropdown(
-        options=df_datasaurus.group.unique(),
-        value="dino",
-        description="Data set 1: ",
-        disabled=False,
-    )
 
-    statistics_graph_1 = widgets.Button(
-        value=False,
-        description="Compute stats",
-        disabled=False,
-        button_style="",
-        tooltip="Description",
-        icon="",
-    )
+def _generate_breed_chunk(chunk_index, counts, seed, params, shuffle):
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+    columns = _draw_breed_columns(counts, params, rng, shuffle)
 
-    dropdown_graph_2 = widgets.Dropdown(
-        options=df_datasaurus.group.unique(),
-        value="h_lines",
-        description="Data set 2: ",
-        disabled=False,
-    )
+    chunk = np.empty(len(columns["breed"]), dtype=BREED_DTYPE)
+    for name, values in columns.items():
+        chunk[name] = values
 
-    statistics_graph_2 = widgets.Button(
-        value=False,
-        description="Compute stats",
-        disabled=False,
-        button_style="",
-        tooltip="Description",
-        icon="",
-    )
-    plotted_stats_graph_1 = None
-    plotted_stats_graph_2 = None
-
-    fig = plt.figure(figsize=(8, 4), tight_layout=True)
-    gs = gridspec.GridSpec(2, 2)
-    ax_1 = fig.add_subplot(gs[0, 0])
-    ax_2 = fig.add_subplot(gs[1, 0])
-    ax_text_1 = fig.add_subplot(gs[0, 1])
-    ax_text_2 = fig.add_subplot(gs[1, 1])
-    df_group_1 = df_datasaurus.groupby("group").get_group("dino")
-    df_group_2 = df_datasaurus.groupby("group").get_group("h_lines")
-    sc_1 = ax_1.scatter(df_group_1["x"], df_group_1["y"], s=4)
-    sc_2 = ax_2.scatter(df_group_2["x"], df_group_2["y"], s=4)
-    ax_1.set_xlabel("x")
-    ax_1.set_ylabel("y")
-    ax_2.set_xlabel("x")
-    ax_2.set_ylabel("y")
-    ax_text_1.axis("off")
-    ax_text_2.axis("off")
-
-    def dropdown_choice(value, plotted_stats, ax_text, sc):
-        if value.new != plotted_stats:
-            ax_text.clear()
-            ax_text.axis("off")
-        sc.set_offsets(df_datasaurus.groupby("group").get_group(value.new)[["x", "y"]])
-        fig.canvas.draw_idle()
-
-    def get_stats(value, plotted_stats, ax_text, dropdown, val):
-        value = dropdown.value
-        if value == plotted_stats:
-            return
-        ax_text.clear()
-        ax_text.axis("off")
-        df_group = df_datasaurus.groupby("group").get_group(value)
-        means = df_group.mean()
-        var = df_group.var()
-        corr = df_group.corr()
-        ax_text.text(
-            0,
-            0,
-            f"Statistics:\n      Mean x:      {means['x']:.2f}\n      Variance x: {var['x']:.2f}\n\n      Mean y:      {means['y']:.2f}\n      Variance y: {var['y']:.2f}\n\n      Correlation:  {corr['x']['y']:.2f}",
-        )
-        if val == 1:
-            plotted_stats_graph_1 = value
-        if val == 2:
-            plotted_stats_graph_2 = value
-
-    dropdown_graph_1.observe(
-        lambda value: dropdown_choice(value, plotted_stats_graph_1, ax_text_1, sc_1),
-        names="value",
-    )
-    statistics_graph_1.on_click(
-        lambda value: get_stats(
-            value, plotted_stats_graph_1, ax_text_1, dropdown_graph_1, 1
-        )
-    )
-    dropdown_graph_2.observe(
-        lambda value: dropdown_choice(value, plotted_stats_graph_2, ax_text_2, sc_2),
-        names="value",
-    )
-    statistics_graph_2.on_click(
-        lambda value: get_stats(
-            value, plotted_stats_graph_2, ax_text_2, dropdown_graph_2, 2
-        )
-    )
-    graph_1_box = HBox([dropdown_graph_1, statistics_graph_1])
-    graph_2_box = HBox([dropdown_graph_2, statistics_graph_2])
-    display(VBox([graph_1_box, graph_2_box]))
-
-
-def plot_datasaurus():
-    fig, axs = plt.subplots(6, 2, figsize=(7, 9), tight_layout=True)
-    i = 0
-    fig.suptitle("Datasaurus", fontsize=16)
-    for line in axs:
-        for ax in line:
-            if i > 12:
-                ax.axis("off")
-            else:
-                group = df_datasaurus.group.unique()[i]
-                ax.scatter(
-                    df_datasaurus[df_datasaurus.group == group]["x"],
-                    df_datasaurus[df_datasaurus.group == group]["y"],
-                    s=4,
-                )
-                ax.set_title(f"Group {group}")
-                ax.set_ylim(-5, 110)
-                ax.set_xlim(10, 110)
-                ax.set_xlabel("x")
-                ax.set_ylabel("y")
-                i += 1
+    return chunk
+
+
+def generate_breed_chunk(
+    chunk_index, n_samples, chunk_size, seed=0, params=breed_params, shuffle=True
+):
+    """
+    Generates chunk chunk_index of the dataset described by n_samples as a structured
+    array with dtype BREED_DTYPE.
+
+    Every chunk holds a random, stratified share of every breed and is seeded with
+    SeedSequence(seed, spawn_key=(chunk_index,)), so any chunk can be regenerated on its
+    own.
+    """
+
+    counts = _chunk_counts(n_samples, chunk_index, chunk_size, seed)
+
+    return _generate_breed_chunk(chunk_index, counts, seed, params, shuffle)
+
+
+def iter_breed_chunks(
+    n_samples, chunk_size=1_000_000, seed=0, params=breed_params, shuffle=True
+):
+    """
+    Yields the dataset described by n_samples (samples per breed) in structured array
+    chunks of at most chunk_size rows. Every chunk mixes the breeds in proportion, as if
+    the whole dataset had been shuffled before being split.
+    """
+
+    # seed=None is resolved once, so that all chunks share the same root entropy
+    seed = np.random.SeedSequence(seed).entropy
+
+    for chunk_index, counts in enumerate(
+        _iter_chunk_counts(n_samples, chunk_size, seed)
+    ):
+        yield _generate_breed_chunk(chunk_index, counts, seed, params, shuffle)
+
+
+def _params_to_json(params):
+    return {
+        str(breed): {
+            feature: {"family": type(p).__name__, **asdict(p)}
+            for feature, p in features.items()
+        }
+        for breed, features in params.items()
+    }
+
+
+def _params_from_json(params):
+    families = {
+        "params_gaussian": params_gaussian,
+        "params_binomial": params_binomial,
+        "params_uniform": params_uniform,
+    }
+    params = json.loads(json.dumps(params))
+
+    return {
+        int(breed): {
+            feature: families[p.pop("family")](**p) for feature, p in features.items()
+        }
+        for breed, features in params.items()
+    }
+
+
+def write_breed_shards(
+    directory,
+    n_samples,
+    chunk_size=1_000_000,
+    seed=0,
+    params=breed_params,
+    fmt="npy",
+):
+    """
+    Writes the dataset described by n_samples as one shard per chunk plus a
+    manifest.json describing how to regenerate and read them.
+
+    Args:
+        directory (str): Output directory, created if needed.
+        n_samples (dict): Number of samples per breed.
+        chunk_size (int): Rows per shard.
+        seed (int): Root seed, every shard uses its own spawn key. If None, fresh entropy
+            is drawn; the manifest stores the resolved value either way.
+        params (dict): Parameters of every breed and feature, like breed_params.
+        fmt (str): "npy" (structured arrays, loadable with mmap_mode="r") or "parquet"
+            (requires pyarrow).
+
+    Returns:
+        dict: The manifest.
+    """
+
+    if fmt not in ("npy", "parquet"):
+        raise ValueError('fmt must be "npy" or "parquet"')
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+    # Resolve seed=None to concrete entropy so the manifest can always regenerate shards
+    seed = np.random.SeedSequence(seed).entropy
+
+    os.makedirs(directory, exist_ok=True)
+    shards = []
+
+    for chunk_index, chunk in enumerate(
+        iter_breed_chunks(n_samples, chunk_size, seed, params)
+    ):
+        file_name = f"shard_{chunk_index:05d}.{fmt}"
+        path = os.path.join(directory, file_name)
+
+        if fmt == "npy":
+            np.save(path, chunk)
+        else:
+            table = pa.table({name: chunk[name] for name in BREED_DTYPE.names})
+            pq.write_table(table, path)
+
+        shards.append({"file": file_name, "rows": len(chunk)})
+
+    manifest = {
+        "format": fmt,
+        "seed": seed,
+        "chunk_size": chunk_size,
+        "n_samples": {str(breed): n for breed, n in n_samples.items()},
+        "params": _params_to_json(params),
+        "dtype": BREED_DTYPE.descr,
+        "shards": shards,
+    }
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def _read_manifest(directory):
+    with open(os.path.join(directory, "manifest.json")) as f:
+        return json.load(f)
+
+
+def iter_breed_shards(directory, mmap=True):
+    """
+    Yields the shards written by write_breed_shards one by one: memory-mapped structured
+    arrays for "npy" shards, pyarrow tables for "parquet" shards.
+    """
+
+    manifest = _read_manifest(directory)
+
+    for shard in manifest["shards"]:
+        path = os.path.join(directory, shard["file"])
+
+        if manifest["format"] == "npy":
+            yield np.load(path, mmap_mode="r" if mmap else None)
+        else:
+            import pyarrow.parquet as pq
+
+            yield pq.read_table(path)
+
+
+def regenerate_breed_shard(directory, chunk_index):
+    # Rebuilds a single shard in memory from the manifest, e.g. to replace a lost file
+    manifest = _read_manifest(directory)
+    n_samples = {int(breed): n for breed, n in manifest["n_samples"].items()}
+
+    return generate_breed_chunk(
+        chunk_index,
+        n_samples,
+        manifest["chunk_size"],
+        manifest["seed"],
+        _params_from_json(manifest["params"]),
+    )
+
+
+def _class_codes(labels):
+    """
+    Maps class labels to codes 0..n_classes-1. Returns (classes, codes).
+
+    Small non-negative integer labels (the usual breed ids) go through np.bincount in
+    O(n), anything else falls back to the sort-based np.unique.
+    """
+
+    labels = np.asarray(labels)
+
+    if (
+        labels.dtype.kind in "iu"
+        and len(labels)
+        and labels.min() >= 0
+        and labels.max() < 4 * len(labels) + 1024
+    ):
+        present = np.flatnonzero(np.bincount(labels))
+        lookup = np.zeros(present[-1] + 1, dtype=np.intp)
+        lookup[present] = np.arange(len(present))
+        return present, lookup[labels]
+
+    return np.unique(labels, return_inverse=True)
+
+
+def _feature_family(feature):
+    match feature:
+        case "height" | "weight":
+            return "gaussian"
+        case "bark_days":
+            return "binomial"
+        case "ear_head_ratio":
+            return "uniform"
+
+    raise ValueError(f"Unknown feature: {feature}")
+
+
+class BreedStats:
+    """
+    Mergeable sufficient statistics for estimating the breed parameters.
+
+    Per class it holds the row count, the mean and sum of squared deviations of every
+    Gaussian feature, the success count of every binomial feature and the min and max of
+    every uniform feature, each family as one (n_classes, n_features) array. update()
+    costs O(len(chunk)) and merge() combines the moments exactly (Chan et al.), so
+    shards can be fitted independently and combined.
+    """
+
+    def __init__(self, features=FEATURES, n_trials=30):
+        self.features = list(features)
+        self.n_trials = n_trials
+        self.gaussian = [f for f in self.features if _feature_family(f) == "gaussian"]
+        self.binomial = [f for f in self.features if _feature_family(f) == "binomial"]
+        self.uniform = [f for f in self.features if _feature_family(f) == "uniform"]
+
+        self.classes = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.mean = np.empty((0, len(self.gaussian)))
+        self.m2 = np.empty((0, len(self.gaussian)))
+        self.successes = np.empty((0, len(self.binomial)))
+        self.min = np.empty((0, len(self.uniform)))
+        self.max = np.empty((0, len(self.uniform)))
+
+    def update(self, chunk):
+        """
+        Adds the rows of chunk, a DataFrame or structured array with a "breed" column.
+        """
+
+        classes, codes = _class_codes(np.asarray(chunk["breed"]))
+        n_classes = len(classes)
+
+        batch = BreedStats(self.features, self.n_trials)
+        batch.classes = classes
+        batch.counts = np.bincount(codes, minlength=n_classes)
+
+        batch.mean = np.empty((n_classes, len(self.gaussian)))
+        batch.m2 = np.empty((n_classes, len(self.gaussian)))
+        for j, feature in enumerate(self.gaussian):
+            x = np.asarray(chunk[feature], dtype=float)
+            batch.mean[:, j] = np.bincount(codes, x, n_classes) / batch.counts
+            batch.m2[:, j] = np.bincount(
+                codes, (x - batch.mean[codes, j]) ** 2, n_classes
+            )
+
+        batch.successes = np.column_stack(
+            [
+                np.bincount(codes, np.asarray(chunk[f], dtype=float), n_classes)
+                for f in self.binomial
+            ]
+            or np.empty((n_classes, 0))
+        )
+
+        batch.min = np.full((n_classes, len(self.uniform)), np.inf)
+        batch.max = np.full((n_classes, len(self.uniform)), -np.inf)
+        for j, feature in enumerate(self.uniform):
+            x = np.asarray(chunk[feature], dtype=float)
+            np.minimum.at(batch.min[:, j], codes, x)
+            np.maximum.at(batch.max[:, j], codes, x)
+
+        return self.merge(batch)
+
+    def _expanded(self, classes):
+        # Copy of the statistics over a superset of the classes (empty for new ones)
+        rows = np.searchsorted(classes, self.classes)
+        expanded = BreedStats(self.features, self.n_trials)
+        expanded.classes = classes
+
+        for name, fill in [
+            ("counts", 0),
+            ("mean", 0.0),
+            ("m2", 0.0),
+            ("successes", 0.0),
+            ("min", np.inf),
+            ("max", -np.inf),
+        ]:
+            current = getattr(self, name)
+            values = np.full((len(classes), *current.shape[1:]), fill, current.dtype)
+            values[rows] = current
+            setattr(expanded, name, values)
+
+        return expanded
+
+    def merge(self, other):
+        if self.features != other.features or self.n_trials != other.n_trials:
+            raise ValueError("Only statistics of the same features can be merged")
+
+        classes = np.union1d(self.classes, other.classes)
+        a, b = self._expanded(classes), other._expanded(classes)
+
+        counts = a.counts + b.counts
+        n_a, n_b = a.counts[:, None], b.counts[:, None]
+        n = np.maximum(counts, 1)[:, None]
+        delta = b.mean - a.mean
+
+        self.classes = classes
+        self.counts = counts
+        self.mean = a.mean + delta * n_b / n
+        self.m2 = a.m2 + b.m2 + delta**2 * n_a * n_b / n
+        self.successes = a.successes + b.successes
+        self.min = np.minimum(a.min, b.min)
+        self.max = np.maximum(a.max, b.max)
+
+        return self
+
+    def finalize(self):
+        """
+        Returns:
+            dict: The estimated parameters of every class and feature, in the same
+                format as compute_training_params.
+        """
+
+        sigma = np.sqrt(self.m2 / self.counts[:, None])
+        p = self.successes / (self.n_trials * self.counts[:, None])
+        params_dict = {}
+
+        for i, breed in enumerate(self.classes.tolist()):
+            inner_dict = {}
+
+            for feature in self.features:
+                match _feature_family(feature):
+                    case "gaussian":
+                        j = self.gaussian.index(feature)
+                        m = {"mu": self.mean[i, j], "sigma": sigma[i, j]}
+
+                    case "binomial":
+                        j = self.binomial.index(feature)
+                        m = {"n": self.n_trials, "p": p[i, j]}
+
+                    case "uniform":
+                        j = self.uniform.index(feature)
+                        m = {"a": self.min[i, j], "b": self.max[i, j]}
+
+                inner_dict[feature] = m
+
+            params_dict[breed] = inner_dict
+
+        return params_dict
+
+
+def _fit_breed_shard(path, features, seed_seq):
+    return BreedStats(features).update(np.load(path, mmap_mode="r"))
+
+
+def fit_breed_shards(directory, features=FEATURES, max_workers=None):
+    """
+    Fits BreedStats on every shard written by write_breed_shards in a process pool and
+    merges the results.
+    """
+
+    manifest = _read_manifest(directory)
+    if manifest["format"] != "npy":
+        raise ValueError("fit_breed_shards only reads npy shards")
+
+    units = [
+        (os.path.join(directory, shard["file"]), features)
+        for shard in manifest["shards"]
+    ]
+    stats = BreedStats(features)
+
+    for _, shard_stats in _iter_parallel(
+        _fit_breed_shard, units, max_workers=max_workers
+    ):
+        stats.merge(shard_stats)
+
+    return stats
+
+
+def compute_training_params(df, features):
+    """
+    Computes the estimated parameters for training a model based on the provided dataframe and features.
+
+    Every breed is estimated in the same pass over each column through BreedStats.
+
+    Args:
+        df (pandas.DataFrame): The dataframe containing the training data.
+        features (list): A list of feature names to consider.
+
+    Returns:
+        - params_dict (dict): A dictionary that contains the estimated parameters for each breed and feature.
+    """
+
+    return BreedStats(features).update(df).finalize()
+
+
+_FAMILY_PARAMS = {
+    "gaussian": {"mu": "f8", "sigma": "f8"},
+    "binomial": {"n": "i8", "p": "f8"},
+    "uniform": {"a": "f8", "b": "f8"},
+}
+
+_FAMILY_DATACLASSES = {
+    "gaussian": params_gaussian,
+    "binomial": params_binomial,
+    "uniform": params_uniform,
+}
+
+
+@dataclass(slots=True, eq=False)
+class FeatureParamsView(Mapping):
+    """
+    Parameters of one feature of one class, read straight from a ParamTable row. A
+    read-only mapping that supports both params_dict[breed][feature]["mu"] and
+    breed_params[breed][feature].mu lookups, and compares equal to the matching dict.
+    """
+
+    table: "ParamTable"
+    row: int
+    feature: str
+
+    def _names(self):
+        return _FAMILY_PARAMS[_feature_family(self.feature)]
+
+    def __getitem__(self, name):
+        if name not in self._names():
+            raise KeyError(name)
+        return self.table.data[f"{self.feature}_{name}"][self.row].item()
+
+    def __iter__(self):
+        return iter(self._names())
+
+    def __len__(self):
+        return len(self._names())
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+@dataclass(slots=True, eq=False)
+class ClassParamsView(Mapping):
+    """
+    Parameters of every feature of one class of a ParamTable, as a read-only mapping from
+    feature name to FeatureParamsView.
+    """
+
+    table: "ParamTable"
+    row: int
+
+    def __getitem__(self, feature):
+        if feature not in self.table.features:
+            raise KeyError(feature)
+        return FeatureParamsView(self.table, self.row, feature)
+
+    def __iter__(self):
+        return iter(self.table.features)
+
+    def __len__(self):
+        return len(self.table.features)
+
+
+class ParamTable:
+    """
+    Naive Bayes parameters of many classes as one NumPy structured array: one row per
+    class, a "class" column with the labels and one typed column per feature parameter
+    (height_mu, height_sigma, bark_days_n, bark_days_p, ear_head_ratio_a, ...).
+
+    A column is a zero-copy view that scores every class at once, table[breed][feature]
+    gives slotted views that read like params_dict, and the table is saved with np.save
+    and memory-mapped back by load.
+
+    Args:
+        data (numpy.ndarray): Structured array with the layout above.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.features = list(
+            dict.fromkeys(name.rsplit("_", 1)[0] for name in data.dtype.names[1:])
+        )
+
+    @staticmethod
+    def dtype(features, class_dtype="i8"):
+        return np.dtype(
+            [("class", class_dtype)]
+            + [
+                (f"{feature}_{name}", kind)
+                for feature in features
+                for name, kind in _FAMILY_PARAMS[_feature_family(feature)].items()
+            ]
+        )
+
+    @classmethod
+    def from_params_dict(cls, params_dict, features=None):
+        """
+        Builds the table from compute_training_params output or breed_params.
+        """
+
+        classes = list(params_dict)
+        if features is None:
+            features = list(params_dict[classes[0]])
+
+        data = np.zeros(
+            len(classes), dtype=cls.dtype(features, np.asarray(classes).dtype)
+        )
+        data["class"] = classes
+        for feature in features:
+            for name in _FAMILY_PARAMS[_feature_family(feature)]:
+                data[f"{feature}_{name}"] = [
+                    _param_value(params_dict[c][feature], name) for c in classes
+                ]
+
+        return cls(data)
+
+    @classmethod
+    def from_breed_stats(cls, stats):
+        """
+        Builds the table straight from the arrays of a BreedStats, without going through
+        nested dicts.
+        """
+
+        data = np.zeros(
+            len(stats.classes), dtype=cls.dtype(stats.features, stats.classes.dtype)
+        )
+        data["class"] = stats.classes
+        counts = stats.counts
+
+        for j, feature in enumerate(stats.gaussian):
+            data[f"{feature}_mu"] = stats.mean[:, j]
+            data[f"{feature}_sigma"] = np.sqrt(stats.m2[:, j] / counts)
+        for j, feature in enumerate(stats.binomial):
+            data[f"{feature}_n"] = stats.n_trials
+            data[f"{feature}_p"] = stats.successes[:, j] / (stats.n_trials * counts)
+        for j, feature in enumerate(stats.uniform):
+            data[f"{feature}_a"] = stats.min[:, j]
+            data[f"{feature}_b"] = stats.max[:, j]
+
+        return cls(data)
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def classes(self):
+        return self.data["class"]
+
+    @cached_property
+    def _rows(self):
+        return {c: i for i, c in enumerate(self.classes.tolist())}
+
+    def __getitem__(self, label):
+        return ClassParamsView(self, self._rows[label])
+
+    def __iter__(self):
+        return iter(self.classes.tolist())
+
+    def column(self, feature, name):
+        """
+        The parameter name of feature for every class, as a view into the table.
+        """
+
+        return self.data[f"{feature}_{name}"]
+
+    def to_numpy(self):
+        """
+        The underlying structured array (not a copy).
+        """
+
+        return self.data
+
+    def to_params_dict(self, dataclasses=False):
+        """
+        Nested dict in the format of compute_training_params, or of breed_params (one
+        params_* dataclass per feature) if dataclasses is True.
+        """
+
+        params_dict = {}
+        for i, label in enumerate(self.classes.tolist()):
+            inner_dict = {}
+            for feature in self.features:
+                family = _feature_family(feature)
+                m = {
+                    name: self.data[f"{feature}_{name}"][i].item()
+                    for name in _FAMILY_PARAMS[family]
+                }
+                inner_dict[feature] = (
+                    _FAMILY_DATACLASSES[family](**m) if dataclasses else m
+                )
+            params_dict[label] = inner_dict
+
+        return params_dict
+
+    def round(self, decimals=3):
+        """
+        Copy with every float column rounded, the table counterpart of round_dict.
+        """
+
+        data = self.data.copy()
+        for name in data.dtype.names[1:]:
+            if data.dtype[name].kind == "f":
+                data[name] = np.round(data[name], decimals)
+
+        return type(self)(data)
+
+    def save(self, path):
+        np.save(path, self.data)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Loads a table written by save. With mmap the file is memory-mapped read-only, so
+        loading does not depend on the number of classes.
+        """
+
+        return cls(np.load(path, mmap_mode="r" if mmap else None))
+
+
+def estimate_gaussian_params(sample):
+    ### START CODE HERE ###
+    mu = np.mean(sample)
+    sigma = np.std(sample)
+    ### END CODE HERE ###
+
+    return mu, sigma
+
+
+def estimate_binomial_params(sample):
+    ### START CODE HERE ###
+    n = 30
+    p = (sample / n).mean()
+    ### END CODE HERE ###
+
+    return n, p
+
+
+def estimate_uniform_params(sample):
+    ### START CODE HERE ###
+    a = sample.min()
+    b = sample.max()
+    ### END CODE HERE ###
+
+    return a, b
+
+
+def _bootstrap_layout(features):
+    # (feature, param, family) of every bootstrapped parameter, in _FAMILY_PARAMS order
+    return [
+        (feature, name, _feature_family(feature))
+        for feature in features
+        for name in _FAMILY_PARAMS[_feature_family(feature)]
+    ]
+
+
+def _point_estimates(X, features):
+    estimators = {
+        "gaussian": estimate_gaussian_params,
+        "binomial": estimate_binomial_params,
+        "uniform": estimate_uniform_params,
+    }
+    return np.array(
+        [
+            value
+            for j, feature in enumerate(features)
+            for value in estimators[_feature_family(feature)](X[:, j])
+        ],
+        dtype=float,
+    )
+
+
+def _jackknife_estimates(X, features):
+    """
+    Leave-one-out estimates of every parameter in closed form, (N, n_params): running
+    sums for the means and standard deviations and the two smallest/largest values for
+    the min and max.
+    """
+
+    N = len(X)
+    columns = []
+
+    for j, feature in enumerate(features):
+        x = X[:, j]
+        match _feature_family(feature):
+            case "gaussian":
+                c = x - x.mean()
+                mean = (c.sum() - c) / (N - 1)
+                var = ((c * c).sum() - c * c) / (N - 1) - mean * mean
+                columns += [mean + x.mean(), np.sqrt(np.maximum(var, 0))]
+
+            case "binomial":
+                n = estimate_binomial_params(x)[0]
+                columns += [np.full(N, n), (x.sum() - x) / (N - 1) / n]
+
+            case "uniform":
+                s = np.partition(x, [0, 1, N - 2, N - 1])
+                columns += [
+                    np.where(x == s[0], s[1], s[0]),
+                    np.where(x == s[-1], s[-2], s[-1]),
+                ]
+
+    return np.column_stack(columns)
+
+
+def _bootstrap_block(X, features, m, n_replicates, max_chunk_elements, seed_seq):
+    """
+    n_replicates bootstrap replicates of every parameter, (n_replicates, n_params), for
+    resamples of size m of the rows of X.
+
+    Every chunk of resamples is turned into an (rows, N) matrix of multiplicities, so the
+    means and mean squares of all the moment-based columns are one matrix product. The
+    min and max of a resample are the sorted column at the smallest and largest drawn
+    index, since the indices are uniform whatever order the rows are in.
+    """
+
+    rng = np.random.default_rng(seed_seq)
+    N = len(X)
+    families = [_feature_family(feature) for feature in features]
+    n_trials = [estimate_binomial_params(X[:, j])[0] for j in range(len(features))]
+
+    moment_cols = [j for j, f in enumerate(families) if f != "uniform"]
+    center = X[:, moment_cols].mean(axis=0)
+    centered = X[:, moment_cols] - center
+    moments = np.column_stack([centered, centered * centered])
+    ordered = np.sort(X, axis=0)
+
+    replicates = np.empty((n_replicates, 2 * len(features)))
+    rows = max(1, max_chunk_elements // max(m, N))
+
+    for start in range(0, n_replicates, rows):
+        stop = min(start + rows, n_replicates)
+        idx = rng.integers(0, N, size=(stop - start, m))
+
+        offsets = np.arange(stop - start)[:, None] * N
+        weights = np.bincount((idx + offsets).ravel(), minlength=(stop - start) * N)
+        sums = weights.reshape(stop - start, N).astype(float) @ moments / m
+        first, last = idx.min(axis=1), idx.max(axis=1)
+
+        out = replicates[start:stop]
+        for j, family in enumerate(families):
+            match family:
+                case "gaussian":
+                    k = moment_cols.index(j)
+                    mean = sums[:, k]
+                    var = sums[:, len(moment_cols) + k] - mean * mean
+                    out[:, 2 * j] = mean + center[k]
+                    out[:, 2 * j + 1] = np.sqrt(np.maximum(var, 0))
+
+                case "binomial":
+                    k = moment_cols.index(j)
+                    out[:, 2 * j] = n_trials[j]
+                    out[:, 2 * j + 1] = (sums[:, k] + center[k]) / n_trials[j]
+
+                case "uniform":
+                    out[:, 2 * j] = ordered[first, j]
+                    out[:, 2 * j + 1] = ordered[last, j]
+
+    return replicates
+
+
+def _bootstrap_interval(replicates, theta, alpha, method, jackknife=None, scale=1.0):
+    levels = np.array([alpha / 2, 1 - alpha / 2])
+
+    if np.ptp(replicates) == 0:
+        return float(theta), float(theta)
+
+    match method:
+        case "percentile":
+            lo, hi = np.quantile(replicates, levels)
+
+        case "bca":
+            # Mid-rank bias correction: min/max replicates often tie with theta
+            below = np.mean(replicates < theta) + 0.5 * np.mean(replicates == theta)
+            z0 = ndtri(below)
+            d = jackknife.mean() - jackknife
+            denominator = 6 * np.sum(d * d) ** 1.5
+            a = np.sum(d**3) / denominator if denominator > 0 else 0.0
+
+            z = ndtri(levels)
+            adjusted = ndtr(z0 + (z0 + z) / (1 - a * (z0 + z)))
+            if not np.all(np.isfinite(adjusted)):
+                adjusted = levels
+            lo, hi = np.quantile(replicates, adjusted)
+
+        case "m_out_of_n":
+            # Quantiles of the rescaled root tau_m / tau_n * (theta*_m - theta)
+            q_lo, q_hi = np.quantile((replicates - theta) * scale, levels)
+            lo, hi = theta - q_hi, theta - q_lo
+
+        case _:
+            raise ValueError(f"Unknown bootstrap method: {method}")
+
+    return float(lo), float(hi)
+
+
+def bootstrap_params(
+    df,
+    features=FEATURES,
+    n_boot=10_000,
+    method="percentile",
+    alpha=0.05,
+    m=None,
+    seed=None,
+    block_size=2_000,
+    max_workers=None,
+    max_chunk_elements=2**22,
+):
+    """
+    Bootstrap confidence intervals for the parameters estimated by estimate_gaussian_params,
+    estimate_binomial_params and estimate_uniform_params, for every breed and feature.
+
+    The replicates of every breed are drawn in blocks of block_size that run in a process
+    pool, each block evaluating all the estimators on vectorized chunks of resamples.
+    Results only depend on the seed, not on the number of workers.
+
+    Args:
+        df (pandas.DataFrame): The training data, with the features and a "breed" column.
+        features (list): Feature names to estimate.
+        n_boot (int): Number of bootstrap replicates per breed.
+        method (str): "percentile", "bca" (bias-corrected and accelerated, with a closed
+            form jackknife; classes with a single row use "percentile") or
+            "m_out_of_n". The plain bootstrap is inconsistent for the min and max of the
+            uniform features; the m-out-of-n bootstrap rescales resamples of size m with
+            rate n for the min/max and sqrt(n) otherwise.
+        alpha (float): 1 - confidence level.
+        m (int): Resample size for "m_out_of_n". Defaults to N ** (2/3).
+        seed (int): Seed of the SeedSequence spawned for every block.
+        block_size (int): Replicates per pool task.
+        max_workers (int): Size of the process pool. 1 runs in this process.
+        max_chunk_elements (int): Upper bound on the size of each resample chunk.
+
+    Returns:
+        dict: {breed: {feature: {param: (lo, hi)}}}.
+    """
+
+    if not 0 < alpha < 1:
+        raise ValueError("alpha should be between 0 and 1")
+
+    layout = _bootstrap_layout(features)
+    breeds = np.asarray(df["breed"])
+    values = df[features].to_numpy(dtype=float)
+    classes = sorted(set(breeds.tolist()))
+
+    data, sizes = {}, {}
+    for breed in classes:
+        X = values[breeds == breed]
+        N = len(X)
+        if method == "m_out_of_n":
+            sizes[breed] = int(m if m is not None else max(2, round(N ** (2 / 3))))
+        else:
+            sizes[breed] = N
+        data[breed] = X
+
+    units, owners = [], []
+    for breed in classes:
+        for start in range(0, n_boot, block_size):
+            n_replicates = min(block_size, n_boot - start)
+            units.append(
+                (data[breed], features, sizes[breed], n_replicates, max_chunk_elements)
+            )
+            owners.append(breed)
+
+    blocks = dict(_iter_parallel(_bootstrap_block, units, seed, max_workers))
+
+    intervals = {}
+    for breed in classes:
+        X = data[breed]
+        N, m_breed = len(X), sizes[breed]
+        replicates = np.concatenate(
+            [blocks[i] for i, owner in enumerate(owners) if owner == breed]
+        )
+        theta = _point_estimates(X, features)
+        # The jackknife needs two rows; a single-row class falls back to percentile
+        breed_method = "percentile" if method == "bca" and N < 2 else method
+        jackknife = _jackknife_estimates(X, features) if breed_method == "bca" else None
+
+        inner_dict = {}
+        for k, (feature, name, family) in enumerate(layout):
+            # Convergence rate of the estimator: n for the extremes, sqrt(n) otherwise
+            ratio = m_breed / N
+            scale = ratio if family == "uniform" else np.sqrt(ratio)
+            inner_dict.setdefault(feature, {})[name] = _bootstrap_interval(
+                replicates[:, k],
+                theta[k],
+                alpha,
+                breed_method,
+                None if jackknife is None else jackknife[:, k],
+                scale,
+            )
+
+        intervals[breed] = inner_dict
+
+    return intervals
+
+
+class DiscreteTable:
+    """
+    Precomputed pmf, log-pmf and CDF of a discrete distribution with small support
+    start, start + 1, ..., start + len(pmf) - 1. Evaluating the pmf is a gather and
+    inverse-CDF sampling a np.searchsorted over the CDF.
+    """
+
+    def __init__(self, start, pmf):
+        self.start = int(start)
+        self.pmf_table = np.array(pmf, dtype=float)
+        self.support = np.arange(self.start, self.start + len(self.pmf_table))
+        with np.errstate(divide="ignore"):
+            self.log_pmf_table = np.log(self.pmf_table)
+        self.cdf_table = np.cumsum(self.pmf_table)
+        self.cdf_table[-1] = 1.0
+
+        # Tables from discrete_table are shared by every caller through the LRU cache
+        for table in (self.pmf_table, self.support, self.log_pmf_table, self.cdf_table):
+            table.setflags(write=False)
+
+    def _positions(self, x):
+        # Position of x in the table, -1 for non-integers and values outside the support
+        x = np.asarray(x, dtype=float)
+        position = x - self.start
+        inside = (x == np.floor(x)) & (position >= 0) & (position < len(self.pmf_table))
+        return np.where(inside, position, -1).astype(np.intp)
+
+    def pmf(self, x):
+        position = self._positions(x)
+        return np.where(position >= 0, self.pmf_table[position], 0.0)
+
+    def logpmf(self, x):
+        position = self._positions(x)
+        return np.where(position >= 0, self.log_pmf_table[position], -np.inf)
+
+    def cdf(self, x):
+        position = np.floor(np.asarray(x, dtype=float)) - self.start
+        clipped = np.clip(position, 0, len(self.cdf_table) - 1).astype(np.intp)
+        return np.where(position < 0, 0.0, self.cdf_table[clipped])
+
+    def ppf(self, q):
+        # Smallest value whose CDF is at least q
+        index = np.searchsorted(self.cdf_table, q, side="left")
+        return self.support[np.minimum(index, len(self.support) - 1)]
+
+    def sample(self, size, rng=None):
+        return self.ppf((np.random if rng is None else rng).random(size))
+
+
+@lru_cache(maxsize=256)
+def discrete_table(family, *params):
+    """
+    LRU-cached DiscreteTable for ("binomial", n, p) or ("poisson", mu). The Poisson
+    support is truncated where the remaining tail mass is negligible.
+    """
+
+    match family:
+        case "binomial":
+            n, p = int(params[0]), float(params[1])
+            k = np.arange(n + 1)
+            log_pmf = (
+                gammaln(n + 1)
+                - gammaln(k + 1)
+                - gammaln(n - k + 1)
+                + xlogy(k, p)
+                + xlog1py(n - k, -p)
+            )
+            return DiscreteTable(0, np.exp(log_pmf))
+
+        case "poisson":
+            mu = float(params[0])
+            k = np.arange(int(mu + 12 * np.sqrt(mu) + 20))
+            return DiscreteTable(0, np.exp(xlogy(k, mu) - mu - gammaln(k + 1)))
+
+    raise ValueError(f"Unknown discrete family: {family}")
+
+
+class CategoricalSampler:
+    """
+    Walker/Vose alias sampler for a fixed categorical distribution, e.g. the
+    probabilities of a loaded dice.
+
+    The alias tables are built once in O(K). Every draw then takes one uniform
+    integer and one uniform float, so a batch of rolls is fully vectorized and
+    O(1) per sample, whatever the number of sides.
+
+    Args:
+        probs (array-like): Probability of every outcome (normalized if needed).
+        values (array-like): The outcomes. Defaults to 0, ..., K-1; pass dice = np.arange(n_sides) + 1 for dice rolls.
+    """
+
+    def __init__(self, probs, values=None):
+        probs = np.asarray(probs, dtype=float)
+        if probs.ndim != 1 or len(probs) == 0 or np.any(probs < 0):
+            raise ValueError("probs must be a non-empty vector of non-negative values")
+
+        n = len(probs)
+        self.probs = probs / probs.sum()
+        self.values = np.arange(n) if values is None else np.asarray(values)
+        if len(self.values) != n:
+            raise ValueError("values and probs should have the same length")
+
+        self.accept = np.ones(n)
+        self.alias = np.arange(n)
+
+        scaled = self.probs * n
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.accept[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+
+        # Whatever is left is 1 up to rounding errors and always accepted
+
+    def sample(self, size, rng=None):
+        # rng=None draws from the global numpy state, like the other samplers
+        column = _draw_indices(rng, len(self.accept), size)
+        uniforms = (np.random if rng is None else rng).random(size)
+        accepted = uniforms < self.accept[column]
+
+        return self.values[np.where(accepted, column, self.alias[column])]
+
+    def sample_sum(self, n_dice, size, rng=None):
+        """
+        Sums of n_dice independent draws, e.g. first_rolls + second_rolls for n_dice=2.
+        """
+
+        size = (size,) if np.ndim(size) == 0 else tuple(size)
+        return self.sample((*size, n_dice), rng).sum(axis=-1)
+
+
+def _convolve_pmfs(a, b, method="auto"):
+    # Direct convolution keeps the relative accuracy of tiny tail probabilities, FFT is
+    # only used ("auto") when the direct product would be too slow
+    if method == "auto":
+        method = "fft" if len(a) * len(b) > 10**8 else "direct"
+
+    match method:
+        case "direct":
+            return np.convolve(a, b)
+        case "fft":
+            # scipy.signal takes about a second to import, only pay for it when needed
+            from scipy.signal import fftconvolve
+
+            return np.clip(fftconvolve(a, b), 0, None)
+
+    raise ValueError('method must be "auto", "direct" or "fft"')
+
+
+def _dice_pmf(probs, values):
+    # pmf over the consecutive integers min(values), ..., max(values)
+    probs = np.asarray(probs, dtype=float)
+    values = np.arange(1, len(probs) + 1) if values is None else np.asarray(values)
+    if values.dtype.kind not in "iu":
+        raise ValueError("dice values must be integers")
+
+    pmf = np.zeros(values.max() - values.min() + 1)
+    np.add.at(pmf, values - values.min(), probs / probs.sum())
+
+    return int(values.min()), pmf
+
+
+def dice_sum_pmf(probs, n_dice, values=None, method="auto"):
+    """
+    Exact distribution of the sum of n_dice independent rolls of the same dice.
+
+    The pmf is raised to the n_dice-th convolution power by repeated squaring, so only
+    O(log n_dice) convolutions are needed.
+
+    Args:
+        probs (array-like): Probability of every side, e.g. the output of load_dice.
+        n_dice (int): Number of dice that are summed.
+        values (array-like): Integer value of every side. Defaults to 1, ..., len(probs).
+        method (str): "direct", "fft" or "auto".
+
+    Returns:
+        tuple: (sums, pmf) with every possible sum and its probability.
+    """
+
+    if n_dice < 1:
+        raise ValueError("n_dice must be a positive integer")
+
+    low, base = _dice_pmf(probs, values)
+    result = np.ones(1)
+    power = n_dice
+
+    while power:
+        if power & 1:
+            result = _convolve_pmfs(result, base, method)
+        power >>= 1
+        if power:
+            base = _convolve_pmfs(base, base, method)
+
+    result /= result.sum()
+
+    return np.arange(n_dice * low, n_dice * low + len(result)), result
+
+
+def conditional_sum_pmf(
+    first_probs, second_probs, keep_second, values=None, method="auto"
+):
+    """
+    Exact distribution of first + second roll when the second roll only counts for some
+    first rolls, like np.where(first_rolls >= 4, second_rolls, 0) in the dice notebook.
+
+    Args:
+        first_probs (array-like): Side probabilities of the first dice.
+        second_probs (array-like): Side probabilities of the second dice.
+        keep_second (callable): Maps an array of first roll values to a boolean array that
+            is True where the second roll is kept, e.g. lambda first: first >= 4.
+        values (array-like): Integer value of every side. Defaults to 1, ..., len(probs).
+        method (str): "direct", "fft" or "auto".
+
+    Returns:
+        tuple: (sums, pmf) with every possible sum and its probability.
+    """
+
+    low_1, pmf_1 = _dice_pmf(first_probs, values)
+    low_2, pmf_2 = _dice_pmf(second_probs, values)
+    first_values = np.arange(low_1, low_1 + len(pmf_1))
+    keep = np.asarray(keep_second(first_values), dtype=bool)
+
+    # First rolls that keep the second one are convolved with it, the others are the sum
+    kept = _convolve_pmfs(np.where(keep, pmf_1, 0.0), pmf_2, method)
+    low = min(low_1 + low_2, low_1)
+    high = max(low_1 + low_2 + len(kept) - 1, low_1 + len(pmf_1) - 1)
+
+    pmf = np.zeros(high - low + 1)
+    pmf[low_1 + low_2 - low :][: len(kept)] += kept
+    pmf[low_1 - low :][: len(pmf_1)] += np.where(keep, 0.0, pmf_1)
+
+    return np.arange(low, high + 1), pmf
+
+
+def _param_value(params, name):
+    # Parameters come either as dicts (compute_training_params) or dataclasses (breed_params)
+    return params[name] if isinstance(params, dict) else getattr(params, name)
+
+
+def log_likelihoods(X, params_dict, features=FEATURES):
+    """
+    Log-likelihood of every sample under every class of a Naive Bayes model.
+
+    Args:
+        X (array-like or pandas.DataFrame): (N, len(features)) feature matrix. A
+            DataFrame is indexed by the feature names.
+        params_dict (dict or ParamTable): Parameters per class and feature, either the
+            output of compute_training_params, breed_params or a ParamTable.
+        features (list): Feature names, in the order of the columns of X.
+
+    Returns:
+        tuple: (classes, log_lik) where log_lik has shape (N, n_classes).
+    """
+
+    if isinstance(X, pd.DataFrame):
+        X = X[features].to_numpy(dtype=float)
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+
+    if isinstance(params_dict, ParamTable):
+        classes = params_dict.classes
+        _values = params_dict.column
+    else:
+        classes = np.array(list(params_dict))
+
+        def _values(feature, name):
+            return np.array(
+                [_param_value(params_dict[c][feature], name) for c in classes]
+            )
+
+    log_lik = np.zeros((len(X), len(classes)))
+
+    for j, feature in enumerate(features):
+        x = X[:, j, None]
+
+        match _feature_family(feature):
+            case "gaussian":
+                mu, sigma = _values(feature, "mu"), _values(feature, "sigma")
+                z = (x - mu) / sigma
+                log_lik -= 0.5 * z * z
+                log_lik -= np.log(sigma) + 0.5 * np.log(2 * np.pi)
+
+            case "binomial":
+                # k only takes n + 1 values: gather from the cached log-pmf tables
+                tables = [
+                    discrete_table("binomial", int(n_c), float(p_c)).log_pmf_table
+                    for n_c, p_c in zip(_values(feature, "n"), _values(feature, "p"))
+                ]
+                n = np.array([len(t) - 1 for t in tables])
+                table = np.full((n.max() + 2, len(classes)), -np.inf)
+                for c, t in enumerate(tables):
+                    table[: len(t), c] = t
+
+                # Like scipy, non-integer and negative counts are impossible
+                k = X[:, j]
+                outside = (k != np.floor(k)) | (k < 0) | (k > n.max()) | np.isnan(k)
+                k = np.where(outside, len(table) - 1, k).astype(np.intp)
+                log_lik += table[k]
+
+            case "uniform":
+                a, b = _values(feature, "a"), _values(feature, "b")
+                low, high = np.minimum(a, b), np.maximum(a, b)
+                log_lik += np.where(
+                    (x >= low) & (x <= high), -np.log(high - low), -np.inf
+                )
+
+    return classes, log_lik
+
+
+def predict_breed_batch(X, params_dict, probs_dict=None, features=FEATURES):
+    """
+    Naive Bayes prediction for a whole batch of samples, computed in log space so long
+    products of small densities never underflow.
+
+    Args:
+        X (array-like or pandas.DataFrame): (N, len(features)) feature matrix.
+        params_dict (dict or ParamTable): Parameters per class and feature (compute_training_params, breed_params or a ParamTable).
+        probs_dict (dict): Prior probability of every class. Uniform if None.
+        features (list): Feature names, in the order of the columns of X.
+
+    Returns:
+        tuple: (predictions, posteriors) with the predicted class of every sample and the
+            (N, n_classes) posterior probabilities. Samples that are impossible under every
+            class are predicted as the first class and get NaN posteriors.
+    """
+
+    classes, log_lik = log_likelihoods(X, params_dict, features)
+
+    if probs_dict is None:
+        log_prior = np.full(len(classes), -np.log(len(classes)))
+    else:
+        with np.errstate(divide="ignore"):
+            log_prior = np.log([probs_dict[c] for c in classes])
+
+    log_joint = log_lik + log_prior
+    predictions = classes[np.argmax(log_joint, axis=1)]
+
+    with np.errstate(invalid="ignore"):
+        posteriors = np.exp(log_joint - log_joint.max(axis=1, keepdims=True))
+        posteriors /= posteriors.sum(axis=1, keepdims=True)
+
+    return predictions, posteriors
+
+
+def _email_words(text):
+    # Same tokens as the notebook's process_email: lower-cased, whitespace split, unique.
+    # Kept in first-occurrence order, since the order of a set of strings depends on the
+    # hash seed of the process and would make vocabulary ids differ between workers
+    return dict.fromkeys(text.lower().split())
+
+
+def document_term_matrix(texts, vocabulary=None):
+    """
+    Builds the binary document-term matrix of a batch of emails in CSR layout.
+
+    Args:
+        texts (iterable): Email texts.
+        vocabulary (dict): word -> column index. If None a vocabulary is built from the
+            texts; otherwise words missing from it are ignored.
+
+    Returns:
+        tuple: (X, vocabulary) with X a (n_emails, len(vocabulary)) scipy.sparse
+            csr_matrix holding 1 where a word appears in an email.
+    """
+
+    grow = vocabulary is None
+    vocabulary = {} if grow else vocabulary
+
+    indices = []
+    indptr = [0]
+    for text in texts:
+        words = _email_words(text)
+        if grow:
+            indices.extend([vocabulary.setdefault(w, len(vocabulary)) for w in words])
+        else:
+            indices.extend([vocabulary[w] for w in words if w in vocabulary])
+        indptr.append(len(indices))
+
+    indices = np.array(indices, dtype=np.int32)
+    X = sparse.csr_matrix(
+        (np.ones(len(indices)), indices, np.array(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocabulary)),
+    )
+
+    return X, vocabulary
+
+
+@dataclass
+class TokenizedCorpus:
+    """
+    Unique token ids of a batch of emails in CSR layout: the tokens of email i are
+    token_ids[offsets[i]:offsets[i + 1]]. Ids are hash buckets or vocabulary indices,
+    all below n_features.
+    """
+
+    token_ids: np.ndarray
+    offsets: np.ndarray
+    n_features: int
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def to_csr(self, n_features=None):
+        """
+        Binary document-term matrix as a scipy.sparse csr_matrix, sharing the id arrays.
+        """
+
+        n_features = self.n_features if n_features is None else n_features
+        return sparse.csr_matrix(
+            (np.ones(len(self.token_ids)), self.token_ids, self.offsets),
+            shape=(len(self), n_features),
+        )
+
+    @classmethod
+    def concatenate(cls, corpora, n_features):
+        corpora = list(corpora)
+        ends = np.cumsum([0] + [len(c.token_ids) for c in corpora])
+        offsets = [np.zeros(1, dtype=np.int64)]
+        offsets += [c.offsets[1:] + end for c, end in zip(corpora, ends)]
+
+        return cls(
+            np.concatenate([c.token_ids for c in corpora] + [np.zeros(0, np.int32)]),
+            np.concatenate(offsets),
+            n_features,
+        )
+
+
+def _tokenize_chunk(texts, n_features, seed_seq):
+    # Hashing trick: crc32 instead of hash(), which is salted differently in every process
+    if n_features is not None:
+        rows = [
+            {zlib.crc32(w.encode()) % n_features for w in _email_words(text)}
+            for text in texts
+        ]
+        words = None
+    else:
+        local = {}
+        rows = [
+            [local.setdefault(w, len(local)) for w in _email_words(text)]
+            for text in texts
+        ]
+        words = list(local)
+
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=offsets[1:])
+    token_ids = np.fromiter(
+        itertools.chain.from_iterable(rows), dtype=np.int32, count=offsets[-1]
+    )
+
+    return token_ids, offsets, words
+
+
+class EmailTokenizer:
+    """
+    Turns email texts into TokenizedCorpus chunks (the tokens of process_email) in a process
+    pool, keeping only int32 ids instead of lists of strings.
+
+    With n_features the words are hashed into n_features buckets (hashing trick), so the
+    memory never depends on the size of the vocabulary. Otherwise every worker builds a
+    local vocabulary for its chunk and the chunks are merged, in order, into a global
+    word -> id vocabulary, which grows unless one is passed in.
+
+    Args:
+        n_features (int): Number of hash buckets. None to use a vocabulary.
+        vocabulary (dict): Fixed word -> id vocabulary; unknown words are dropped.
+        chunk_size (int): Number of emails tokenized per task.
+        max_workers (int): Size of the process pool. 1 tokenizes in this process.
+    """
+
+    def __init__(
+        self, n_features=None, vocabulary=None, chunk_size=10_000, max_workers=None
+    ):
+        if n_features is not None and vocabulary is not None:
+            raise ValueError(
+                "Use either hashing (n_features) or a vocabulary, not both"
+            )
+        if n_features is not None and not 0 < n_features <= 2**31:
+            raise ValueError("n_features should be between 1 and 2**31")
+
+        self.hashing = n_features is not None
+        self._n_features = n_features
+        self.vocabulary = None if self.hashing else dict(vocabulary or {})
+        self.fixed_vocabulary = vocabulary is not None
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    @property
+    def n_features(self):
+        return self._n_features if self.hashing else len(self.vocabulary)
+
+    def _merge(self, result, grow):
+        token_ids, offsets, words = result
+        if words is None:
+            return TokenizedCorpus(token_ids, offsets, self.n_features)
+
+        if grow:
+            remap = [self.vocabulary.setdefault(w, len(self.vocabulary)) for w in words]
+        else:
+            remap = [self.vocabulary.get(w, -1) for w in words]
+        token_ids = np.array(remap, dtype=np.int32)[token_ids]
+
+        if not grow:
+            known = token_ids >= 0
+            offsets = np.concatenate([[0], np.cumsum(known)])[offsets]
+            token_ids = token_ids[known]
+
+        return TokenizedCorpus(token_ids, offsets, self.n_features)
+
+    def iter_chunks(self, texts, grow=True):
+        """
+        Yields one TokenizedCorpus per chunk_size emails of texts (any iterable), in order.
+        Only about one chunk per worker is held in memory at a time.
+
+        Args:
+            texts (iterable): Email texts, e.g. lines streamed from a mailbox dump.
+            grow (bool): Add unseen words to the vocabulary. Ignored with hashing or a
+                fixed vocabulary.
+        """
+
+        grow = grow and not (self.hashing or self.fixed_vocabulary)
+        texts = iter(texts)
+        serial = self.max_workers == 1
+        window = 1 if serial else self.max_workers or os.cpu_count()
+
+        # One pool for the whole stream; its workers only start on the first submit, so
+        # a single chunk of input is still tokenized in this process without spawning
+        with (
+            nullcontext()
+            if serial
+            else ProcessPoolExecutor(max_workers=self.max_workers)
+        ) as executor:
+            while True:
+                units = []
+                while len(units) < window:
+                    chunk = list(itertools.islice(texts, self.chunk_size))
+                    if not chunk:
+                        break
+                    units.append((chunk, self._n_features))
+
+                if not units:
+                    return
+
+                if len(units) == 1:
+                    results = {0: _tokenize_chunk(*units[0], None)}
+                else:
+                    results = dict(
+                        _iter_parallel(_tokenize_chunk, units, executor=executor)
+                    )
+
+                # Merging in order keeps the vocabulary ids deterministic
+                for i in range(len(units)):
+                    yield self._merge(results.pop(i), grow)
+
+    def transform(self, texts, grow=True):
+        """
+        Tokenizes all of texts into a single TokenizedCorpus.
+        """
+
+        if isinstance(texts, str):
+            texts = [texts]
+        chunks = list(self.iter_chunks(texts, grow))
+
+        return TokenizedCorpus.concatenate(chunks, self.n_features)
+
+
+class SpamNaiveBayes:
+    """
+    Naive Bayes spam filter over the words of an email, the vectorized counterpart of
+    word_freq_per_class / naive_bayes_classifier.
+
+    Training counts in how many spam and ham emails every word (or hash bucket) appears
+    and keeps, per word, the log-likelihood ratio
+
+        log P(word | spam) - log P(word | ham),  P(word | c) = (count_c + alpha) / (total_c + alpha * V)
+
+    (Laplace smoothing). Like naive_bayes_classifier, only the words of an email that are in
+    the vocabulary contribute, so the log-odds of a whole batch is one sparse matrix-vector
+    product X @ log_ratio plus the log prior ratio. Working with sums of logs means long
+    emails never underflow.
+
+    The counts are additive, so partial_fit / fit_stream train on corpora that do not fit
+    in memory, chunk by chunk.
+
+    Args:
+        alpha (float): Laplace smoothing pseudo-count.
+        n_features (int): Use the hashing trick with this many buckets instead of a vocabulary.
+        chunk_size (int): Emails per tokenization task, see EmailTokenizer.
+        max_workers (int): Processes used to tokenize. 1 tokenizes in this process.
+    """
+
+    def __init__(self, alpha=1.0, n_features=None, chunk_size=10_000, max_workers=None):
+        if alpha <= 0:
+            raise ValueError("alpha should be positive")
+
+        self.alpha = alpha
+        self.tokenizer = EmailTokenizer(
+            n_features=n_features, chunk_size=chunk_size, max_workers=max_workers
+        )
+        self._reset()
+
+    def _reset(self):
+        self.word_counts = np.zeros((self.tokenizer.n_features, 2))
+        self.class_counts = np.zeros(2, dtype=np.int64)
+
+    @property
+    def vocabulary(self):
+        return self.tokenizer.vocabulary
+
+    def fit(self, texts, labels, vocabulary=None):
+        """
+        Args:
+            texts (iterable, TokenizedCorpus or scipy.sparse matrix): Email texts, or a
+                document-term matrix whose columns follow vocabulary.
+            labels (array-like): 1 for spam and 0 for ham, like the 'spam' column of emails.
+            vocabulary (dict): word -> column index. Required when texts is a matrix,
+                otherwise it fixes the vocabulary instead of building it from texts.
+
+        Returns:
+            SpamNaiveBayes: self.
+        """
+
+        if vocabulary is not None:
+            tokenizer = self.tokenizer
+            self.tokenizer = EmailTokenizer(
+                vocabulary=vocabulary,
+                chunk_size=tokenizer.chunk_size,
+                max_workers=tokenizer.max_workers,
+            )
+        elif sparse.issparse(texts):
+            raise ValueError("A document-term matrix needs its vocabulary")
+        elif not (self.tokenizer.hashing or self.tokenizer.fixed_vocabulary):
+            self.tokenizer.vocabulary = {}
+
+        self._reset()
+        return self.partial_fit(texts, labels)
+
+    def partial_fit(self, texts, labels):
+        """
+        Adds a batch of labelled emails (same inputs as fit) to the counts.
+        """
+
+        X = self._matrix(texts, fitting=True)
+        is_spam = np.asarray(labels).astype(bool)
+        if len(is_spam) != X.shape[0]:
+            raise ValueError("There should be one label per email")
+
+        # Column sums of the spam and ham rows in one pass
+        counts = X.T @ np.column_stack([is_spam, ~is_spam]).astype(float)
+        if len(counts) > len(self.word_counts):
+            grown = np.zeros((len(counts), 2))
+            grown[: len(self.word_counts)] = self.word_counts
+            self.word_counts = grown
+        self.word_counts[: len(counts)] += counts
+        self.class_counts += [is_spam.sum(), (~is_spam).sum()]
+
+        smoothed = self.word_counts + self.alpha
+        log_lik = np.log(smoothed) - np.log(smoothed.sum(axis=0))
+        self.log_ratio = log_lik[:, 0] - log_lik[:, 1]
+        with np.errstate(divide="ignore"):
+            self.log_prior_ratio = np.log(self.class_counts[0]) - np.log(
+                self.class_counts[1]
+            )
+
+        return self
+
+    def fit_stream(self, texts, labels):
+        """
+        Trains on an iterable of texts (e.g. a multi-GB mailbox dump read line by line),
+        tokenizing it in chunks so only the token ids of a few chunks are in memory.
+
+        Args:
+            texts (iterable): Email texts.
+            labels (array-like): 1 for spam and 0 for ham, one per email.
+        """
+
+        labels = np.asarray(labels)
+        start = 0
+        for corpus in self.tokenizer.iter_chunks(texts):
+            self.partial_fit(corpus, labels[start : start + len(corpus)])
+            start += len(corpus)
+
+        return self
+
+    def _matrix(self, texts, fitting=False):
+        if not fitting and self.class_counts.sum() == 0:
+            raise ValueError("The classifier has not been fitted")
+        if sparse.issparse(texts):
+            return sparse.csr_matrix(texts)
+
+        if not isinstance(texts, TokenizedCorpus):
+            texts = self.tokenizer.transform(texts, grow=fitting)
+        if fitting:
+            return texts.to_csr()
+
+        # Words added to the vocabulary after fitting have no counts: drop them
+        n_words = len(self.word_counts)
+        return texts.to_csr(max(texts.n_features, n_words))[:, :n_words]
+
+    def log_odds(self, texts):
+        """
+        log P(spam | email) - log P(ham | email) for every email (texts, TokenizedCorpus
+        or document-term matrix).
+        """
+
+        return self._matrix(texts) @ self.log_ratio + self.log_prior_ratio
+
+    def predict_proba(self, texts):
+        """
+        Probability of every email being spam.
+        """
+
+        return expit(self.log_odds(texts))
+
+    def predict(self, texts):
+        """
+        1 for the emails classified as spam, 0 for ham.
+        """
+
+        return (self.log_odds(texts) > 0).astype(int)
+
+
+_DATASETS = {"anscombe": "df_anscombe.csv", "datasaurus": "datasaurus.csv"}
+
+
+class CachedDataset:
+    """
+    Columnar, memory-mapped copy of one of the CSV datasets.
+
+    Every numeric column is stored as an .npy file and the "group" column as integer
+    codes plus the list of labels, in order of first appearance. The rows are also stored
+    sorted by group (grouped_<column>.npy) so every group is a contiguous slice. If
+    directory is None the same arrays are kept in memory instead.
+    """
+
+    def __init__(self, directory, meta, arrays=None):
+        self.directory = directory
+        self.meta = meta
+        self.arrays = arrays
+        self.groups = np.array(meta["groups"])
+        self.offsets = np.array(meta["offsets"])
+        self.group_index = {label: i for i, label in enumerate(meta["groups"])}
+
+    def _load(self, file_name):
+        # arrays holds the columns when no cache directory could be written
+        if self.arrays is not None:
+            return self.arrays[file_name]
+        return np.load(os.path.join(self.directory, file_name), mmap_mode="r")
+
+    def column(self, name):
+        if name == "group":
+            return self.groups[self._load("group_codes.npy")]
+        return self._load(f"{name}.npy")
+
+    def group_slice(self, label):
+        i = self.group_index[label]
+        return slice(self.offsets[i], self.offsets[i + 1])
+
+    def group_column(self, label, name):
+        # Contiguous view of one column restricted to one group
+        return self._load(f"grouped_{name}.npy")[self.group_slice(label)]
+
+    def frame(self):
+        return pd.DataFrame({name: self.column(name) for name in self.meta["columns"]})
+
+    @cached_property
+    def group_points(self):
+        """
+        {group: (n, 2) array of its x and y}, all views into one contiguous block.
+        """
+
+        points = np.column_stack(
+            [self._load("grouped_x.npy"), self._load("grouped_y.npy")]
+        )
+        return {label: points[self.group_slice(label)] for label in self.group_index}
+
+    @cached_property
+    def statistics(self):
+        """
+        {group: dict of mean, variance (ddof=1, like pandas), correlation and regression
+        line of x and y}, computed for every group at once with np.add.reduceat.
+        """
+
+        x, y = self._load("grouped_x.npy"), self._load("grouped_y.npy")
+        starts = self.offsets[:-1]
+        n = np.diff(self.offsets)
+
+        mean_x = np.add.reduceat(x, starts) / n
+        mean_y = np.add.reduceat(y, starts) / n
+        dx = x - np.repeat(mean_x, n)
+        dy = y - np.repeat(mean_y, n)
+        var_x = np.add.reduceat(dx * dx, starts) / (n - 1)
+        var_y = np.add.reduceat(dy * dy, starts) / (n - 1)
+        cov = np.add.reduceat(dx * dy, starts) / (n - 1)
+        slope = cov / var_x
+
+        table = {
+            "mean_x": mean_x,
+            "var_x": var_x,
+            "mean_y": mean_y,
+            "var_y": var_y,
+            "corr": cov / np.sqrt(var_x * var_y),
+            "slope": slope,
+            "intercept": mean_y - slope * mean_x,
+        }
+
+        return {
+            label: {name: values[i] for name, values in table.items()}
+            for label, i in self.group_index.items()
+        }
+
+    def statistics_frame(self):
+        return pd.DataFrame.from_dict(self.statistics, orient="index")
+
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _build_dataset_arrays(source):
+    df = pd.read_csv(source)
+    groups = df["group"].unique()
+    codes = pd.Categorical(df["group"], categories=groups).codes.astype(np.int32)
+    order = np.argsort(codes, kind="stable")
+
+    arrays = {"group_codes.npy": codes}
+    for name in df.columns:
+        if name != "group":
+            values = df[name].to_numpy()
+            arrays[f"{name}.npy"] = values
+            arrays[f"grouped_{name}.npy"] = values[order]
+
+    meta = {
+        "source": _source_signature(source),
+        "columns": list(df.columns),
+        "groups": groups.tolist(),
+        "offsets": np.r_[0, np.cumsum(np.bincount(codes))].tolist(),
+    }
+
+    return arrays, meta
+
+
+def _write_dataset_cache(arrays, meta, directory):
+    """
+    Writes the cache into a temporary directory next to directory and moves it into
+    place, so readers (also in other processes) never see a half-written cache.
+    """
+
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=".building-")
+
+    try:
+        for file_name, values in arrays.items():
+            np.save(os.path.join(staging, file_name), values)
+        with open(os.path.join(staging, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+        try:
+            os.replace(staging, directory)
+        except OSError:
+            # An outdated cache (or one just published by another process) is in the way
+            outdated = tempfile.mkdtemp(dir=parent, prefix=".outdated-")
+            try:
+                os.replace(directory, os.path.join(outdated, "cache"))
+            except FileNotFoundError:
+                pass
+            os.replace(staging, directory)
+            shutil.rmtree(outdated, ignore_errors=True)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _read_dataset_meta(directory, signature):
+    try:
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return meta if meta["source"] == dict(signature) else None
+
+
+@lru_cache(maxsize=None)
+def _load_dataset(name, signature):
+    source = os.path.join(DATA_DIR, _DATASETS[name])
+    directories = [
+        os.path.join(root, "datasets", name) for root in (CACHE_DIR, USER_CACHE_DIR)
+    ]
+
+    for directory in directories:
+        meta = _read_dataset_meta(directory, signature)
+        if meta is not None:
+            return CachedDataset(directory, meta)
+
+    # Next to the data if possible, else in the user's cache (e.g. read-only installs),
+    # else in memory
+    arrays, meta = _build_dataset_arrays(source)
+    for directory in directories:
+        try:
+            _write_dataset_cache(arrays, meta, directory)
+        except OSError:
+            # Another process may have published the same cache first
+            if _read_dataset_meta(directory, signature) is None:
+                continue
+        return CachedDataset(directory, meta)
+
+    return CachedDataset(None, meta, arrays)
+
+
+def load_dataset(name):
+    """
+    Returns the CachedDataset of "anscombe" or "datasaurus", paths being resolved
+    relative to this module. The CSV is only parsed the first time, or again when its
+    modification time or size changes.
+    """
+
+    if name not in _DATASETS:
+        raise ValueError(f"Unknown dataset: {name}")
+
+    signature = _source_signature(os.path.join(DATA_DIR, _DATASETS[name]))
+
+    return _load_dataset(name, tuple(sorted(signature.items())))
+
+
+@lru_cache(maxsize=None)
+def _dataset_frame(dataset):
+    return dataset.frame()
+
+
+def dataset_frame(name):
+    return _dataset_frame(load_dataset(name))
+
+
+# The plots and widgets live in plotting.py, which imports matplotlib, seaborn,
+# ipywidgets and scipy.stats; utils.<name> imports it on first use
+_PLOTTING_NAMES = [
+    "CLTDashboard",
+    "gaussian_clt",
+    "binomial_clt",
+    "poisson_clt",
+    "plot_kde_and_qq",
+    "your_bday",
+    "plot_simulated_probs",
+    "plot_simulated_probs_live",
+    "third_bday_problem",
+    "monty_hall_game",
+    "success_rate_plot",
+    "plot_monty_hall_surface",
+    "success_rate_surface",
+    "plot_gaussian_distributions",
+    "plot_binomial_distributions",
+    "plot_anscombes_quartet",
+    "display_widget",
+    "plot_datasaurus",
+]
+
+
+def __getattr__(name):
+    # df_anscombe and df_datasaurus used to be read at import time; they are now
+    # loaded on first access
+    match name:
+        case "df_anscombe":
+            return dataset_frame("anscombe")
+        case "df_datasaurus":
+            return dataset_frame("datasaurus")
+
+    if name in _PLOTTING_NAMES:
+        return getattr(importlib.import_module("plotting"), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_PLOTTING_NAMES, "df_anscombe", "df_datasaurus"])